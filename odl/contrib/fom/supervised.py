@@ -27,8 +27,9 @@ def mean_squared_error(data, ground_truth, mask=None, normalized=False):
 
     Parameters
     ----------
-    data : `FnBaseVector`
-        Input data to compare to the ground truth.
+    data : `FnBaseVector` or array-like
+        Input data to compare to the ground truth, or a stack of such
+        with shape ``(N,) + ground_truth.shape``.
     ground_truth : `FnBaseVector`
         Reference to compare ``data`` to.
     mask : `array-like`, optional
@@ -38,8 +39,9 @@ def mean_squared_error(data, ground_truth, mask=None, normalized=False):
 
     Returns
     -------
-    mse : float
-        FOM value, where a lower value means a better match.
+    mse : float or `numpy.ndarray`
+        FOM value, where a lower value means a better match. For a stack
+        ``data``, an array with one value per entry of the stack.
 
     Notes
     -----
@@ -58,7 +60,35 @@ def mean_squared_error(data, ground_truth, mask=None, normalized=False):
         \mathrm{MSE_N} = \\frac{\| f - g \|_2^2}{(\| f \|_2 + \| g \|_2)^2}.
 
     The normalized variant takes values in :math:`[0, 1]`.
+
+    Examples
+    --------
+    Compare a stack of two vectors against the same ground truth:
+
+    >>> ground_truth = odl.rn(3).element([1, 2, 3])
+    >>> data = np.array([[1, 2, 3],
+    ...                  [1, 2, 6]])
+    >>> mean_squared_error(data, ground_truth)
+    array([ 0.,  3.])
     """
+    if _is_stack(data, ground_truth):
+        weights = _weights(ground_truth)
+        data = np.asarray(data)
+        ground_truth = np.asarray(ground_truth)
+        if mask is not None:
+            mask = np.asarray(mask)
+            data = data * mask
+            ground_truth = ground_truth * mask
+
+        fom = _image_sums((data - ground_truth) ** 2, weights)
+        if normalized:
+            fom /= (np.sqrt(_image_sums(data ** 2, weights)) +
+                    np.sqrt(_image_sums(ground_truth[None] ** 2,
+                                        weights))) ** 2
+        else:
+            fom /= _image_sums(np.ones((1,) + ground_truth.shape), weights)
+        return fom
+
     l2norm = odl.solvers.L2Norm(data.space)
     l2norm_squared = odl.solvers.L2NormSquared(data.space)
 
@@ -471,8 +501,9 @@ def ssim(data, ground_truth,
 
     Parameters
     ----------
-    data : `FnBaseVector`
-        Input data to compare to the ground truth.
+    data : `FnBaseVector` or array-like
+        Input data to compare to the ground truth, or a stack of such
+        with shape ``(N,) + ground_truth.shape``.
     ground_truth : `FnBaseVector`
         Reference to compare ``data`` to.
     size : odd int
@@ -487,45 +518,64 @@ def ssim(data, ground_truth,
 
     Returns
     -------
-    ssim : float
-        FOM value, where a higher value means a better match.
+    ssim : float or `numpy.ndarray`
+        FOM value, where a higher value means a better match. For a stack
+        ``data``, an array with one value per entry of the stack.
     """
-    from scipy.signal import fftconvolve
+    from odl.contrib.fom.util import filter_image_sep
+    from odl.trafos.backends import PYFFTW_AVAILABLE
+    impl = 'pyfftw' if PYFFTW_AVAILABLE else 'numpy'
 
+    is_stack = _is_stack(data, ground_truth)
     data = np.asarray(data)
     ground_truth = np.asarray(ground_truth)
+    dtype = np.result_type(data, ground_truth, float)
+    data = data.astype(dtype, copy=False).reshape((-1,) + ground_truth.shape)
+    ground_truth = ground_truth.astype(dtype, copy=False)
 
-    # Compute gaussian on a `size`-sized grid in each axis
+    # The Gaussian window is the tensor product of 1D Gaussians, hence we
+    # can use a separable filter
     coords = np.linspace(-(size - 1) / 2, (size - 1) / 2, size)
-    grid = np.meshgrid(*([coords] * data.ndim), sparse=True)
+    filt = np.exp(-coords ** 2 / (2.0 * sigma ** 2))
+    filt /= np.sum(filt)
 
-    window = np.exp(-(sum(xi ** 2 for xi in grid) / (2.0 * sigma ** 2)))
-    window /= np.sum(window)
-
-    def smoothen(img):
-        return fftconvolve(window, img, mode='valid')
+    # Only the part where the window fits into the image is used, and
+    # there the circular convolution without padding is exact
+    offset = size - 1 - (size - 1) // 2
+    valid = (slice(None),) + tuple(slice(offset, offset + n - size + 1)
+                                   for n in ground_truth.shape)
 
     if dynamic_range is None:
         dynamic_range = np.max(ground_truth) - np.min(ground_truth)
 
     C1 = (K1 * dynamic_range) ** 2
     C2 = (K2 * dynamic_range) ** 2
-    mu1 = smoothen(data)
-    mu2 = smoothen(ground_truth)
+
+    # Smoothen all images at once, reusing the filter spectra
+    num = len(data)
+    stack = np.concatenate([data, data * data, data * ground_truth,
+                            ground_truth[None],
+                            (ground_truth * ground_truth)[None]])
+    smoothed = filter_image_sep(stack, [filt] * ground_truth.ndim,
+                                impl=impl, padding=0)[valid]
+
+    mu1 = smoothed[:num]
+    mu2 = smoothed[3 * num]
 
     mu1_sq = mu1 * mu1
     mu2_sq = mu2 * mu2
     mu1_mu2 = mu1 * mu2
 
-    sigma1_sq = smoothen(data * data) - mu1_sq
-    sigma2_sq = smoothen(ground_truth * ground_truth) - mu2_sq
-    sigma12 = smoothen(data * ground_truth) - mu1_mu2
+    sigma1_sq = smoothed[num:2 * num] - mu1_sq
+    sigma2_sq = smoothed[3 * num + 1] - mu2_sq
+    sigma12 = smoothed[2 * num:3 * num] - mu1_mu2
 
     nom = (2 * mu1_mu2 + C1) * (2 * sigma12 + C2)
     denom = (mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2)
     pointwise_ssim = nom / denom
 
-    return np.mean(pointwise_ssim)
+    fom = np.mean(pointwise_ssim.reshape((num, -1)), axis=1)
+    return fom if is_stack else fom[0]
 
 
 def psnr(data, ground_truth, normalized=False):
@@ -536,8 +586,9 @@ def psnr(data, ground_truth, normalized=False):
 
     Parameters
     ----------
-    data : `FnBaseVector`
-        Input data to compare to the ground truth.
+    data : `FnBaseVector` or array-like
+        Input data to compare to the ground truth, or a stack of such
+        with shape ``(N,) + ground_truth.shape``.
     ground_truth : `FnBaseVector`
         Reference to compare ``data`` to.
     normalized : bool
@@ -546,8 +597,9 @@ def psnr(data, ground_truth, normalized=False):
 
     Returns
     -------
-    psnr : float
-        FOM value, where a higher value means a better match.
+    psnr : float or `numpy.ndarray`
+        FOM value, where a higher value means a better match. For a stack
+        ``data``, an array with one value per entry of the stack.
 
     Examples
     --------
@@ -571,7 +623,31 @@ def psnr(data, ground_truth, normalized=False):
     >>> (psnr(data, ground_truth, normalized=True) ==
     ...  psnr(data, 3 + 4 * ground_truth, normalized=True))
     True
+
+    Stacks of data are compared entry by entry:
+
+    >>> result = psnr([data, ground_truth], ground_truth)
+    >>> print(np.round(result, 3))
+    [ 13.01    inf]
     """
+    if _is_stack(data, ground_truth):
+        if normalized:
+            data = np.asarray(data)
+            axes = tuple(range(1, data.ndim))
+            data = data - np.mean(data, axis=axes, keepdims=True)
+            std = np.std(data, axis=axes, keepdims=True)
+            std[std == 0] = 1
+            data /= std
+            ground_truth = odl.util.zscore(ground_truth)
+
+        mse = mean_squared_error(data, ground_truth)
+        max_true = np.max(np.abs(ground_truth))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fom = 20 * np.log10(max_true) - 10 * np.log10(mse)
+        fom[mse == 0] = np.inf
+        return fom
+
     if normalized:
         data = odl.util.zscore(data)
         ground_truth = odl.util.zscore(ground_truth)
@@ -599,7 +675,8 @@ def haarpsi(data, ground_truth, a=4.2, c=None):
     Parameters
     ----------
     data : 2D array-like
-        The image to compare to the ground truth.
+        The image to compare to the ground truth, or a stack of such with
+        shape ``(N,) + ground_truth.shape``.
     ground_truth : 2D array-like
         The true image with which to compare ``data``. It must have the
         same shape as ``data``.
@@ -617,9 +694,10 @@ def haarpsi(data, ground_truth, a=4.2, c=None):
 
     Returns
     -------
-    haarpsi : float between 0 and 1
+    haarpsi : float between 0 and 1 or `numpy.ndarray`
         The similarity score, where a higher score means a better match.
-        See Notes for details.
+        For a stack ``data``, an array with one score per entry of the
+        stack. See Notes for details.
 
     See Also
     --------
@@ -664,8 +742,10 @@ def haarpsi(data, ground_truth, a=4.2, c=None):
     wmap_horiz = haarpsi_weight_map(data, ground_truth, axis=0)
     wmap_vert = haarpsi_weight_map(data, ground_truth, axis=1)
 
-    numer = np.sum(lsim_horiz * wmap_horiz + lsim_vert * wmap_vert)
-    denom = np.sum(wmap_horiz + wmap_vert)
+    # Sum over the image axes, `data` can have an extra stack axis
+    numer = np.sum(lsim_horiz * wmap_horiz + lsim_vert * wmap_vert,
+                   axis=(-2, -1))
+    denom = np.sum(wmap_horiz + wmap_vert, axis=(-2, -1))
 
     return (scipy.special.logit(numer / denom) / a) ** 2
 
@@ -712,6 +792,29 @@ def noise_power_spectrum(data, ground_truth, radial=False):
         return nps
 
 
+def _is_stack(data, ground_truth):
+    """Return ``True`` if ``data`` is a stack of data to compare."""
+    return np.ndim(data) == np.ndim(ground_truth) + 1
+
+
+def _weights(ground_truth):
+    """Return the weighting array of the space of ``ground_truth``.
+
+    Constant weights cancel in all FOMs and are not returned.
+    """
+    try:
+        return ground_truth.space.weighting.array
+    except AttributeError:
+        return None
+
+
+def _image_sums(stack, weights=None):
+    """Return the (weighted) sums of all entries of ``stack``."""
+    if weights is not None:
+        stack = stack * weights
+    return np.sum(stack.reshape((len(stack), -1)), axis=1)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -15,8 +15,8 @@ import scipy.signal
 import scipy.misc
 import odl
 import odl.contrib.fom
-from odl.contrib.fom.util import filter_image_sep2d
-from odl.util.testutils import simple_fixture
+from odl.contrib.fom.util import filter_image_sep, filter_image_sep2d
+from odl.util.testutils import all_almost_equal, simple_fixture
 
 fft_impl = simple_fixture('fft_impl',
                           [odl.util.testutils.never_skip('numpy'),
@@ -46,6 +46,38 @@ def test_filter_image_fft(fft_impl):
         assert np.allclose(conv_real, conv_fft)
 
 
+def test_filter_image_sep_nd():
+    """Test nD separable filtering of stacks against the real-space variant."""
+    images = np.random.rand(2, 10, 11, 12)
+    filters = [[1, 2, 1], [-1, 1], [1, 1, 1, 1]]
+    kernel = np.einsum('i,j,k->ijk', *[np.array(f, dtype=float)
+                                       for f in filters])
+
+    result = filter_image_sep(images, filters)
+    assert result.shape == images.shape
+    for image, res in zip(images, result):
+        expected = scipy.signal.convolve(image, kernel, mode='same')
+        assert np.allclose(res, expected)
+
+
+fom_name = simple_fixture('fom_name',
+                          ['mean_squared_error', 'psnr', 'ssim', 'haarpsi'])
+
+
+def test_fom_stack(fom_name):
+    """Test that stacks of data give the same result as single images."""
+    fom = getattr(odl.contrib.fom, fom_name)
+    space = odl.uniform_discr([0, 0], [1, 1], (32, 32))
+    true = space.element(np.random.rand(*space.shape))
+    data = np.random.rand(3, *space.shape)
+
+    result = fom(data, true)
+    expected = [fom(space.element(d), true) for d in data]
+
+    assert result.shape == (3,)
+    assert all_almost_equal(result, expected)
+
+
 def test_mean_squared_error(space):
     true = odl.phantom.white_noise(space)
     data = odl.phantom.white_noise(space)
@@ -15,27 +15,28 @@ from odl.trafos.backends import PYFFTW_AVAILABLE
 __all__ = ()
 
 
-def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
-    """Filter an image with a separable filter.
+def filter_image_sep(image, filters, impl='numpy', padding=None):
+    """Filter an image or a stack of images with a separable filter.
 
     Parameters
     ----------
-    image : 2D array-like
-        The image to be filtered. It must have a real (vs. complex) dtype.
-    fh, fv : 1D array-like
-        Horizontal (axis 0) and vertical (axis 1) filters. Their sizes
-        can be at most the image sizes in the respective axes.
+    image : array-like
+        The image to be filtered, or a stack of images with arbitrary
+        leading axes. It must have a real (vs. complex) dtype.
+    filters : sequence of 1D array-like
+        Filters for the last ``len(filters)`` axes of ``image``. Their
+        sizes can be at most the image sizes in the respective axes.
     impl : {'numpy', 'pyfftw'}, optional
         FFT backend to use. The ``pyfftw`` backend requires the
         ``pyfftw`` package to be installed. It is usually significantly
         faster than the NumPy backend.
-    padding : positive int, optional
+    padding : nonnegative int, optional
         Amount of zeros added to the left and right of the image in all
-        axes before FFT. This helps avoiding wraparound artifacts due to
-        large boundary values.
+        filtered axes before FFT. This helps avoiding wraparound artifacts
+        due to large boundary values.
         For ``None``, the padding is computed as ::
 
-            padding = min(max(len(fh), len(fv)) - 1, 64)
+            padding = min(max(len(filt) for filt in filters) - 1, 64)
 
         A padding of ``len(filt) - 1`` ensures that errors in FFT-based
         convolutions are small. At the same time, the padding should not
@@ -43,46 +44,68 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
 
     Returns
     -------
-    filtered : 2D `numpy.ndarray`
-        The image filtered horizontally by ``fh`` and vertically by ``fv``.
-        It has the same shape as ``image``, and its dtype is
-        ``np.result_type(image, fh, fv)``.
+    filtered : `numpy.ndarray`
+        The image filtered by ``filters[i]`` in axis
+        ``image.ndim - len(filters) + i``. It has the same shape as
+        ``image``, and its dtype is ``np.result_type(image, *filters)``.
+
+    Notes
+    -----
+    For a stack of images, the filter spectra are computed once, and the
+    FFTs of all images are done in a single call, respectively with a
+    single plan for the ``pyfftw`` backend.
+
+    Examples
+    --------
+    Apply a moving average in both axes of a stack of two images. With
+    ``padding=0``, the filter wraps around at the boundary:
+
+    >>> images = np.zeros((2, 3, 4))
+    >>> images[1, 1, 1] = 9
+    >>> result = filter_image_sep(images, [[1, 1, 1], [1, 1, 1]],
+    ...                           padding=0)
+    >>> np.round(result[1]).astype(int)
+    array([[9, 9, 9, 0],
+           [9, 9, 9, 0],
+           [9, 9, 9, 0]])
+    >>> np.allclose(result[0], 0)
+    True
     """
-    # TODO: generalize for nD
     impl, impl_in = str(impl).lower(), impl
     image = np.asarray(image)
-    if image.ndim != 2:
-        raise ValueError('`image` must be 2-dimensional, got image with '
-                         'ndim={}'.format(image.ndim))
-    if image.size == 0:
-        raise ValueError('`image` cannot have size 0')
     if not np.issubsctype(image.dtype, np.floating):
         image = image.astype(float)
 
-    fh = np.asarray(fh).astype(image.dtype)
-    if fh.ndim != 1:
-        raise ValueError('`fh` must be one-dimensional')
-    elif fh.size == 0:
-        raise ValueError('`fh` cannot have size 0')
-    elif fh.size > image.shape[0]:
-        raise ValueError('`fh` can be at most `image.shape[0]`, got '
-                         '{} > {}'.format(fh.size, image.shape[0]))
-
-    fv = np.asarray(fv).astype(image.dtype)
-    if fv.ndim != 1:
-        raise ValueError('`fv` must be one-dimensional')
-    elif fv.size == 0:
-        raise ValueError('`fv` cannot have size 0')
-    elif fv.size > image.shape[0]:
-        raise ValueError('`fv` can be at most `image.shape[1]`, got '
-                         '{} > {}'.format(fv.size, image.shape[1]))
+    filters = [np.asarray(filt).astype(image.dtype) for filt in filters]
+    ndim = len(filters)
+    if ndim == 0:
+        raise ValueError('`filters` cannot be empty')
+    if image.ndim < ndim:
+        raise ValueError('`image` must have at least {} axes, got image '
+                         'with ndim={}'.format(ndim, image.ndim))
+    if image.size == 0:
+        raise ValueError('`image` cannot have size 0')
+
+    axes = tuple(range(image.ndim - ndim, image.ndim))
+    for i, (filt, axis) in enumerate(zip(filters, axes)):
+        if filt.ndim != 1:
+            raise ValueError('`filters[{}]` must be one-dimensional'
+                             ''.format(i))
+        elif filt.size == 0:
+            raise ValueError('`filters[{}]` cannot have size 0'.format(i))
+        elif filt.size > image.shape[axis]:
+            raise ValueError('`filters[{}]` can be at most `image.shape[{}]`, '
+                             'got {} > {}'.format(i, axis, filt.size,
+                                                  image.shape[axis]))
 
     # Pad image with zeros
     if padding is None:
-        padding = min(max(len(fh), len(fv)) - 1, 64)
+        padding = min(max(len(filt) for filt in filters) - 1, 64)
 
     if padding != 0:
-        image_padded = np.pad(image, padding, mode='constant')
+        pad_width = ([(0, 0)] * (image.ndim - ndim) +
+                     [(padding, padding)] * ndim)
+        image_padded = np.pad(image, pad_width, mode='constant')
     else:
         image_padded = image.copy() if impl == 'pyfftw' else image
 
@@ -100,20 +123,31 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
         padded[len(padded) - mid:] = filt[:mid]
         return padded
 
-    fh = prepare_for_fft(fh, image_padded.shape[0])
-    fv = prepare_for_fft(fv, image_padded.shape[1])
+    # Spectra of the filters, shaped for broadcasting against the
+    # half-complex transform of the image. They are cheap to compute
+    # with NumPy for all backends.
+    filters_ft = []
+    for i, (filt, axis) in enumerate(zip(filters, axes)):
+        filt = prepare_for_fft(filt, image_padded.shape[axis])
+        if i == ndim - 1:
+            filt_ft = np.fft.rfft(filt)
+        else:
+            filt_ft = np.fft.fft(filt)
+        bcast_shape = [1] * image.ndim
+        bcast_shape[axis] = -1
+        filters_ft.append(filt_ft.reshape(bcast_shape))
 
     # Perform the multiplication in Fourier space and apply inverse FFT
     if impl == 'numpy':
-        image_ft = np.fft.rfftn(image_padded)
-        fh_ft = np.fft.fft(fh)
-        fv_ft = np.fft.rfft(fv)
+        image_ft = np.fft.rfftn(image_padded, axes=axes)
+        for filt_ft in filters_ft:
+            image_ft *= filt_ft
 
-        image_ft *= fh_ft[:, None]
-        image_ft *= fv_ft[None, :]
         # Important to specify the shape since `irfftn` cannot know the
         # original shape
-        conv = np.fft.irfftn(image_ft, s=image_padded.shape)
+        conv = np.fft.irfftn(image_ft, s=[image_padded.shape[axis]
+                                          for axis in axes],
+                             axes=axes)
         if conv.dtype != image.dtype:
             conv = conv.astype(image.dtype)
 
@@ -126,49 +160,28 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
         import pyfftw
         import multiprocessing
 
-        # Generate output arrays, for half-complex transform of image and
-        # vertical filter, and full FT of the horizontal filter
-        out_img_shape = (image_padded.shape[0], image_padded.shape[1] // 2 + 1)
+        # Generate output array for the half-complex transform of the image
+        out_img_shape = (image_padded.shape[:-1] +
+                         (image_padded.shape[-1] // 2 + 1,))
         out_img_dtype = np.result_type(image_padded, 1j)
         out_img = np.empty(out_img_shape, out_img_dtype)
 
-        out_fh_shape = out_img_shape[0]
-        out_fh_dtype = np.result_type(fh, 1j)
-        fh_c = fh.astype(out_fh_dtype)  # need to make this a C2C trafo
-        out_fh = np.empty(out_fh_shape, out_fh_dtype)
-
-        out_fv_shape = out_img_shape[1]
-        out_fv_dtype = np.result_type(fv, 1j)
-        out_fv = np.empty(out_fv_shape, out_fv_dtype)
-
-        # Perform the forward transforms of image and filters. We use
-        # the `FFTW_ESTIMATE` flag to not allow the planner to destroy
+        # Perform the forward transform of all images with one plan. We
+        # use the `FFTW_ESTIMATE` flag to not allow the planner to destroy
         # the input.
-        plan = pyfftw.FFTW(image_padded, out_img, axes=(0, 1),
+        plan = pyfftw.FFTW(image_padded, out_img, axes=axes,
                            direction='FFTW_FORWARD',
                            flags=['FFTW_ESTIMATE'],
                            threads=multiprocessing.cpu_count())
         plan(image_padded, out_img)
 
-        plan = pyfftw.FFTW(fh_c, out_fh, axes=(0,),
-                           direction='FFTW_FORWARD',
-                           flags=['FFTW_ESTIMATE'],
-                           threads=multiprocessing.cpu_count())
-        plan(fh_c, out_fh)
-
-        plan = pyfftw.FFTW(fv, out_fv, axes=(0,),
-                           direction='FFTW_FORWARD',
-                           flags=['FFTW_ESTIMATE'],
-                           threads=multiprocessing.cpu_count())
-        plan(fv, out_fv)
-
         # Fourier space multiplication
-        out_img *= out_fh[:, None]
-        out_img *= out_fv[None, :]
+        for filt_ft in filters_ft:
+            out_img *= filt_ft
 
         # Inverse trafo
         conv = image_padded  # Overwrite
-        plan = pyfftw.FFTW(out_img.copy(), conv, axes=(0, 1),
+        plan = pyfftw.FFTW(out_img.copy(), conv, axes=axes,
                            direction='FFTW_BACKWARD',
                            flags=['FFTW_ESTIMATE'],
                            threads=multiprocessing.cpu_count())
@@ -178,18 +191,79 @@ def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
         raise ValueError('unsupported `impl` {!r}'.format(impl_in))
 
     if padding:
-        return conv[padding:-padding, padding:-padding]
+        return conv[(Ellipsis,) + (slice(padding, -padding),) * ndim]
     else:
         return conv
 
 
+def filter_image_sep2d(image, fh, fv, impl='numpy', padding=None):
+    """Filter an image with a separable filter.
+
+    Parameters
+    ----------
+    image : 2D array-like
+        The image to be filtered. It must have a real (vs. complex) dtype.
+    fh, fv : 1D array-like
+        Horizontal (axis 0) and vertical (axis 1) filters. Their sizes
+        can be at most the image sizes in the respective axes.
+    impl : {'numpy', 'pyfftw'}, optional
+        FFT backend to use. The ``pyfftw`` backend requires the
+        ``pyfftw`` package to be installed. It is usually significantly
+        faster than the NumPy backend.
+    padding : positive int, optional
+        Amount of zeros added to the left and right of the image in all
+        axes before FFT. This helps avoiding wraparound artifacts due to
+        large boundary values.
+        For ``None``, the padding is computed as ::
+
+            padding = min(max(len(fh), len(fv)) - 1, 64)
+
+        A padding of ``len(filt) - 1`` ensures that errors in FFT-based
+        convolutions are small. At the same time, the padding should not
+        be excessive to retain efficiency.
+
+    Returns
+    -------
+    filtered : 2D `numpy.ndarray`
+        The image filtered horizontally by ``fh`` and vertically by ``fv``.
+        It has the same shape as ``image``, and its dtype is
+        ``np.result_type(image, fh, fv)``.
+
+    See Also
+    --------
+    filter_image_sep : nD variant, also for stacks of images
+    """
+    image = np.asarray(image)
+    if image.ndim != 2:
+        raise ValueError('`image` must be 2-dimensional, got image with '
+                         'ndim={}'.format(image.ndim))
+    return filter_image_sep(image, [fh, fv], impl=impl, padding=padding)
+
+
+def _filter_image_pair(img1, img2, fh, fv, impl):
+    """Return ``img1`` and ``img2`` filtered with a single FFT call.
+
+    ``img1`` can be a stack of 2D images, in which case ``img2`` is
+    filtered once and appended to the stack.
+    """
+    img1, img2 = np.asarray(img1), np.asarray(img2)
+    if img1.ndim < 2 or img1.shape[-2:] != img2.shape:
+        raise ValueError('`img1.shape` must end with `img2.shape` {}, got '
+                         '{}'.format(img2.shape, img1.shape))
+
+    stack = np.concatenate([img1.reshape((-1,) + img2.shape), img2[None]])
+    filtered = filter_image_sep(stack, [fh, fv], impl=impl)
+    return filtered[:-1].reshape(img1.shape), filtered[-1]
+
+
 def haarpsi_similarity_map(img1, img2, axis, c, a):
     """Local similarity map for directional features along an axis.
 
     Parameters
     ----------
     img1, img2 : array-like
-        The images to compare. They must have equal shape.
+        The images to compare. They must have equal shape, or ``img1`` can
+        be a stack of images with shape ``extra_shape + img2.shape``.
     axis : {0, 1}
         Direction in which to look for edge similarities.
     c : positive float
@@ -205,7 +279,8 @@ def haarpsi_similarity_map(img1, img2, axis, c, a):
     -------
     local_sim : `numpy.ndarray`
         Pointwise similarity of directional edge features of ``img1`` and
-        ``img2``, measured using two Haar wavelet detail levels.
+        ``img2``, measured using two Haar wavelet detail levels. It has
+        the same shape as ``img1``.
 
     Notes
     -----
@@ -285,11 +360,10 @@ def haarpsi_similarity_map(img1, img2, axis, c, a):
         raise ValueError('`axis` out of the valid range 0 -> 1')
 
     # Filter images with level 1 and 2 filters
-    img1_lvl1 = filter_image_sep2d(img1, fh_lvl1, fv_lvl1, impl=impl)
-    img1_lvl2 = filter_image_sep2d(img1, fh_lvl2, fv_lvl2, impl=impl)
-
-    img2_lvl1 = filter_image_sep2d(img2, fh_lvl1, fv_lvl1, impl=impl)
-    img2_lvl2 = filter_image_sep2d(img2, fh_lvl2, fv_lvl2, impl=impl)
+    img1_lvl1, img2_lvl1 = _filter_image_pair(img1, img2, fh_lvl1, fv_lvl1,
+                                              impl=impl)
+    img1_lvl2, img2_lvl2 = _filter_image_pair(img1, img2, fh_lvl2, fv_lvl2,
+                                              impl=impl)
 
     c = float(c)
 
@@ -328,14 +402,16 @@ def haarpsi_weight_map(img1, img2, axis):
     Parameters
     ----------
     img1, img2 : array-like
-        The images to compare. They must have equal shape.
+        The images to compare. They must have equal shape, or ``img1`` can
+        be a stack of images with shape ``extra_shape + img2.shape``.
     axis : {0, 1}
         Direction in which to look for edge similarities.
 
     Returns
     -------
     weight_map : `numpy.ndarray`
-        The pointwise weight map. See Notes for details.
+        The pointwise weight map, with the same shape as ``img1``. See Notes
+        for details.
 
     Notes
     -----
@@ -385,8 +461,8 @@ def haarpsi_weight_map(img1, img2, axis):
         raise ValueError('`axis` out of the valid range 0 -> 1')
 
     # Filter with level 3 wavelet filter
-    img1_lvl3 = filter_image_sep2d(img1, fh_lvl3, fv_lvl3, impl=impl)
-    img2_lvl3 = filter_image_sep2d(img2, fh_lvl3, fv_lvl3, impl=impl)
+    img1_lvl3, img2_lvl3 = _filter_image_pair(img1, img2, fh_lvl3, fv_lvl3,
+                                              impl=impl)
 
     # Return the pointwise maximum of the filtered images
     np.abs(img1_lvl3, out=img1_lvl3)
@@ -586,7 +586,7 @@ extended-mrc-format-not-used-by-2dx
             raise ValueError("`groupby` '{}' not understood"
                              "".format(groupby_in))
 
-    def read_data(self, dstart=None, dend=None, swap_axes=True):
+    def read_data(self, dstart=None, dend=None, swap_axes=True, mmap=False):
         """Read the data from `file` and return it as Numpy array.
 
         Parameters
@@ -604,19 +604,95 @@ extended-mrc-format-not-used-by-2dx
             If ``True``, use `data_axis_order` to swap the axes in the
             returned array. In that case, the shape of the array may no
             longer agree with `data_storage_shape`.
+        mmap : bool, optional
+            If ``True``, return a lazily loaded, memory-mapped view of the
+            data in `file`, see
+            `FileReaderRawBinaryWithHeader.read_data` for details.
+            The view can be used as input to ``space.element`` without
+            copying.
 
         Returns
         -------
         data : `numpy.ndarray`
             The data read from `file`.
+
+        See Also
+        --------
+        iter_data
         """
-        data = super(FileReaderMRC, self).read_data(dstart, dend)
-        data = data.reshape(self.data_shape, order='F')
+        data = super(FileReaderMRC, self).read_data(dstart, dend, mmap=mmap)
+        data = data.reshape(self.data_storage_shape, order='F')
         if swap_axes:
             data = np.transpose(data, axes=self.data_axis_order)
             assert data.shape == self.data_shape
         return data
 
+    def iter_data(self, num_sections=1, swap_axes=True):
+        """Iterate over slabs of the data along the slowest storage axis.
+
+        The data is stored in Fortran order, hence sections along the
+        last axis of `data_storage_shape` are contiguous in `file`.
+        Reading the data slab by slab keeps the memory overhead at the
+        size of one slab, e.g., for filling a preallocated array. ::
+
+            with FileReaderMRC(file) as reader:
+                reader.read_header()
+                space = odl.uniform_discr(min_pt, max_pt, reader.data_shape,
+                                          dtype=reader.data_dtype)
+                x = space.element()
+                for index, slab in reader.iter_data(num_sections=16):
+                    x[index] = slab
+
+        Parameters
+        ----------
+        num_sections : positive int, optional
+            Number of sections along the slowest storage axis per slab.
+        swap_axes : bool, optional
+            If ``True``, use `data_axis_order` to swap the axes of each
+            slab, as in `read_data`.
+
+        Yields
+        ------
+        index : tuple of slice
+            Position of ``slab`` in the full data, i.e.,
+            ``read_data(swap_axes=swap_axes)[index]`` is equal to ``slab``.
+        slab : `numpy.ndarray`
+            The data of the current slab.
+
+        See Also
+        --------
+        read_data
+        """
+        if self.data_storage_shape == -1:
+            raise ValueError('data shape unknown, `read_header` must be '
+                             'called first')
+        num_sections, num_sections_in = int(num_sections), num_sections
+        if num_sections <= 0:
+            raise ValueError('`num_sections` must be positive, got {}'
+                             ''.format(num_sections_in))
+
+        storage_shape = self.data_storage_shape
+        section_bytes = (int(np.prod(storage_shape[:-1])) *
+                         self.data_dtype.itemsize)
+        if swap_axes:
+            slow_axis = self.data_axis_order.index(2)
+        else:
+            slow_axis = 2
+
+        for start in range(0, storage_shape[-1], num_sections):
+            stop = min(start + num_sections, storage_shape[-1])
+            dstart = self.header_size + start * section_bytes
+            dend = self.header_size + stop * section_bytes
+            slab = super(FileReaderMRC, self).read_data(dstart, dend)
+            slab = slab.reshape(storage_shape[:-1] + (stop - start,),
+                                order='F')
+            if swap_axes:
+                slab = np.transpose(slab, axes=self.data_axis_order)
+
+            index = [slice(None)] * 3
+            index[slow_axis] = slice(start, stop)
+            yield tuple(index), slab
+
 
 class FileWriterMRC(MRCHeaderProperties, FileWriterRawBinaryWithHeader):
 
@@ -217,5 +217,44 @@ def test_mrc_io(shape, mrc_mode_dtype, ispg_kind, axis_order):
         assert reader.labels == ()
 
 
+def test_mrc_read_data(axis_order):
+    """Test reading MRC data in full, memory-mapped and in slabs."""
+    shape = (4, 5, 6)
+    dtype = np.dtype('float32')
+    header = mrc_header_from_params(shape, dtype, 'volume',
+                                    axis_order=axis_order)
+
+    with tempfile.NamedTemporaryFile() as named_file:
+        file = named_file.file
+        data = np.random.rand(*shape).astype(dtype)
+        with FileWriterMRC(file, header) as writer:
+            writer.write(data)
+
+        reader = FileReaderMRC(file)
+        reader.read_header()
+        assert np.array_equal(reader.read_data(), data)
+
+        # Memory-mapped data can be wrapped without copy
+        mapped = reader.read_data(mmap=True)
+        assert np.array_equal(mapped, data)
+        space = odl.uniform_discr([0, 0, 0], shape, shape, dtype=dtype)
+        elem = space.element(mapped)
+        assert np.shares_memory(elem.asarray(), mapped)
+
+        # Reading slabs into a preallocated element
+        elem = space.element()
+        num_slabs = 0
+        for index, slab in reader.iter_data(num_sections=4):
+            elem[index] = slab
+            num_slabs += 1
+        assert np.array_equal(elem, data)
+        storage_nz = reader.data_storage_shape[-1]
+        assert num_slabs == -(-storage_nz // 4)
+
+        storage_data = reader.read_data(swap_axes=False)
+        for index, slab in reader.iter_data(swap_axes=False):
+            assert np.array_equal(storage_data[index], slab)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -62,6 +62,10 @@ def test_uncompr_bin_io_without_header(shape, floating_dtype, order):
                                                    order=order)
             assert np.array_equal(file_data, flat_data)
 
+            # whole file, memory-mapped
+            file_data = reader.read_data(mmap=True)
+            assert np.array_equal(file_data, flat_data)
+
             # again whole file, but with explicit arguments
             file_data = reader.read_data(dstart=0, dend=file_size).reshape(
                 reader.data_storage_shape, order=order)
@@ -460,7 +460,7 @@ class FileReaderRawBinaryWithHeader(object):
 
         return header
 
-    def read_data(self, dstart=None, dend=None):
+    def read_data(self, dstart=None, dend=None, mmap=False):
         """Read data from `file` and return it as Numpy array.
 
         Parameters
@@ -474,6 +474,13 @@ class FileReaderRawBinaryWithHeader(object):
             End position in bytes until which data is read (exclusive).
             Backwards indexing with negative values is also supported.
             Use a value different from the file size to extract a data subset.
+        mmap : bool, optional
+            If ``True``, return a memory-mapped array instead of reading
+            the data into memory. Values are then loaded lazily from
+            `file` when they are accessed, which avoids holding a full
+            copy of large data sets in memory. The array is copy-on-write,
+            i.e., changes to it are not written back to `file`.
+            This requires `file` to be a file on disk.
 
         Returns
         -------
@@ -520,6 +527,18 @@ class FileReaderRawBinaryWithHeader(object):
                 'the itemsize {} of the data type {}'
                 ''.format(dend_abs - dstart_abs, self.data_dtype.itemsize,
                           self.data_dtype))
+        if mmap:
+            try:
+                self.file.fileno()
+            except (AttributeError, IOError, ValueError):
+                raise ValueError('memory mapping requires a file on disk, '
+                                 'got {!r}'.format(self.file))
+            # Make buffered writes to the same file visible to the map
+            if hasattr(self.file, 'flush'):
+                self.file.flush()
+            return np.memmap(self.file, dtype=self.data_dtype, mode='c',
+                             offset=dstart_abs, shape=(int(num_elems),))
+
         self.file.seek(dstart_abs)
         array = np.empty(int(num_elems), dtype=self.data_dtype)
         self.file.readinto(array.data)
@@ -14,9 +14,13 @@ see `the pytorch installation guide
 """
 
 from __future__ import division
+from multiprocessing.pool import ThreadPool
 import numpy as np
 import torch
 
+from odl.discr import DiscreteLp
+from odl.space.base_tensors import TensorSpace
+
 __all__ = ('OperatorAsAutogradFunction', 'OperatorAsModule')
 
 # TODO: ProductSpaceOperator as implementation of channels_in and channels_out?
@@ -30,12 +34,12 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
     autograd machinery by implementing custom ``forward()`` and
     ``backward()`` methods.
 
-    Do not use this directly in a pytorch ``Module`` since backpropagation
-    with batches and channels will not work as expected. For that
-    purpose, use `OperatorAsModule` instead.
+    Inputs can have extra leading axes, e.g., for batch and channels,
+    in which case the operator is mapped over those axes. Inside a
+    pytorch ``Module``, use `OperatorAsModule` instead.
     """
 
-    def __init__(self, operator):
+    def __init__(self, operator, num_threads=1):
         """Initialize a new instance.
 
         Parameters
@@ -43,6 +47,11 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         operator : `Operator`
             The ODL operator to be wrapped. For gradient computations to
             work, ``operator.derivative(x).adjoint`` must be implemented.
+        num_threads : positive int, optional
+            Number of threads used to evaluate ``operator`` on the entries
+            of a batch. Values larger than 1 require ``operator`` and its
+            adjoint to be thread-safe, which is, e.g., not the case for
+            ray transforms with ``use_cache=True``.
 
         Examples
         --------
@@ -55,6 +64,11 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         """
         super(OperatorAsAutogradFunction, self).__init__()
         self.operator = operator
+        self.num_threads, num_threads_in = int(num_threads), num_threads
+        if self.num_threads < 1:
+            raise ValueError('`num_threads` must be positive, got {}'
+                             ''.format(num_threads_in))
+        self.__extra_shape = None
 
     def forward(self, input):
         """Evaluate forward pass on the input.
@@ -62,12 +76,16 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         Parameters
         ----------
         input : `torch.tensor._TensorBase`
-            Point at which to evaluate the operator.
+            Point at which to evaluate the operator. Its shape must be
+            ``extra_shape + operator.domain.shape``, where ``extra_shape``
+            can be empty.
 
         Returns
         -------
         result : `torch.autograd.variable.Variable`
-            Variable holding the result of the evaluation.
+            Variable holding the result of the evaluation, with shape
+            ``extra_shape + operator.range.shape``. For functionals and
+            empty ``extra_shape``, the shape is ``(1,)``.
 
         Examples
         --------
@@ -95,27 +113,41 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         Variable containing:
          14
         [torch.FloatTensor of size 1]
+
+        Evaluate the operator on a batch of two inputs:
+
+        >>> x = torch.Tensor([[1, 2, 3],
+        ...                   [0, 0, 1]])
+        >>> x_var = torch.autograd.Variable(x)
+        >>> torch_op(x_var)
+        Variable containing:
+         4  5
+         1  1
+        [torch.FloatTensor of size 2x2]
         """
-        # TODO: batched evaluation
         if not self.operator.is_linear:
             # Only needed for nonlinear operators
             self.save_for_backward(input)
 
         # TODO: use GPU memory directly if possible
-        input_arr = input.cpu().numpy()
-        if any(s == 0 for s in input_arr.strides):
-            # TODO: remove when Numpy issue #9165 is fixed
-            # https://github.com/numpy/numpy/pull/9177
-            input_arr = input_arr.copy()
-
-        op_result = self.operator(input_arr)
-        if np.isscalar(op_result):
-            # For functionals, the result is funnelled through `float`,
-            # so we wrap it into a Numpy array with the same dtype as
-            # `operator.domain`
-            op_result = np.array(op_result, ndmin=1,
-                                 dtype=self.operator.domain.dtype)
-        tensor = torch.from_numpy(np.array(op_result, copy=False, ndmin=1))
+        dom_shape = self.operator.domain.shape
+        ran_shape = getattr(self.operator.range, 'shape', ())
+        input_arr = _tensor_to_numpy(input)
+        self.__extra_shape = _extra_shape(input_arr.shape, dom_shape)
+
+        # For functionals, the result is funnelled through `float`, so we
+        # use the same dtype as `operator.domain`
+        dtype = getattr(self.operator.range, 'dtype', None)
+        if dtype is None:
+            dtype = self.operator.domain.dtype
+
+        result_arr = np.empty(self.__extra_shape + ran_shape, dtype=dtype)
+        _apply_batch(lambda i: self.operator,
+                     input_arr.reshape((-1,) + dom_shape),
+                     result_arr.reshape((-1,) + ran_shape),
+                     self.num_threads)
+
+        tensor = torch.from_numpy(result_arr.reshape(result_arr.shape or 1))
         if input.is_cuda:
             # Push back to GPU
             tensor = tensor.cuda()
@@ -205,12 +237,11 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         the previous `forward` pass.
         """
         # TODO: implement directly for GPU data
+        dom_shape = self.operator.domain.shape
+        ran_shape = getattr(self.operator.range, 'shape', ())
         if not self.operator.is_linear:
-            input_arr = self.saved_variables[0].data.cpu().numpy()
-            if any(s == 0 for s in input_arr.strides):
-                # TODO: remove when Numpy issue #9165 is fixed
-                # https://github.com/numpy/numpy/pull/9177
-                input_arr = input_arr.copy()
+            input_arr = _tensor_to_numpy(self.saved_variables[0].data)
+            input_arr = input_arr.reshape((-1,) + dom_shape)
 
         grad = None
 
@@ -228,23 +259,28 @@ class OperatorAsAutogradFunction(torch.autograd.Function):
         scaling = dom_weight / ran_weight
 
         if self.needs_input_grad[0]:
-            grad_output_arr = grad_output.cpu().numpy()
-            if any(s == 0 for s in grad_output_arr.strides):
-                # TODO: remove when Numpy issue #9165 is fixed
-                # https://github.com/numpy/numpy/pull/9177
-                grad_output_arr = grad_output_arr.copy()
+            grad_output_arr = _tensor_to_numpy(grad_output)
 
             if self.operator.is_linear:
                 adjoint = self.operator.adjoint
+
+                def get_adjoint(i):
+                    return adjoint
             else:
-                adjoint = self.operator.derivative(input_arr).adjoint
+                def get_adjoint(i):
+                    return self.operator.derivative(input_arr[i]).adjoint
 
-            grad_odl = adjoint(grad_output_arr)
+            grad_arr = np.empty(self.__extra_shape + dom_shape,
+                                dtype=self.operator.domain.dtype)
+            _apply_batch(get_adjoint,
+                         grad_output_arr.reshape((-1,) + ran_shape),
+                         grad_arr.reshape((-1,) + dom_shape),
+                         self.num_threads)
 
             if scaling != 1.0:
-                grad_odl *= scaling
+                grad_arr *= scaling
 
-            grad = torch.from_numpy(np.array(grad_odl, copy=False, ndmin=1))
+            grad = torch.from_numpy(grad_arr)
 
             if grad_output.is_cuda:
                 # Push back to GPU
@@ -271,7 +307,7 @@ class OperatorAsModule(torch.nn.Module):
         over them and stacking the results.
     """
 
-    def __init__(self, operator):
+    def __init__(self, operator, num_threads=1):
         """Initialize a new instance.
 
         Parameters
@@ -279,6 +315,9 @@ class OperatorAsModule(torch.nn.Module):
         operator : `Operator`
             The ODL operator to be wrapped. For gradient computations to
             work, ``operator.derivative(x).adjoint`` must be implemented.
+        num_threads : positive int, optional
+            Number of threads used to evaluate ``operator`` on the entries
+            of a batch, see `OperatorAsAutogradFunction`.
 
         Examples
         --------
@@ -290,7 +329,7 @@ class OperatorAsModule(torch.nn.Module):
         True
         """
         super(OperatorAsModule, self).__init__()
-        self.op_func = OperatorAsAutogradFunction(operator)
+        self.op_func = OperatorAsAutogradFunction(operator, num_threads)
 
     @property
     def operator(self):
@@ -371,7 +410,6 @@ class OperatorAsModule(torch.nn.Module):
         """
         in_shape = x.data.shape
         op_in_shape = self.op_func.operator.domain.shape
-        op_out_shape = self.op_func.operator.range.shape
 
         extra_shape = in_shape[:-len(op_in_shape)]
 
@@ -380,16 +418,8 @@ class OperatorAsModule(torch.nn.Module):
             raise ValueError('expected input of shape (N, *, {}), got input '
                              'with shape {}'.format(shp_str, in_shape))
 
-        # Flatten extra axes, then do one entry at a time
-        newshape = (int(np.prod(extra_shape)),) + op_in_shape
-        x_flat_xtra = x.resize(*newshape)
-        results = []
-        for i in range(x_flat_xtra.data.shape[0]):
-            results.append(self.op_func(x_flat_xtra[i]))
-
-        # Reshape the resulting stack to the expected output shape
-        stack_flat_xtra = torch.stack(results)
-        return stack_flat_xtra.view(extra_shape + op_out_shape)
+        # The function maps the operator over the extra axes
+        return self.op_func(x)
 
     def __repr__(self):
         """Return ``repr(self)``."""
@@ -405,6 +435,59 @@ class OperatorAsModule(torch.nn.Module):
                                           op_name, op_dom_shape, op_ran_shape)
 
 
+def _tensor_to_numpy(tensor):
+    """Return a Numpy array with the values of ``tensor``.
+
+    For contiguous tensors on the CPU, the array shares memory with
+    ``tensor``, otherwise a contiguous copy on the host is made.
+    """
+    if tensor.is_cuda or not tensor.is_contiguous():
+        tensor = tensor.contiguous().cpu()
+    arr = tensor.numpy()
+    if any(s == 0 for s in arr.strides):
+        # TODO: remove when Numpy issue #9165 is fixed
+        # https://github.com/numpy/numpy/pull/9177
+        arr = arr.copy()
+    return arr
+
+
+def _extra_shape(shape, op_shape):
+    """Return the leading axes of ``shape`` not covered by ``op_shape``."""
+    shape, op_shape = tuple(shape), tuple(op_shape)
+    num_extra = len(shape) - len(op_shape)
+    if num_extra < 0 or shape[num_extra:] != op_shape:
+        shp_str = str(op_shape).strip('()')
+        raise ValueError('expected input of shape (*, {}), got input with '
+                         'shape {}'.format(shp_str, shape))
+    return shape[:num_extra]
+
+
+def _apply_batch(get_op, inp, out, num_threads):
+    """Store ``get_op(i)(inp[i])`` in ``out[i]`` for all ``i``.
+
+    Operators with tensor range write their results directly into
+    ``out``, without temporary arrays.
+    """
+    def apply(i):
+        op = get_op(i)
+        if isinstance(op.range, (TensorSpace, DiscreteLp)):
+            op(inp[i], out=op.range.element(out[i]))
+        else:
+            out[i] = op(inp[i])
+
+    num_threads = min(num_threads, len(inp))
+    if num_threads <= 1:
+        for i in range(len(inp)):
+            apply(i)
+    else:
+        pool = ThreadPool(num_threads)
+        try:
+            pool.map(apply, range(len(inp)))
+        finally:
+            pool.close()
+            pool.join()
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     import odl
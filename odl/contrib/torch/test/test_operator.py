@@ -93,6 +93,39 @@ def test_autograd_function_backward(dtype, use_cuda):
         assert torch_grad.is_cuda
 
 
+def test_autograd_function_batched(use_cuda):
+    """Test batched evaluation with operators as autograd functions."""
+    matrix = np.random.rand(2, 3).astype('float32')
+    odl_op = odl.MatrixOperator(matrix)
+    torch_op = odl_torch.OperatorAsAutogradFunction(odl_op, num_threads=2)
+
+    x_arr = np.random.rand(4, 5, 3).astype('float32')
+    w_arr = np.random.rand(4, 5, 2).astype('float32')
+    x = torch.from_numpy(x_arr)
+    w = torch.from_numpy(w_arr)
+    if use_cuda:
+        x = x.cuda()
+        w = w.cuda()
+    x_var = autograd.Variable(x, requires_grad=True)
+    w_var = autograd.Variable(w)
+
+    res_var = torch_op(x_var)
+    assert res_var.data.shape == (4, 5, 2)
+    assert all_almost_equal(res_var.data.cpu().numpy(),
+                            x_arr.dot(matrix.T))
+
+    # Gradient of `sum(w * op(x))` is `op.adjoint(w)` in each entry
+    (res_var * w_var).sum().backward()
+    assert x_var.grad.data.shape == (4, 5, 3)
+    assert all_almost_equal(x_var.grad.data.cpu().numpy(),
+                            w_arr.dot(matrix))
+
+    # Make sure data stays on the GPU
+    if use_cuda:
+        assert res_var.is_cuda
+        assert x_var.grad.is_cuda
+
+
 def test_module_forward(shape, use_cuda):
     """Test forward evaluation with operators as modules."""
     ndim = len(shape)
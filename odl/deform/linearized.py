@@ -14,10 +14,327 @@ import numpy as np
 from odl.discr import DiscreteLp, Gradient, Divergence
 from odl.operator import Operator, PointwiseInner
 from odl.space import ProductSpace
-from odl.util import signature_string, indent
+from odl.util import signature_string, indent, writable_array
 
 
-__all__ = ('LinDeformFixedTempl', 'LinDeformFixedDisp', 'linear_deform')
+__all__ = ('LinDeformFixedTempl', 'LinDeformFixedDisp', 'linear_deform',
+           'DeformationPlan')
+
+# Number of points processed at once in `DeformationPlan`
+_DEFORM_CHUNK_SIZE = 2 ** 16
+
+# Number of points for which `linear_deform` and `LinDeformFixedTempl`
+# build a `DeformationPlan` at once, bounding the memory used by plans
+_PLAN_CHUNK_SIZE = 2 ** 20
+
+
+class DeformationPlan(object):
+
+    """Reusable sampling plan for a deformation with a fixed displacement.
+
+    For a displacement field ``v`` on a uniform grid, the plan stores the
+    neighbors of the displaced grid points ``x + v(x)`` and their
+    interpolation weights. Since these are computed in index space, i.e.,
+    as ``i + v(x_i) / stride``, no array of grid points is needed.
+
+    The plan can be applied to any number of functions, e.g., a template
+    and all components of its gradient, which are then deformed in a
+    single pass over the points with one gather per neighbor and
+    function. The points are processed in chunks, such that temporary
+    arrays have a bounded size.
+
+    The plan itself uses up to 52 bytes per point in 3D, see `nbytes`.
+    For large volumes, plans can be built for slices along the first
+    axis one after the other, see the ``slc`` parameter.
+
+    The results are the same as interpolation with
+    ``space.interpolation`` in the displaced points, up to rounding.
+    """
+
+    def __init__(self, displacement, space=None, slc=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        displacement : element of power space of `DiscreteLp`
+            Real displacement field ``v`` used in the deformation, with
+            one component per axis of ``space``.
+        space : `DiscreteLp`, optional
+            Space of the functions to be deformed. It must be uniform with
+            at least two points per axis and use ``'nearest'`` or
+            ``'linear'`` interpolation in each axis.
+            Default: ``displacement.space[0]``
+        slc : slice, optional
+            Slice along the first axis selecting the points for which the
+            plan is built. The deformed functions are restricted to these
+            points, but the functions to be deformed are still given on
+            all of ``space``. The step of the slice must be 1.
+            Default: all points
+
+        Examples
+        --------
+        Deform two functions with the same displacement:
+
+        >>> space = odl.uniform_discr(0, 1, 5, interp='linear')
+        >>> disp_field = space.tangent_bundle.element([[0, 0, 0, -0.1, 0]])
+        >>> plan = DeformationPlan(disp_field)
+        >>> f = space.element([0, 0, 1, 0, 0])
+        >>> g = space.element([1, 2, 3, 4, 5])
+        >>> f_deformed, g_deformed = plan([f, g])
+        >>> f_deformed
+        array([ 0. ,  0. ,  1. ,  0.5,  0. ])
+        >>> g_deformed
+        array([ 1. ,  2. ,  3. ,  3.5,  5. ])
+
+        Deform only the last three points:
+
+        >>> plan = DeformationPlan(disp_field, slc=slice(2, None))
+        >>> plan([f])[0]
+        array([ 1. ,  0.5,  0. ])
+        """
+        if space is None:
+            space = displacement.space[0]
+        if not _plan_supported(space):
+            raise ValueError('`space` must be a uniform `DiscreteLp` with at '
+                             "least 2 points per axis and 'nearest' or "
+                             "'linear' interpolation, got {!r}".format(space))
+
+        displacement = [np.asarray(vi) for vi in displacement]
+        if len(displacement) != space.ndim:
+            raise ValueError('`displacement` must have {} components, got {}'
+                             ''.format(space.ndim, len(displacement)))
+        for vi in displacement:
+            if vi.shape != space.shape:
+                raise ValueError('`displacement` components must have shape '
+                                 '{}, got {}'.format(space.shape, vi.shape))
+            if np.iscomplexobj(vi):
+                raise TypeError('`displacement` must be real')
+
+        if slc is None:
+            slc = slice(None)
+        start, stop, step = slc.indices(space.shape[0])
+        if step != 1:
+            raise ValueError('`slc` must have step 1, got {!r}'.format(slc))
+        stop = max(start, stop)
+        shape = (stop - start,) + space.shape[1:]
+        displacement = [vi[start:stop] for vi in displacement]
+
+        if space.real_space.dtype == np.dtype('float32'):
+            weight_dtype = np.dtype('float32')
+        else:
+            weight_dtype = np.dtype('float64')
+        if space.size < 2 ** 31:
+            idx_dtype = np.dtype('int32')
+        else:
+            idx_dtype = np.dtype('intp')
+
+        # Flat offset of the lower neighbor in all axes. For 'linear' axes,
+        # the upper neighbor is one stride further, and the weights of
+        # both are stored.
+        base = np.zeros(int(np.prod(shape)), dtype=idx_dtype)
+        strides, weights = [], []
+        stride = space.size
+        for axis, (vi, n, cell_side, interp) in enumerate(zip(
+                displacement, space.shape, space.grid.stride,
+                space.interp_byaxis)):
+            stride //= n
+
+            # Displaced points in index coordinates
+            if axis == 0:
+                idx_range = np.arange(start, stop, dtype=weight_dtype)
+            else:
+                idx_range = np.arange(n, dtype=weight_dtype)
+            bcast_shape = [1] * space.ndim
+            bcast_shape[axis] = idx_range.size
+            pts = np.divide(vi, cell_side, dtype=weight_dtype)
+            pts += idx_range.reshape(bcast_shape)
+            pts = pts.ravel()
+
+            if interp == 'nearest':
+                # Midpoints between neighbors go to the left, and points
+                # outside take the value at the boundary
+                pts -= 0.5
+                idcs = np.ceil(pts, out=pts)
+                np.clip(idcs, 0, n - 1, out=idcs)
+            else:
+                idcs = np.floor(pts)
+                np.clip(idcs, 0, n - 2, out=idcs)
+                w_hi = np.subtract(pts, idcs, out=pts)
+                w_lo = 1 - w_hi
+
+                # Points outside decay linearly from the boundary value,
+                # reaching 0 one cell outside the grid
+                below = w_hi < 0
+                w_lo[below] = 1 + w_hi[below]
+                w_hi[below] = 0
+                above = w_hi > 1
+                w_lo[above] = 0
+                w_hi[above] = 2 - w_hi[above]
+
+                strides.append(stride)
+                weights.append((w_lo, w_hi))
+
+            base += idcs.astype(idx_dtype) * idx_dtype.type(stride)
+
+        self.__space = space
+        self.__slc = slice(start, stop)
+        self.__shape = shape
+        self.__base = base
+        self.__strides = tuple(strides)
+        self.__weights = tuple(weights)
+
+    @property
+    def space(self):
+        """Space of the functions deformed by this plan."""
+        return self.__space
+
+    @property
+    def slc(self):
+        """Slice along the first axis of the points of this plan."""
+        return self.__slc
+
+    @property
+    def shape(self):
+        """Shape of the functions deformed with this plan."""
+        return self.__shape
+
+    @property
+    def nbytes(self):
+        """Total number of bytes used by the arrays of this plan."""
+        return self.__base.nbytes + sum(w_lo.nbytes + w_hi.nbytes
+                                        for w_lo, w_hi in self.__weights)
+
+    def __call__(self, values, out=None):
+        """Deform functions with the displacement of this plan.
+
+        Parameters
+        ----------
+        values : sequence of `array-like`
+            Functions to be deformed, each of shape ``space.shape``.
+        out : sequence of `numpy.ndarray`, optional
+            Arrays to which the deformed functions are written, one for
+            each function in ``values``. They must have the same size as
+            `shape` and data types compatible with the respective
+            functions.
+
+        Returns
+        -------
+        deformed : list of `numpy.ndarray`
+            Deformed functions. If ``out`` was given, the list contains
+            references to its arrays, otherwise new arrays of shape
+            `shape`.
+        """
+        arrays = [np.asarray(arr) for arr in values]
+        for arr in arrays:
+            if arr.shape != self.space.shape:
+                raise ValueError('`values` must have shape {}, got {}'
+                                 ''.format(self.space.shape, arr.shape))
+
+        size = self.__base.size
+        if out is None:
+            out = [np.empty(self.shape, dtype=arr.dtype) for arr in arrays]
+        else:
+            out = list(out)
+            if len(out) != len(arrays):
+                raise ValueError('`out` must have {} entries, got {}'
+                                 ''.format(len(arrays), len(out)))
+            for out_arr in out:
+                if out_arr.size != size:
+                    raise ValueError('`out` arrays must have size {}, got {}'
+                                     ''.format(size, out_arr.size))
+
+        # Flat arrays to gather from and to write to, with accumulation in
+        # floating point for linear interpolation
+        flat_in, flat_out = [], []
+        for arr, out_arr in zip(arrays, out):
+            if self.__weights and not np.issubdtype(arr.dtype, np.inexact):
+                arr = arr.astype(float)
+            flat_in.append(np.ascontiguousarray(arr).ravel())
+            if out_arr.flags.c_contiguous and out_arr.dtype == arr.dtype:
+                flat_out.append(out_arr.reshape(-1))
+            else:
+                flat_out.append(np.empty(size, dtype=arr.dtype))
+
+        for start in range(0, size, _DEFORM_CHUNK_SIZE):
+            stop = min(start + _DEFORM_CHUNK_SIZE, size)
+            base = self.__base[start:stop]
+            idcs = np.empty(base.shape, dtype='intp')
+            neighbors = self._neighbors(start, stop)
+
+            for arr, flat in zip(flat_in, flat_out):
+                acc = flat[start:stop]
+                tmp = None
+                for i, (shift, weight) in enumerate(neighbors):
+                    np.add(base, shift, out=idcs)
+                    if i == 0:
+                        np.take(arr, idcs, out=acc, mode='wrap')
+                        if weight is not None:
+                            acc *= weight
+                    else:
+                        if tmp is None:
+                            tmp = np.empty_like(acc)
+                        np.take(arr, idcs, out=tmp, mode='wrap')
+                        tmp *= weight
+                        acc += tmp
+
+        for out_arr, flat in zip(out, flat_out):
+            if not np.may_share_memory(out_arr, flat):
+                out_arr[:] = flat.reshape(out_arr.shape)
+
+        return out
+
+    def _neighbors(self, start, stop):
+        """Return flat shifts and weights of the neighbors in a chunk.
+
+        The shifts are relative to the lower neighbors, the weights are
+        ``None`` if there are no axes with linear interpolation.
+        """
+        neighbors = [(0, None)]
+        for stride, (w_lo, w_hi) in zip(self.__strides, self.__weights):
+            w_lo, w_hi = w_lo[start:stop], w_hi[start:stop]
+            neighbors = [
+                (shift + off, w if weight is None else weight * w)
+                for shift, weight in neighbors
+                for off, w in ((0, w_lo), (stride, w_hi))]
+        return neighbors
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        if self.shape == self.space.shape:
+            return '{}(<displacement>, space={!r})'.format(
+                self.__class__.__name__, self.space)
+        else:
+            return '{}(<displacement>, space={!r}, slc={!r})'.format(
+                self.__class__.__name__, self.space, self.slc)
+
+
+def _plan_supported(space):
+    """Return ``True`` if a `DeformationPlan` can be used for ``space``."""
+    return (isinstance(space, DiscreteLp) and
+            space.is_uniform and
+            all(n >= 2 for n in space.shape) and
+            all(interp in ('nearest', 'linear')
+                for interp in space.interp_byaxis))
+
+
+def _deform_chunked(values, displacement, space, out=None):
+    """Deform ``values`` with plans for slices along the first axis.
+
+    The slices are chosen such that each plan has at most
+    ``_PLAN_CHUNK_SIZE`` points, hence the memory used by the plans is
+    bounded also for large volumes.
+    """
+    arrays = [np.asarray(arr) for arr in values]
+    if out is None:
+        out = [np.empty(space.shape, dtype=arr.dtype) for arr in arrays]
+
+    n = space.shape[0]
+    num_rows = max(1, _PLAN_CHUNK_SIZE // (space.size // n))
+    for start in range(0, n, num_rows):
+        slc = slice(start, min(start + num_rows, n))
+        plan = DeformationPlan(displacement, space, slc=slc)
+        plan(arrays, out=[out_arr[slc] for out_arr in out])
+    return out
 
 
 def linear_deform(template, displacement, out=None):
@@ -26,6 +343,10 @@ def linear_deform(template, displacement, out=None):
     The function maps a given template ``I`` and a given displacement
     field ``v`` to the new function ``x --> I(x + v(x))``.
 
+    For uniform grids, the deformation is computed with `DeformationPlan`
+    objects for parts of the grid, otherwise by interpolation in the
+    displaced points.
+
     Parameters
     ----------
     template : `DiscreteLpElement`
@@ -70,6 +391,11 @@ def linear_deform(template, displacement, out=None):
     >>> linear_deform(template, displacement_field)
     array([ 0. ,  0. ,  1. ,  0.5,  0. ])
     """
+    if _plan_supported(template.space):
+        values = _deform_chunked([template], displacement, template.space,
+                                 out=None if out is None else [out])[0]
+        return values.reshape(template.space.shape)
+
     image_pts = template.space.points()
     for i, vi in enumerate(displacement):
         image_pts[:, i] += vi.asarray().ravel()
@@ -191,14 +517,41 @@ class LinDeformFixedTempl(Operator):
         super(LinDeformFixedTempl, self).__init__(
             domain=domain, range=self.template.space, linear=False)
 
+        # Copy of the template and its gradient, computed when needed
+        self.__template_grad = None
+
     @property
     def template(self):
         """Fixed template of this deformation operator."""
         return self.__template
 
+    @property
+    def template_grad(self):
+        """Gradient of `template`, used in `derivative`.
+
+        The gradient is cached together with a copy of the template, and
+        it is computed again if the template has been modified in-place.
+        """
+        if (self.__template_grad is None or
+                not np.array_equal(self.__template_grad[0], self.template)):
+            # TODO: allow users to select what method to use here.
+            grad = Gradient(domain=self.range, method='central',
+                            pad_mode='symmetric')
+            self.__template_grad = (self.template.copy(),
+                                    grad(self.template))
+        return self.__template_grad[1]
+
     def _call(self, displacement, out=None):
         """Implementation of ``self(displacement[, out])``."""
-        return linear_deform(self.template, displacement, out)
+        if not _plan_supported(self.range):
+            return linear_deform(self.template, displacement, out)
+        elif out is None:
+            return _deform_chunked([self.template], displacement,
+                                   self.range)[0]
+        else:
+            with writable_array(out) as out_arr:
+                _deform_chunked([self.template], displacement, self.range,
+                                out=[out_arr])
 
     def derivative(self, displacement):
         """Derivative of the operator at ``displacement``.
@@ -221,12 +574,14 @@ class LinDeformFixedTempl(Operator):
 
         displacement = self.domain.element(displacement)
 
-        # TODO: allow users to select what method to use here.
-        grad = Gradient(domain=self.range, method='central',
-                        pad_mode='symmetric')
-        grad_templ = grad(self.template)
-        def_grad = self.domain.element(
-            [linear_deform(gf, displacement) for gf in grad_templ])
+        if _plan_supported(self.range):
+            def_grad = self.domain.element(
+                _deform_chunked(self.template_grad, displacement,
+                                self.range))
+        else:
+            def_grad = self.domain.element(
+                [linear_deform(gf, displacement)
+                 for gf in self.template_grad])
 
         return PointwiseInner(self.domain, def_grad)
 
@@ -339,15 +694,35 @@ class LinDeformFixedDisp(Operator):
         super(LinDeformFixedDisp, self).__init__(
             domain=templ_space, range=templ_space, linear=True)
         self.__displacement = displacement
+        self.__plan = None
 
     @property
     def displacement(self):
         """Fixed displacement field of this deformation operator."""
         return self.__displacement
 
+    @property
+    def plan(self):
+        """`DeformationPlan` of `displacement`, or ``None``.
+
+        The plan is computed on first access and reused in all subsequent
+        evaluations, hence the displacement should not be modified
+        in-place afterwards. It is ``None`` if the domain does not
+        support plans, see `DeformationPlan`.
+        """
+        if self.__plan is None and _plan_supported(self.domain):
+            self.__plan = DeformationPlan(self.displacement, self.domain)
+        return self.__plan
+
     def _call(self, template, out=None):
         """Implementation of ``self(template[, out])``."""
-        return linear_deform(template, self.displacement, out)
+        if self.plan is None:
+            return linear_deform(template, self.displacement, out)
+        elif out is None:
+            return self.plan([template])[0]
+        else:
+            with writable_array(out) as out_arr:
+                self.plan([template], out=[out_arr])
 
     @property
     def inverse(self):
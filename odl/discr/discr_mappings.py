@@ -14,8 +14,10 @@ operators.
 
 from __future__ import print_function, division, absolute_import
 from builtins import object
-from itertools import product
+from collections import OrderedDict
+import hashlib
 import numpy as np
+import threading
 
 from odl.operator import Operator
 from odl.discr.partition import RectPartition
@@ -33,6 +35,14 @@ __all__ = ('FunctionSpaceMapping',
 
 _SUPPORTED_INTERP_SCHEMES = ['nearest', 'linear']
 
+# Cache of interpolation plans, see `_PerAxisInterpolator.plan`
+_PLAN_CACHE = OrderedDict()
+_PLAN_CACHE_LOCK = threading.Lock()
+_PLAN_CACHE_LIMITS = {'max_entries': 8, 'max_bytes': 2 ** 27}
+
+# Number of output values computed at once in `_PerAxisInterpolator`
+_INTERP_CHUNK_SIZE = 2 ** 16
+
 
 class FunctionSpaceMapping(Operator):
 
@@ -708,6 +718,13 @@ scipy.interpolate.RegularGridInterpolator.html>`_ class.
                                  'dtype {}'
                                  ''.format(out.dtype, self.values.dtype))
 
+        return self._evaluate_points(x, out)
+
+    def _evaluate_points(self, x, out=None):
+        """Evaluate at the validated points ``x``.
+
+        Can be overridden by subclasses to reuse intermediate results.
+        """
         indices, norm_distances = self._find_indices(x)
         return self._evaluate(indices, norm_distances, out)
 
@@ -716,21 +733,14 @@ scipy.interpolate.RegularGridInterpolator.html>`_ class.
 
         Can be overridden by subclasses to improve efficiency.
         """
-        # find relevant edges between which xi are situated
         index_vecs = []
-        # compute distance to lower edge in unity units
         norm_distances = []
 
         # iterate through dimensions
         for xi, cvec in zip(x, self.coord_vecs):
-            idcs = np.searchsorted(cvec, xi) - 1
-
-            idcs[idcs < 0] = 0
-            idcs[idcs > cvec.size - 2] = cvec.size - 2
+            idcs, ndist = _search_cells(xi, cvec)
             index_vecs.append(idcs)
-
-            norm_distances.append((xi - cvec[idcs]) /
-                                  (cvec[idcs + 1] - cvec[idcs]))
+            norm_distances.append(ndist)
 
         return index_vecs, norm_distances
 
@@ -739,6 +749,27 @@ scipy.interpolate.RegularGridInterpolator.html>`_ class.
         raise NotImplementedError('abstract method')
 
 
+def _search_cells(xi, cvec):
+    """Return cell indices and normalized distances of ``xi`` in ``cvec``."""
+    # find relevant edges between which xi are situated
+    idcs = np.searchsorted(cvec, xi) - 1
+
+    idcs[idcs < 0] = 0
+    idcs[idcs > cvec.size - 2] = cvec.size - 2
+
+    # compute distance to lower edge in unity units
+    ndist = (xi - cvec[idcs]) / (cvec[idcs + 1] - cvec[idcs])
+    return idcs, ndist
+
+
+def _is_uniform(cvec):
+    """Return ``True`` if ``cvec`` has at least 2 equidistant points."""
+    if cvec.size < 2:
+        return False
+    diffs = np.diff(cvec)
+    return bool(np.all(np.abs(diffs - diffs[0]) <= 1e-10 * abs(diffs[0])))
+
+
 class _NearestInterpolator(_Interpolator):
 
     """Nearest neighbor interpolator.
@@ -874,12 +905,50 @@ def _create_weight_edge_lists(indices, norm_distances, schemes, variants):
     return low_weights, high_weights, edge_indices
 
 
+class _PerAxisPlan(object):
+
+    """Precomputed indices and weights for `_PerAxisInterpolator`.
+
+    For each axis, the plan stores the offsets of the lower and upper
+    neighbors of the evaluation points in the flattened grid values,
+    together with their interpolation weights. The arrays are 1D for
+    ``'array'`` input and broadcastable sparse meshgrid arrays for
+    ``'meshgrid'`` input.
+    """
+
+    def __init__(self, offsets, weights, shape):
+        """Initialize a new instance.
+
+        offsets : sequence of 2-tuples of `numpy.ndarray`'s
+            Flat offsets of the lower and upper neighbors, one pair per
+            axis.
+        weights : sequence of 2-tuples of `numpy.ndarray`'s
+            Weights of the lower and upper neighbors, one pair per axis.
+        shape : tuple of int
+            Shape of the set of evaluation points.
+        """
+        self.offsets = tuple(offsets)
+        self.weights = tuple(weights)
+        self.shape = tuple(shape)
+        self.nbytes = sum(arr.nbytes
+                          for pair in self.offsets + self.weights
+                          for arr in pair)
+
+
 class _PerAxisInterpolator(_Interpolator):
 
     """Interpolator where the scheme is set per axis.
 
     This allows to use e.g. nearest neighbor interpolation in the
     first dimension and linear in dimensions 2 and 3.
+
+    The interpolation indices and weights for a set of points are
+    computed once per axis and stored in a `_PerAxisPlan`. Plans are
+    cached and reused for interpolators with the same grid and schemes
+    that are evaluated in the same points, e.g., when deforming several
+    images with the same displacement. The sum over the ``2 ** ndim``
+    neighbors is evaluated in chunks of points, with temporary arrays
+    of bounded size.
     """
 
     def __init__(self, coord_vecs, values, input_type, schemes, nn_variants):
@@ -904,46 +973,219 @@ class _PerAxisInterpolator(_Interpolator):
         self.schemes = schemes
         self.nn_variants = nn_variants
 
+    def _evaluate_points(self, x, out=None):
+        """Evaluate the interpolator at ``x`` using a cached plan."""
+        return self._evaluate_plan(self.plan(x), out)
+
+    def plan(self, x):
+        """Return the interpolation plan for the points ``x``.
+
+        The plan is taken from the cache if possible, otherwise it is
+        computed and added to the cache.
+        """
+        key = self._plan_key(x)
+        with _PLAN_CACHE_LOCK:
+            plan = _PLAN_CACHE.pop(key, None)
+            if plan is not None:
+                # Mark as most recently used
+                _PLAN_CACHE[key] = plan
+                return plan
+
+        indices, norm_distances = self._find_indices(x)
+        plan = self._make_plan(indices, norm_distances)
+
+        with _PLAN_CACHE_LOCK:
+            if plan.nbytes <= _PLAN_CACHE_LIMITS['max_bytes']:
+                _PLAN_CACHE[key] = plan
+                _evict_plans()
+        return plan
+
+    def _plan_key(self, x):
+        """Return a key identifying the plan for the points ``x``."""
+        if self.input_type == 'meshgrid':
+            arrays = tuple(x)
+        else:
+            arrays = (x,)
+
+        hasher = hashlib.sha1()
+        for arr in self.coord_vecs + arrays:
+            arr = np.ascontiguousarray(arr)
+            hasher.update(repr((arr.shape, arr.dtype.str)).encode())
+            hasher.update(arr.view(np.uint8).ravel())
+
+        grid_shape = self.values.shape[:len(self.coord_vecs)]
+        return (grid_shape, tuple(self.schemes), tuple(self.nn_variants),
+                self.input_type, self._weight_dtype.str, hasher.hexdigest())
+
+    @property
+    def _weight_dtype(self):
+        """Data type of the interpolation weights.
+
+        Single precision values use single precision weights, which
+        halves the size of the plan.
+        """
+        if self.values.dtype in (np.dtype('float32'), np.dtype('complex64')):
+            return np.dtype('float32')
+        else:
+            return np.dtype('float64')
+
+    def _find_indices(self, x):
+        """Find indices and distances of the given nodes.
+
+        For axes with linear interpolation on a uniform grid, the cells
+        are computed directly instead of searched. Points on the boundary
+        of two cells may end up in a different cell than with a search,
+        which does not change the result of linear interpolation.
+        """
+        index_vecs, norm_distances = [], []
+        for xi, cvec, scheme in zip(x, self.coord_vecs, self.schemes):
+            if scheme == 'linear' and _is_uniform(cvec):
+                stride = (cvec[-1] - cvec[0]) / (cvec.size - 1)
+                idcs = np.floor((xi - cvec[0]) / stride).astype('intp')
+                np.clip(idcs, 0, cvec.size - 2, out=idcs)
+                # Distance to the actual grid points for exact results
+                # in the grid points
+                ndist = xi - cvec.take(idcs)
+                ndist /= stride
+            else:
+                idcs, ndist = _search_cells(xi, cvec)
+            index_vecs.append(idcs)
+            norm_distances.append(ndist)
+
+        return index_vecs, norm_distances
+
+    def _make_plan(self, indices, norm_distances):
+        """Compute the plan from indices and distances of the points."""
+        low_weights, high_weights, edge_indices = _create_weight_edge_lists(
+            indices, norm_distances, self.schemes, self.nn_variants)
+
+        grid_shape = self.values.shape[:len(indices)]
+        if np.prod(grid_shape, dtype='int64') < 2 ** 31:
+            idx_dtype = 'int32'
+        else:
+            idx_dtype = 'intp'
+
+        # Offsets of the neighbors in the flattened array of grid values.
+        # Negative indices stand for the last grid point.
+        offsets = []
+        stride = 1
+        for n, (edge_lo, edge_hi) in reversed(list(zip(grid_shape,
+                                                       edge_indices))):
+            offsets.append(((edge_lo % n * stride).astype(idx_dtype),
+                            (edge_hi % n * stride).astype(idx_dtype)))
+            stride *= n
+        offsets.reverse()
+
+        weights = [(w_lo.astype(self._weight_dtype, copy=False),
+                    w_hi.astype(self._weight_dtype, copy=False))
+                   for w_lo, w_hi in zip(low_weights, high_weights)]
+        return _PerAxisPlan(offsets, weights,
+                            out_shape_from_meshgrid(norm_distances))
+
     def _evaluate(self, indices, norm_distances, out=None):
         """Evaluate linear interpolation.
 
         Modified for in-place evaluation and treatment of out-of-bounds
         points by implicitly assuming 0 at the next node."""
-        # slice for broadcasting over trailing dimensions in self.values
-        vslice = (slice(None),) + (None,) * (self.values.ndim - len(indices))
+        return self._evaluate_plan(
+            self._make_plan(indices, norm_distances), out)
 
+    def _evaluate_plan(self, plan, out=None):
+        """Evaluate the interpolation with precomputed indices and weights.
+
+        The points are processed in chunks along the first axis of
+        ``plan.shape``. In each chunk, the contributions of all
+        ``2 ** ndim`` neighbors are summed, where the indices and weights
+        of the neighbors are built up axis by axis and shared among
+        neighbors with the same lower axes.
+        """
+        ndim = len(plan.offsets)
+        # Values as (grid size, trailing shape) array for vectorized
+        # evaluation
+        values = self.values.reshape((-1,) + self.values.shape[ndim:])
+        trailing_shape = values.shape[1:]
+        shape = plan.shape + trailing_shape
         if out is None:
-            out_shape = out_shape_from_meshgrid(norm_distances)
-            out_dtype = self.values.dtype
-            out = np.zeros(out_shape, dtype=out_dtype)
+            out = np.empty(shape, dtype=self.values.dtype)
         else:
-            out[:] = 0.0
+            out = out.reshape(shape)
 
-        # Weights and indices (per axis)
-        low_weights, high_weights, edge_indices = _create_weight_edge_lists(
-            indices, norm_distances, self.schemes, self.nn_variants)
+        if np.issubdtype(values.dtype, np.inexact):
+            acc_dtype = values.dtype
+        else:
+            acc_dtype = np.dtype(float)
+            values = values.astype(acc_dtype)
+        if out.dtype == acc_dtype:
+            acc_out = out
+        else:
+            acc_out = None
+
+        # Add axes for broadcasting weights over trailing dimensions
+        wslice = (Ellipsis,) + (None,) * len(trailing_shape)
+
+        num_rows = plan.shape[0] if plan.shape else 1
+        row_size = max(int(np.prod(shape[1:])), 1)
+        rows_per_chunk = max(_INTERP_CHUNK_SIZE // row_size, 1)
+        for start in range(0, num_rows, rows_per_chunk):
+            stop = min(start + rows_per_chunk, num_rows)
 
-        # Iterate over all possible combinations of [i, i+1] for each
-        # axis, resulting in a loop of length 2**ndim
-        for lo_hi, edge in zip(product(*([['l', 'h']] * len(indices))),
-                               product(*edge_indices)):
-            weight = 1.0
-            # TODO: determine best summation order from array strides
-            for lh, w_lo, w_hi in zip(lo_hi, low_weights, high_weights):
-
-                # We don't multiply in-place to exploit the cheap operations
-                # in the beginning: sizes grow gradually as following:
-                # (n, 1, 1, ...) -> (n, m, 1, ...) -> ...
-                # Hence, it is faster to build up the weight array instead
-                # of doing full-size operations from the beginning.
-                if lh == 'l':
-                    weight = weight * w_lo
+            def chunk(arr):
+                """Part of ``arr`` belonging to the current chunk."""
+                if arr.ndim == 0 or arr.shape[0] == 1:
+                    return arr
                 else:
-                    weight = weight * w_hi
-            out += np.asarray(self.values[edge]) * weight[vslice]
+                    return arr[start:stop]
+
+            offsets = [(chunk(lo), chunk(hi)) for lo, hi in plan.offsets]
+            weights = [(chunk(lo), chunk(hi)) for lo, hi in plan.weights]
+            chunk_shape = (stop - start,) + plan.shape[1:]
+
+            if acc_out is None:
+                acc = np.zeros(chunk_shape + trailing_shape, dtype=acc_dtype)
+            else:
+                acc = acc_out[start:stop]
+                acc.fill(0)
+            tmp = np.empty(chunk_shape + trailing_shape, dtype=acc_dtype)
+
+            def accumulate(axis, idx, weight):
+                """Add the contributions of all neighbors below ``axis``."""
+                if axis == ndim:
+                    idx = np.broadcast_to(idx, chunk_shape)
+                    weight = np.broadcast_to(weight, chunk_shape)[wslice]
+                    np.take(values, idx, axis=0, out=tmp, mode='clip')
+                    np.multiply(tmp, weight, out=tmp)
+                    np.add(acc, tmp, out=acc)
+                    return
+
+                # Sizes grow gradually for meshgrid input, e.g.
+                # (n, 1, 1) -> (n, m, 1) -> (n, m, k), hence building up
+                # the indices and weights is cheaper than computing them
+                # for each neighbor from scratch.
+                for off, w in zip(offsets[axis], weights[axis]):
+                    accumulate(axis + 1, idx + off, weight * w)
+
+            accumulate(0, 0, 1.0)
+
+            if acc_out is None:
+                out[start:stop] = acc
+
         return np.array(out, copy=False, ndmin=1)
 
 
+def _evict_plans():
+    """Drop least recently used plans until the cache limits hold.
+
+    The caller must hold ``_PLAN_CACHE_LOCK``.
+    """
+    max_entries = _PLAN_CACHE_LIMITS['max_entries']
+    max_bytes = _PLAN_CACHE_LIMITS['max_bytes']
+    total_bytes = sum(plan.nbytes for plan in _PLAN_CACHE.values())
+    while _PLAN_CACHE and (len(_PLAN_CACHE) > max_entries or
+                           total_bytes > max_bytes):
+        _, plan = _PLAN_CACHE.popitem(last=False)
+        total_bytes -= plan.nbytes
+
+
 class _LinearInterpolator(_PerAxisInterpolator):
 
     """Linear (i.e. bi-/tri-/multi-linear) interpolator.
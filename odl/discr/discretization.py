@@ -208,6 +208,12 @@ class DiscretizedSpace(TensorSpace):
 
     def __hash__(self):
         """Return ``hash(self)``."""
+        # Cached since spaces are immutable and hashing the grid is costly
+        try:
+            return self.__hash
+        except AttributeError:
+            pass
+
         prop_list = [super(DiscretizedSpace, self).__hash__(),
                      self.fspace, self.tspace]
         # May not exist
@@ -220,7 +226,15 @@ class DiscretizedSpace(TensorSpace):
         except NotImplementedError:
             pass
 
-        return hash(tuple(prop_list))
+        self.__hash = hash(tuple(prop_list))
+        return self.__hash
+
+    def __getstate__(self):
+        """Return the state for pickling, without the cached hash."""
+        # Hashes of strings differ between processes
+        state = super(DiscretizedSpace, self).__getstate__()
+        state.pop('_DiscretizedSpace__hash', None)
+        return state
 
     @property
     def domain(self):
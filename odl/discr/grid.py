@@ -520,8 +520,20 @@ class RectGrid(Set):
     def __hash__(self):
         """Return ``hash(self)``."""
         # TODO: update with #841
-        coord_vec_str = tuple(cv.tobytes() for cv in self.coord_vectors)
-        return hash((type(self), coord_vec_str))
+        # Cached since grids are immutable
+        try:
+            return self.__hash
+        except AttributeError:
+            coord_vec_str = tuple(cv.tobytes() for cv in self.coord_vectors)
+            self.__hash = hash((type(self), coord_vec_str))
+            return self.__hash
+
+    def __getstate__(self):
+        """Return the state for pickling, without the cached hash."""
+        # Hashes of bytes differ between processes
+        state = self.__dict__.copy()
+        state.pop('_RectGrid__hash', None)
+        return state
 
     def approx_contains(self, other, atol):
         """Test if ``other`` belongs to this grid up to a tolerance.
@@ -26,3 +26,6 @@ __all__ += tensor_ops.__all__
 
 from .oputils import *
 __all__ += oputils.__all__
+
+from .tmp_pool import *
+__all__ += tmp_pool.__all__
@@ -16,6 +16,7 @@ import sys
 
 from odl.set import LinearSpace, Set, Field
 from odl.set.space import LinearSpaceElement
+from odl.operator.tmp_pool import TemporaryPool, temporary_pool_limit
 from odl.util import cache_arguments
 
 
@@ -694,6 +695,35 @@ class Operator(object):
                         'the range {!r}'.format(out, self.range))
         return out
 
+    def _call_trusted(self, x, out=None, **kwargs):
+        """Return ``self(x[, out, **kwargs])`` without checking arguments.
+
+        This is a fast variant of ``self(x[, out, **kwargs])`` for internal
+        use in solvers, where ``x`` is known to be an element of `domain`
+        and ``out`` an element of `range`, e.g., because they have been
+        checked before the first iteration or created as temporaries by
+        the solver. The caller is responsible for that, since no checks or
+        conversions of the arguments are done.
+
+        Examples
+        --------
+        >>> rn = odl.rn(3)
+        >>> op = odl.ScalingOperator(rn, 2.0)
+        >>> x, y = rn.element([1, 2, 3]), rn.element()
+        >>> result = op._call_trusted(x, out=y)
+        >>> result is y
+        True
+        >>> y
+        rn(3).element([ 2.,  4.,  6.])
+        """
+        if out is None:
+            out = self._call_out_of_place(x, **kwargs)
+            if out not in self.range:
+                out = self.range.element(out)
+        else:
+            self._call_in_place(x, out=out, **kwargs)
+        return out
+
     def norm(self, estimate=False, **kwargs):
         """Return the operator norm of this operator.
 
@@ -1130,6 +1160,7 @@ class OperatorSum(Operator):
         self.__right = right
         self.__tmp_ran = tmp_ran
         self.__tmp_dom = tmp_dom
+        self.__tmp_pool = TemporaryPool()
 
     @property
     def left(self):
@@ -1144,15 +1175,25 @@ class OperatorSum(Operator):
     def _call(self, x, out=None):
         """Implement ``self(x[, out])``."""
         if out is None:
-            return self.left(x) + self.right(x)
+            if (temporary_pool_limit() == 0 or
+                    not isinstance(self.range, LinearSpace)):
+                return self.left(x) + self.right(x)
+            out = self.range.element()
+
+        if self.__tmp_ran is not None:
+            self._call_with_tmp(x, out, self.__tmp_ran)
         else:
-            tmp = (self.__tmp_ran if self.__tmp_ran is not None
-                   else self.range.element())
-            # Write to `tmp` first, otherwise aliased `x` and `out` lead
-            # to wrong result
-            self.left(x, out=tmp)
-            self.right(x, out=out)
-            out += tmp
+            with self.__tmp_pool.element(self.range) as tmp:
+                self._call_with_tmp(x, out, tmp)
+        return out
+
+    def _call_with_tmp(self, x, out, tmp):
+        """Evaluate in-place using the temporary ``tmp``."""
+        # Write to `tmp` first, otherwise aliased `x` and `out` lead
+        # to wrong result
+        self.left(x, out=tmp)
+        self.right(x, out=out)
+        out += tmp
 
     def derivative(self, x):
         """Return the operator derivative at ``x``.
@@ -1342,6 +1383,7 @@ class OperatorComp(Operator):
         self.__left = left
         self.__right = right
         self.__tmp = tmp
+        self.__tmp_pool = TemporaryPool()
 
     @property
     def left(self):
@@ -1357,11 +1399,13 @@ class OperatorComp(Operator):
         """Implement ``self(x[, out])``."""
         if out is None:
             return self.left(self.right(x))
+        elif self.__tmp is not None:
+            self.right(x, out=self.__tmp)
+            return self.left(self.__tmp, out=out)
         else:
-            tmp = (self.__tmp if self.__tmp is not None
-                   else self.right.range.element())
-            self.right(x, out=tmp)
-            return self.left(tmp, out=out)
+            with self.__tmp_pool.element(self.right.range) as tmp:
+                self.right(x, out=tmp)
+                return self.left(tmp, out=out)
 
     @property
     def inverse(self):
@@ -1471,6 +1515,7 @@ class OperatorPointwiseProduct(Operator):
             left.domain, left.range, linear=False)
         self.__left = left
         self.__right = right
+        self.__tmp_pool = TemporaryPool()
 
     @property
     def left(self):
@@ -1487,12 +1532,12 @@ class OperatorPointwiseProduct(Operator):
         if out is None:
             return self.left(x) * self.right(x)
         else:
-            tmp = self.right.range.element()
-            # Write to `tmp` first, otherwise aliased `x` and `out` lead
-            # to wrong result
-            self.left(x, out=tmp)
-            self.right(x, out=out)
-            out *= tmp
+            with self.__tmp_pool.element(self.right.range) as tmp:
+                # Write to `tmp` first, otherwise aliased `x` and `out` lead
+                # to wrong result
+                self.left(x, out=tmp)
+                self.right(x, out=out)
+                out *= tmp
 
     def derivative(self, x):
         """Return the derivative at ``x``."""
@@ -1563,6 +1608,7 @@ class OperatorLeftScalarMult(Operator):
             operator.domain, operator.range, linear=operator.is_linear)
         self.__operator = operator
         self.__scalar = scalar
+        self.__tmp_pool = TemporaryPool()
 
     @property
     def operator(self):
@@ -1577,7 +1623,15 @@ class OperatorLeftScalarMult(Operator):
     def _call(self, x, out=None):
         """Implement ``self(x[, out])``."""
         if out is None:
-            return self.scalar * self.operator(x)
+            if (temporary_pool_limit() == 0 or
+                    not isinstance(self.range, LinearSpace)):
+                return self.scalar * self.operator(x)
+
+            # Only the result is allocated, the operator is evaluated
+            # into a pooled temporary
+            with self.__tmp_pool.element(self.range) as tmp:
+                self.operator(x, out=tmp)
+                return self.scalar * tmp
         else:
             self.operator(x, out=out)
             out *= self.scalar
@@ -1734,6 +1788,7 @@ class OperatorRightScalarMult(Operator):
         self.__operator = operator
         self.__scalar = scalar
         self.__tmp = tmp
+        self.__tmp_pool = TemporaryPool()
 
     @property
     def operator(self):
@@ -1749,13 +1804,13 @@ class OperatorRightScalarMult(Operator):
         """Implement ``self(x[, out])``."""
         if out is None:
             return self.operator(self.scalar * x)
+        elif self.__tmp is not None:
+            self.__tmp.lincomb(self.scalar, x)
+            self.operator(self.__tmp, out=out)
         else:
-            if self.__tmp is not None:
-                tmp = self.__tmp
-            else:
-                tmp = self.domain.element()
-            tmp.lincomb(self.scalar, x)
-            self.operator(tmp, out=out)
+            with self.__tmp_pool.element(self.domain) as tmp:
+                tmp.lincomb(self.scalar, x)
+                self.operator(tmp, out=out)
 
     def __mul__(self, other):
         """Implement ``self * other``.
@@ -2118,6 +2173,7 @@ class OperatorRightVectorMult(Operator):
             operator.domain, operator.range, linear=operator.is_linear)
         self.__operator = operator
         self.__vector = vector
+        self.__tmp_pool = TemporaryPool()
 
     @property
     def operator(self):
@@ -2134,9 +2190,9 @@ class OperatorRightVectorMult(Operator):
         if out is None:
             return self.operator(x * self.vector)
         else:
-            tmp = self.domain.element()
-            x.multiply(self.vector, out=tmp)
-            self.operator(tmp, out=out)
+            with self.__tmp_pool.element(self.domain) as tmp:
+                x.multiply(self.vector, out=tmp)
+                self.operator(tmp, out=out)
 
     @property
     def inverse(self):
@@ -12,12 +12,20 @@ from __future__ import print_function, division, absolute_import
 from future.utils import native
 import numpy as np
 
+from odl.operator.default_ops import (
+    IdentityOperator, MultiplyOperator, ScalingOperator, ZeroOperator)
+from odl.operator.operator import (
+    OperatorComp, OperatorSum, OperatorLeftScalarMult,
+    OperatorRightScalarMult, OperatorLeftVectorMult, OperatorRightVectorMult)
+from odl.set import LinearSpace
+from odl.set.space import LinearSpaceElement
 from odl.space.base_tensors import TensorSpace
 from odl.space import ProductSpace
 from odl.util import nd_iterator
 
 __all__ = ('matrix_representation', 'power_method_opnorm', 'as_scipy_operator',
-           'as_scipy_functional', 'as_proximal_lang_operator')
+           'as_scipy_functional', 'as_proximal_lang_operator',
+           'simplify_operator')
 
 
 def matrix_representation(op):
@@ -437,6 +445,289 @@ def as_proximal_lang_operator(op, norm_bound=None):
                                  norm_bound=norm_bound)
 
 
+def simplify_operator(op):
+    """Return a simplified operator equivalent to ``op``.
+
+    The operator expression tree of ``op`` is rewritten bottom-up with
+    the following rules:
+
+    - Identity operators in compositions and zero operators in sums
+      are removed.
+    - Chains of scalar multiplications are folded into a single scalar,
+      which is moved out of linear operators and merged with adjacent
+      scaling operators.
+    - Consecutive `ScalingOperator`'s and `MultiplyOperator`'s acting
+      pointwise on the same space are merged into one operator, both in
+      compositions and sums. This replaces several passes over the data
+      by a single pointwise multiplication.
+    - Sums of scalar multiples of the same operator are collected.
+
+    Only the basic expression types like `OperatorComp` and `OperatorSum`
+    are rewritten. Other operators, including subclasses of these types
+    such as functional expressions, are kept as they are.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Operator to simplify.
+
+    Returns
+    -------
+    simplified : `Operator`
+        Operator with the same `Operator.domain` and `Operator.range` as
+        ``op`` that evaluates to the same result up to floating point
+        rounding. If nothing can be simplified, ``op`` itself is returned.
+
+    Examples
+    --------
+    Scalar factors and identities are folded away:
+
+    >>> space = odl.rn(3)
+    >>> ident = odl.IdentityOperator(space)
+    >>> op = 2 * (odl.ScalingOperator(space, 3) * ident) * 0.5
+    >>> simplify_operator(op)
+    ScalingOperator(rn(3), 3.0)
+
+    Pointwise multiplications are merged into a single one:
+
+    >>> x = space.element([1, 2, 3])
+    >>> op = odl.MultiplyOperator(x) * odl.MultiplyOperator(x) + ident
+    >>> simple_op = simplify_operator(op)
+    >>> simple_op
+    MultiplyOperator(rn(3).element([  2.,   5.,  10.]))
+    >>> simple_op(x) == op(x)
+    True
+    """
+    return _simplify(op)
+
+
+def _simplify(op):
+    """Recursively simplify the expression tree of ``op``."""
+    op_type = type(op)
+    if op_type is OperatorComp:
+        left, right = _simplify(op.left), _simplify(op.right)
+        if left is op.left and right is op.right:
+            return _simplify_comp(left, right, op)
+        else:
+            return _simplify_comp(left, right)
+
+    elif op_type is OperatorSum:
+        left, right = _simplify(op.left), _simplify(op.right)
+        if left is op.left and right is op.right:
+            return _simplify_sum(left, right, op)
+        else:
+            return _simplify_sum(left, right)
+
+    elif op_type is OperatorLeftScalarMult:
+        return _scale_left(_simplify(op.operator), op.scalar)
+
+    elif op_type is OperatorRightScalarMult:
+        inner = _simplify(op.operator)
+        if op.scalar == 1:
+            return inner
+        elif inner.is_linear and op.scalar in inner.range.field:
+            return _scale_left(inner, op.scalar)
+        elif inner is op.operator:
+            return op
+        else:
+            return OperatorRightScalarMult(inner, op.scalar)
+
+    elif op_type is OperatorLeftVectorMult:
+        mult_op = MultiplyOperator(op.vector, domain=op.range, range=op.range)
+        return _simplify_comp(mult_op, _simplify(op.operator))
+
+    elif op_type is OperatorRightVectorMult:
+        mult_op = MultiplyOperator(op.vector, domain=op.domain,
+                                   range=op.domain)
+        return _simplify_comp(_simplify(op.operator), mult_op)
+
+    factor = _pointwise_factor(op)
+    if factor is None:
+        return op
+    else:
+        return _pointwise_operator(op.domain, factor, op)
+
+
+def _pointwise_factor(op):
+    """Return the factor of a pointwise multiplication operator.
+
+    For a `ScalingOperator` or a `MultiplyOperator` mapping a space to
+    itself, the scalar or space element multiplied with is returned,
+    otherwise ``None``.
+    """
+    op_type = type(op)
+    if op_type in (ScalingOperator, IdentityOperator):
+        return op.scalar
+    elif (op_type is MultiplyOperator and
+          isinstance(op.domain, LinearSpace) and
+          op.domain == op.range):
+        factor = op.multiplicand
+        if isinstance(factor, LinearSpaceElement):
+            return factor if factor in op.domain else None
+        else:
+            return factor if factor in op.domain.field else None
+    else:
+        return None
+
+
+def _pointwise_operator(space, factor, op=None):
+    """Return an operator multiplying with ``factor`` on ``space``.
+
+    If ``op`` is given and already is the canonical operator for
+    ``factor``, it is returned instead of a new one.
+    """
+    if isinstance(factor, LinearSpaceElement):
+        if type(op) is MultiplyOperator and op.multiplicand is factor:
+            return op
+        return MultiplyOperator(factor, domain=space, range=space)
+    elif factor == 1:
+        if type(op) is IdentityOperator:
+            return op
+        return IdentityOperator(space)
+    elif factor == 0 and isinstance(space, LinearSpace):
+        return ZeroOperator(space)
+    else:
+        if type(op) is ScalingOperator:
+            return op
+        return ScalingOperator(space, factor)
+
+
+def _scalar_part(op):
+    """Split ``op`` into a scalar and an operator."""
+    if type(op) is OperatorLeftScalarMult:
+        return op.scalar, op.operator
+    else:
+        return 1, op
+
+
+def _scale_left(op, scalar):
+    """Return the simplified version of ``scalar * op``."""
+    if scalar == 1:
+        return op
+
+    if type(op) is ZeroOperator:
+        return op
+
+    factor = _pointwise_factor(op)
+    if factor is not None:
+        return _pointwise_operator(op.domain, scalar * factor)
+
+    if type(op) is OperatorComp:
+        # Merge the scalar into a pointwise operator of the composition
+        left_factor = _pointwise_factor(op.left)
+        if left_factor is not None:
+            return _simplify_comp(
+                _pointwise_operator(op.left.domain, scalar * left_factor),
+                op.right)
+        right_factor = _pointwise_factor(op.right)
+        if (right_factor is not None and op.left.is_linear and
+                scalar in op.right.range.field):
+            return _simplify_comp(
+                op.left,
+                _pointwise_operator(op.right.domain, scalar * right_factor))
+
+    return OperatorLeftScalarMult(op, scalar)
+
+
+def _simplify_comp(left, right, op=None):
+    """Return the simplified version of ``left * right``.
+
+    Both ``left`` and ``right`` are assumed to be simplified already.
+    ``op`` is returned if given and nothing could be simplified.
+    """
+    left_factor = _pointwise_factor(left)
+    right_factor = _pointwise_factor(right)
+
+    # Identities
+    if _is_one(left_factor):
+        return right
+    if _is_one(right_factor):
+        return left
+
+    # Pointwise operators: merge, or fold scalars into scalar multiplication
+    if left_factor is not None and right_factor is not None:
+        return _pointwise_operator(right.domain, left_factor * right_factor)
+    if left_factor is not None and not _is_element(left_factor):
+        return _scale_left(right, left_factor)
+    if (right_factor is not None and not _is_element(right_factor) and
+            left.is_linear and right_factor in left.range.field):
+        return _scale_left(left, right_factor)
+
+    # Zero operators
+    if (type(left) is ZeroOperator or
+            (type(right) is ZeroOperator and left.is_linear)):
+        return ZeroOperator(right.domain, left.range)
+
+    # Move scalars to the top level where they can be folded
+    left_scalar, left_op = _scalar_part(left)
+    if left_scalar != 1:
+        return _scale_left(_simplify_comp(left_op, right), left_scalar)
+    right_scalar, right_op = _scalar_part(right)
+    if (right_scalar != 1 and left.is_linear and
+            right_scalar in left.range.field):
+        return _scale_left(_simplify_comp(left, right_op), right_scalar)
+
+    # Merge with pointwise operators at the boundary of nested compositions
+    if type(left) is OperatorComp and right_factor is not None:
+        inner_factor = _pointwise_factor(left.right)
+        if inner_factor is not None:
+            return _simplify_comp(
+                left.left,
+                _pointwise_operator(right.domain,
+                                    inner_factor * right_factor))
+    if type(right) is OperatorComp and left_factor is not None:
+        inner_factor = _pointwise_factor(right.left)
+        if inner_factor is not None:
+            return _simplify_comp(
+                _pointwise_operator(right.left.range,
+                                    left_factor * inner_factor),
+                right.right)
+
+    if op is not None:
+        return op
+    else:
+        return OperatorComp(left, right)
+
+
+def _simplify_sum(left, right, op=None):
+    """Return the simplified version of ``left + right``.
+
+    Both ``left`` and ``right`` are assumed to be simplified already.
+    ``op`` is returned if given and nothing could be simplified.
+    """
+    if type(right) is ZeroOperator:
+        return left
+    if type(left) is ZeroOperator:
+        return right
+
+    left_factor = _pointwise_factor(left)
+    right_factor = _pointwise_factor(right)
+    if left_factor is not None and right_factor is not None:
+        return _pointwise_operator(left.domain, left_factor + right_factor)
+
+    # a * A + b * A -> (a + b) * A
+    left_scalar, left_op = _scalar_part(left)
+    right_scalar, right_op = _scalar_part(right)
+    if left_op is right_op:
+        return _scale_left(left_op, left_scalar + right_scalar)
+
+    if op is not None:
+        return op
+    else:
+        return OperatorSum(left, right)
+
+
+def _is_element(factor):
+    """Return ``True`` if ``factor`` is a space element."""
+    return isinstance(factor, LinearSpaceElement)
+
+
+def _is_one(factor):
+    """Return ``True`` if ``factor`` is the scalar 1."""
+    return (factor is not None and not _is_element(factor) and
+            factor == 1)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
@@ -9,11 +9,18 @@
 """Default operators defined on any `ProductSpace`."""
 
 from __future__ import print_function, division, absolute_import
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 from numbers import Integral
 import numpy as np
+import threading
 
-from odl.operator.operator import Operator
+from odl.operator.operator import (
+    Operator, OperatorSum, OperatorVectorSum, OperatorComp,
+    OperatorPointwiseProduct, OperatorLeftScalarMult, OperatorRightScalarMult,
+    FunctionalLeftVectorMult, OperatorLeftVectorMult, OperatorRightVectorMult)
 from odl.operator.default_ops import ZeroOperator
+from odl.operator.tmp_pool import TemporaryPool
 from odl.space import ProductSpace
 
 
@@ -22,6 +29,53 @@ __all__ = ('ProductSpaceOperator',
            'BroadcastOperator', 'ReductionOperator', 'DiagonalOperator')
 
 
+# Thread pool shared by all product space operators, created on first use
+_THREAD_POOL = []
+_THREAD_POOL_LOCK = threading.Lock()
+
+# Marks threads that currently evaluate a row. Nested product space
+# operators are evaluated serially there to avoid waiting for the pool
+# from inside the pool.
+_WORKER_STATE = threading.local()
+
+
+def _default_thread_pool():
+    """Return the shared thread pool, creating it if necessary."""
+    with _THREAD_POOL_LOCK:
+        if not _THREAD_POOL:
+            _THREAD_POOL.append(ThreadPool(cpu_count()))
+        return _THREAD_POOL[0]
+
+
+def _leaf_operators(op):
+    """Return the operators from which ``op`` is built.
+
+    Sums, compositions, products and scalings of operators, as well as
+    product space operators, are traversed recursively. Operators that
+    appear several times are listed several times.
+    """
+    if isinstance(op, ProductSpaceOperator):
+        children = list(op.ops.data)
+    elif isinstance(op, (BroadcastOperator, ReductionOperator)):
+        children = list(op.operators)
+    elif isinstance(op, (OperatorSum, OperatorComp,
+                         OperatorPointwiseProduct)):
+        children = [op.left, op.right]
+    elif isinstance(op, (OperatorVectorSum, OperatorLeftScalarMult,
+                         OperatorRightScalarMult, OperatorLeftVectorMult,
+                         OperatorRightVectorMult)):
+        children = [op.operator]
+    elif isinstance(op, FunctionalLeftVectorMult):
+        children = [op.functional]
+    else:
+        return [op]
+
+    leaves = []
+    for child in children:
+        leaves.extend(_leaf_operators(child))
+    return leaves
+
+
 class ProductSpaceOperator(Operator):
 
     """A "matrix of operators" on product spaces.
@@ -88,7 +142,8 @@ class ProductSpaceOperator(Operator):
     DiagonalOperator : Case where the 'matrix' is diagonal.
     """
 
-    def __init__(self, operators, domain=None, range=None):
+    def __init__(self, operators, domain=None, range=None,
+                 executor='serial'):
         """Initialize a new instance.
 
         Parameters
@@ -103,6 +158,29 @@ class ProductSpaceOperator(Operator):
             Range of the operator. If not provided, it is tried to be
             inferred from the operators. This requires each **row**
             to contain at least one operator.
+        executor : {'serial', 'threads'} or executor object, optional
+            How the rows of the operator matrix are evaluated.
+
+            - ``'serial'``: Rows are evaluated one after the other.
+            - ``'threads'``: Rows are evaluated concurrently in a thread
+              pool shared by all product space operators.
+            - Object with a ``map(func, iterable)`` method, e.g., a
+              ``multiprocessing.pool.ThreadPool`` or a
+              ``concurrent.futures.ThreadPoolExecutor``, used to evaluate
+              the rows concurrently.
+
+            Concurrent evaluation must only be chosen if the operators
+            can be evaluated at the same time, i.e., if they do not share
+            state like temporaries or external resources. This is not
+            checked in general. As a safeguard, rows are evaluated
+            serially if the same operator object appears more than once,
+            also as part of a sum, composition or scaling like ``2 * A``.
+            Rows are also evaluated serially if there is only one, and
+            inside of another concurrently evaluated product space
+            operator. The entries of a row are always accumulated
+            serially in the output.
+
+            Default: ``'serial'``
 
         Examples
         --------
@@ -175,6 +253,31 @@ class ProductSpaceOperator(Operator):
         else:
             self.__ops = self._convert_to_spmatrix(operators)
 
+        self.__tmp_pool = TemporaryPool()
+
+        if executor not in ('threads', 'serial'):
+            if not callable(getattr(executor, 'map', None)):
+                raise TypeError("`executor` must be 'threads', 'serial' or "
+                                "an object with a `map` method, got {!r}"
+                                "".format(executor))
+        self.__executor = executor
+
+        # Nonzero entries grouped by row, in the order of `ops`
+        rows = {}
+        for row, col, op in zip(self.__ops.row, self.__ops.col,
+                                self.__ops.data):
+            rows.setdefault(int(row), []).append((int(col), op))
+        self.__rows = sorted(rows.items())
+        self.__empty_rows = [int(i) for i in np.arange(self.__ops.shape[0])
+                             if i not in rows]
+        # Operators may hold state, e.g., temporaries, that must not be
+        # used by several threads at once. Thus, rows only run concurrently
+        # if no operator is used more than once, also inside combinations
+        # like `2 * A` or `A * B`.
+        leaves = _leaf_operators(self)
+        self.__parallel_safe = (len(set(id(op) for op in leaves)) ==
+                                len(leaves))
+
         # Set domain and range (or verify if given)
         if domain is None:
             domains = [None] * self.__ops.shape[1]
@@ -287,28 +390,53 @@ class ProductSpaceOperator(Operator):
         """The sparse operator matrix representing this operator."""
         return self.__ops
 
+    @property
+    def executor(self):
+        """Executor used to evaluate the rows of the operator matrix."""
+        return self.__executor
+
     def _call(self, x, out=None):
         """Call the operators on the parts of ``x``."""
-        # TODO: add optimization in case an operator appears repeatedly in a
-        # row
         if out is None:
-            out = self.range.zero()
-            for i, j, op in zip(self.ops.row, self.ops.col, self.ops.data):
-                out[i] += op(x[j])
+            if self.__empty_rows:
+                out = self.range.zero()
+            else:
+                out = self.range.element()
+
+        def eval_row(row):
+            """Evaluate the row and accumulate its entries in ``out``."""
+            i, entries = row
+            j, op = entries[0]
+            op(x[j], out=out[i])
+            for j, op in entries[1:]:
+                with self.__tmp_pool.element(self.range[i]) as tmp:
+                    op(x[j], out=tmp)
+                    out[i] += tmp
+
+        def eval_row_in_worker(row):
+            """Evaluate the row with nested parallelism disabled."""
+            _WORKER_STATE.active = True
+            try:
+                eval_row(row)
+            finally:
+                _WORKER_STATE.active = False
+
+        if (self.executor == 'serial' or
+                len(self.__rows) < 2 or
+                not self.__parallel_safe or
+                getattr(_WORKER_STATE, 'active', False)):
+            for row in self.__rows:
+                eval_row(row)
         else:
-            has_evaluated_row = np.zeros(len(self.range), dtype=bool)
-            for i, j, op in zip(self.ops.row, self.ops.col, self.ops.data):
-                if not has_evaluated_row[i]:
-                    op(x[j], out=out[i])
-                else:
-                    # TODO: optimize
-                    out[i] += op(x[j])
-
-                has_evaluated_row[i] = True
+            if self.executor == 'threads':
+                executor = _default_thread_pool()
+            else:
+                executor = self.executor
+            # Consume the result to wait for lazy executors
+            list(executor.map(eval_row_in_worker, self.__rows))
 
-            for i, evaluated in enumerate(has_evaluated_row):
-                if not evaluated:
-                    out[i].set_zero()
+        for i in self.__empty_rows:
+            out[i].set_zero()
 
         return out
 
@@ -383,7 +511,8 @@ class ProductSpaceOperator(Operator):
         indices = [self.ops.row, self.ops.col]
         shape = self.ops.shape
         deriv_matrix = scipy.sparse.coo_matrix((data, indices), shape)
-        return ProductSpaceOperator(deriv_matrix, self.domain, self.range)
+        return ProductSpaceOperator(deriv_matrix, self.domain, self.range,
+                                    executor=self.executor)
 
     @property
     def adjoint(self):
@@ -432,7 +561,8 @@ class ProductSpaceOperator(Operator):
         indices = [self.ops.col, self.ops.row]  # Swap col/row -> transpose
         shape = (self.ops.shape[1], self.ops.shape[0])
         adj_matrix = scipy.sparse.coo_matrix((data, indices), shape)
-        return ProductSpaceOperator(adj_matrix, self.range, self.domain)
+        return ProductSpaceOperator(adj_matrix, self.range, self.domain,
+                                    executor=self.executor)
 
     def __getitem__(self, index):
         """Get sub-operator by index.
@@ -731,7 +861,7 @@ class BroadcastOperator(Operator):
     ReductionOperator : Calculates sum of operator results.
     DiagonalOperator : Case where each operator should have its own argument.
     """
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance
 
         Parameters
@@ -740,6 +870,9 @@ class BroadcastOperator(Operator):
             The individual operators that should be evaluated.
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
+        executor : {'serial', 'threads'} or executor object, optional
+            How the operators are evaluated, see `ProductSpaceOperator`
+            for details. Default: ``'serial'``
 
         Examples
         --------
@@ -773,8 +906,14 @@ class BroadcastOperator(Operator):
                 isinstance(operators[1], Integral)):
             operators = (operators[0],) * operators[1]
 
+        executor = kwargs.pop('executor', 'serial')
+        if kwargs:
+            raise TypeError('got unexpected keyword arguments {}'
+                            ''.format(kwargs))
+
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([[op] for op in operators])
+        self.__prod_op = ProductSpaceOperator([[op] for op in operators],
+                                              executor=executor)
         super(BroadcastOperator, self).__init__(
             self.prod_op.domain[0], self.prod_op.range,
             linear=self.prod_op.is_linear)
@@ -789,6 +928,11 @@ class BroadcastOperator(Operator):
         """Tuple of sub-operators that comprise ``self``."""
         return self.__operators
 
+    @property
+    def executor(self):
+        """Executor used to evaluate the operators."""
+        return self.prod_op.executor
+
     def __getitem__(self, index):
         """Return ``self(index)``."""
         return self.operators[index]
@@ -846,7 +990,8 @@ class BroadcastOperator(Operator):
         ])
         """
         return BroadcastOperator(*[op.derivative(x) for op in
-                                   self.operators])
+                                   self.operators],
+                                 executor=self.executor)
 
     @property
     def adjoint(self):
@@ -1200,7 +1345,8 @@ class DiagonalOperator(ProductSpaceOperator):
 
         derivs = [op.derivative(p) for op, p in zip(self.operators, point)]
         return DiagonalOperator(*derivs,
-                                domain=self.domain, range=self.range)
+                                domain=self.domain, range=self.range,
+                                executor=self.executor)
 
     @property
     def adjoint(self):
@@ -1229,7 +1375,8 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         adjoints = [op.adjoint for op in self.operators]
         return DiagonalOperator(*adjoints,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                executor=self.executor)
 
     @property
     def inverse(self):
@@ -1258,7 +1405,8 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         inverses = [op.inverse for op in self.operators]
         return DiagonalOperator(*inverses,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                executor=self.executor)
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -0,0 +1,199 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Pools of reusable temporaries for operator evaluation."""
+
+from __future__ import print_function, division, absolute_import
+from contextlib import contextmanager
+import numpy as np
+import threading
+import weakref
+
+
+__all__ = ('TemporaryPool', 'temporary_pool_limit')
+
+
+# State shared by all pools. `pooled_bytes` is the size of all elements
+# that are currently stored in a pool, i.e., not in use.
+_POOL_STATE = {'max_bytes': 0, 'pooled_bytes': 0}
+_POOL_LOCK = threading.RLock()
+_POOLS = weakref.WeakSet()
+
+
+def temporary_pool_limit(max_bytes=None):
+    """Get or set the memory limit of all temporary pools.
+
+    Temporary pools are used by operator expressions like `OperatorComp`
+    and `OperatorSum` and by solvers to reuse intermediate results between
+    evaluations instead of allocating new elements each time. They are
+    disabled by default and enabled by setting a positive limit.
+
+    Parameters
+    ----------
+    max_bytes : nonnegative int, optional
+        Maximum total size in bytes of the elements stored in all pools.
+        Elements that are currently in use are not counted. ``0`` disables
+        the pools. For ``None``, the current limit is not changed.
+
+    Returns
+    -------
+    max_bytes : int
+        The limit after the update.
+
+    See Also
+    --------
+    TemporaryPool
+
+    Examples
+    --------
+    Enable the pools with a limit of 1 GB and disable them again:
+
+    >>> odl.operator.temporary_pool_limit(2 ** 30)
+    1073741824
+    >>> odl.operator.temporary_pool_limit(0)
+    0
+    """
+    with _POOL_LOCK:
+        if max_bytes is not None:
+            max_bytes, max_bytes_in = int(max_bytes), max_bytes
+            if max_bytes != max_bytes_in or max_bytes < 0:
+                raise ValueError('`max_bytes` must be a nonnegative integer, '
+                                 'got {}'.format(max_bytes_in))
+            _POOL_STATE['max_bytes'] = max_bytes
+            if _POOL_STATE['pooled_bytes'] > max_bytes:
+                for pool in list(_POOLS):
+                    pool._clear()
+
+        return _POOL_STATE['max_bytes']
+
+
+def _element_nbytes(space):
+    """Return the size of an element of ``space`` in bytes, or ``None``.
+
+    ``None`` is returned for spaces whose elements should not be pooled,
+    e.g., because their size cannot be determined.
+    """
+    if hasattr(space, 'spaces'):
+        nbytes = [_element_nbytes(spc) for spc in space.spaces]
+        return None if None in nbytes else sum(nbytes)
+
+    dtype = getattr(space, 'dtype', None)
+    size = getattr(space, 'size', None)
+    if dtype is None or size is None:
+        return None
+    else:
+        return int(size) * np.dtype(dtype).itemsize
+
+
+class TemporaryPool(object):
+
+    """Thread-safe pool of reusable temporary space elements.
+
+    Elements are taken from the pool with the `element` context manager
+    and returned to it at exit. If no element of the requested space is
+    available, a new one is allocated. Returned elements are kept only if
+    the memory limit set by `temporary_pool_limit`, which is shared by all
+    pools, allows it. By default, the limit is 0, and the pool allocates a
+    new element each time.
+
+    Since each element is handed out to one user at a time, a pool can be
+    used by several threads concurrently.
+    """
+
+    def __init__(self):
+        """Initialize a new instance.
+
+        Examples
+        --------
+        >>> pool = odl.operator.TemporaryPool()
+        >>> space = odl.rn(3)
+        >>> with pool.element(space) as tmp:
+        ...     tmp[:] = [1, 2, 3]
+        ...     tmp.inner(tmp)
+        14.0
+        """
+        # Maps `id(space)` to `(space, list of free elements)`. Keeping
+        # `space` makes sure that the id is not reused.
+        self.__free = {}
+        with _POOL_LOCK:
+            _POOLS.add(self)
+
+    @contextmanager
+    def element(self, space):
+        """Context manager providing a temporary element of ``space``.
+
+        The element has arbitrary content and must not be used after the
+        context has been left.
+
+        Parameters
+        ----------
+        space : `LinearSpace`
+            Space of the temporary element.
+
+        Yields
+        ------
+        tmp : ``space`` element
+        """
+        tmp = self._acquire(space)
+        try:
+            yield tmp
+        finally:
+            self._release(space, tmp)
+
+    def _acquire(self, space):
+        """Return a free element of ``space``, allocating if necessary."""
+        with _POOL_LOCK:
+            _, free = self.__free.get(id(space), (None, None))
+            if free:
+                tmp = free.pop()
+                _POOL_STATE['pooled_bytes'] -= _element_nbytes(space)
+                return tmp
+
+        return space.element()
+
+    def _release(self, space, tmp):
+        """Return ``tmp`` to the pool if the memory limit allows it."""
+        nbytes = _element_nbytes(space)
+        if nbytes is None:
+            return
+
+        with _POOL_LOCK:
+            if (_POOL_STATE['pooled_bytes'] + nbytes >
+                    _POOL_STATE['max_bytes']):
+                return
+            _, free = self.__free.setdefault(id(space), (space, []))
+            free.append(tmp)
+            _POOL_STATE['pooled_bytes'] += nbytes
+
+    def _clear(self):
+        """Remove all elements. The caller must hold ``_POOL_LOCK``."""
+        for space, free in self.__free.values():
+            _POOL_STATE['pooled_bytes'] -= len(free) * _element_nbytes(space)
+        self.__free.clear()
+
+    def clear(self):
+        """Remove all elements from this pool."""
+        with _POOL_LOCK:
+            self._clear()
+
+    def __del__(self):
+        """Release the memory accounted for this pool."""
+        try:
+            self.clear()
+        except Exception:
+            # Module globals may already be gone at interpreter shutdown
+            pass
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}()'.format(self.__class__.__name__)
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -10,6 +10,8 @@
 
 from __future__ import print_function, division, absolute_import
 from builtins import object
+import threading
+import weakref
 import numpy as np
 
 from odl.set.sets import Field, Set, UniversalSet
@@ -17,6 +19,10 @@ from odl.set.sets import Field, Set, UniversalSet
 
 __all__ = ('LinearSpace', 'UniversalSpace')
 
+# Canonical instances of spaces by hash, see `LinearSpace._interned`
+_INTERNED_SPACES = {}
+_INTERNED_SPACES_LOCK = threading.RLock()
+
 
 class LinearSpace(Set):
     """Abstract linear vector space.
@@ -148,8 +154,69 @@ class LinearSpace(Set):
         -----
         This is the strict default where spaces must be equal.
         Subclasses may choose to implement a less strict check.
+
+        Spaces are compared by identity first and then by their
+        canonical instance, see `_interned`, such that the check is
+        cheap for elements of equal spaces after the first time.
+        """
+        space = getattr(other, 'space', None)
+        if space is self:
+            return True
+        elif isinstance(space, LinearSpace):
+            interned = self._interned()
+            if interned is not None and space._interned() is interned:
+                return True
+        return space == self
+
+    def __getstate__(self):
+        """Return the state for pickling and copying.
+
+        Cached values that are only valid in this process, like the
+        canonical instance, are not part of the state.
+        """
+        state = self.__dict__.copy()
+        state.pop('_LinearSpace__interned', None)
+        return state
+
+    def _interned(self):
+        """Return the canonical instance of the spaces equal to this one.
+
+        The canonical instance is determined on the first call and
+        cached, which uses the hash of this space and a comparison with
+        the existing canonical instances of the same hash. Afterwards,
+        equal spaces can be recognized in constant time since they
+        share the same canonical instance.
+
+        Returns
+        -------
+        interned : `LinearSpace` or None
+            The canonical instance, or ``None`` if this space is not
+            hashable.
         """
-        return getattr(other, 'space', None) == self
+        try:
+            return self.__interned
+        except AttributeError:
+            pass
+
+        try:
+            key = hash(self)
+        except TypeError:
+            self.__interned = None
+            return None
+
+        with _INTERNED_SPACES_LOCK:
+            for ref in list(_INTERNED_SPACES.get(key, [])):
+                space = ref()
+                if space is not None and space == self:
+                    interned = space
+                    break
+            else:
+                interned = self
+                _INTERNED_SPACES.setdefault(key, []).append(
+                    weakref.ref(self, _uninterner(key)))
+
+        self.__interned = interned
+        return interned
 
     # Error checking variant of methods
     def lincomb(self, a, x1, b=None, x2=None, out=None):
@@ -422,6 +489,18 @@ class LinearSpace(Set):
         return repr(self)
 
 
+def _uninterner(key):
+    """Return a weakref callback removing dead spaces with hash ``key``."""
+    def remove_dead(ref):
+        with _INTERNED_SPACES_LOCK:
+            refs = _INTERNED_SPACES.get(key, [])
+            refs[:] = [r for r in refs if r() is not None]
+            if not refs:
+                _INTERNED_SPACES.pop(key, None)
+
+    return remove_dead
+
+
 class LinearSpaceElement(object):
 
     """Abstract class for `LinearSpace` elements.
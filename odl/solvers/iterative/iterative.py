@@ -13,6 +13,7 @@ from builtins import next
 import numpy as np
 
 from odl.operator import IdentityOperator, OperatorComp, OperatorSum
+from odl.solvers.util import callback_stop
 from odl.util import normalized_scalar_param_list
 
 
@@ -104,16 +105,16 @@ def landweber(op, x, rhs, niter, omega=1, projection=None, callback=None):
     tmp_dom = op.domain.element()
 
     for _ in range(niter):
-        op(x, out=tmp_ran)
+        op._call_trusted(x, out=tmp_ran)
         tmp_ran -= rhs
-        op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
+        op.derivative(x).adjoint._call_trusted(tmp_ran, out=tmp_dom)
         x.lincomb(1, x, -omega, tmp_dom)
 
         if projection is not None:
             projection(x)
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=tmp_ran):
+            return
 
 
 def conjugate_gradient(op, x, rhs, niter, callback=None):
@@ -174,7 +175,7 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
         return
 
     for _ in range(niter):
-        op(p, out=d)  # d = A p
+        op._call_trusted(p, out=d)  # d = A p
 
         inner_p_d = p.inner(d)
 
@@ -193,8 +194,8 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
 
         p.lincomb(1, r, beta, p)                       # p = s + b * p
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=r):
+            return
 
 
 def conjugate_gradient_normal(op, x, rhs, niter=1, callback=None):
@@ -254,7 +255,7 @@ Conjugate_gradient_on_the_normal_equations>`_.
     sqnorm_s_old = s.norm() ** 2  # Only recalculate norm after update
 
     for _ in range(niter):
-        op(p, out=q)                       # q = A p
+        op._call_trusted(p, out=q)         # q = A p
         sqnorm_q = q.norm() ** 2
         if sqnorm_q == 0.0:  # Return if residual is 0
             return
@@ -262,7 +263,7 @@ Conjugate_gradient_on_the_normal_equations>`_.
         a = sqnorm_s_old / sqnorm_q
         x.lincomb(1, x, a, p)               # x = x + a*p
         d.lincomb(1, d, -a, q)              # d = d - a*Ap
-        op.derivative(p).adjoint(d, out=s)  # s = A^T d
+        op.derivative(p).adjoint._call_trusted(d, out=s)  # s = A^T d
 
         sqnorm_s_new = s.norm() ** 2
         b = sqnorm_s_new / sqnorm_s_old
@@ -270,8 +271,8 @@ Conjugate_gradient_on_the_normal_equations>`_.
 
         p.lincomb(1, s, b, p)               # p = s + b * p
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=s):
+            return
 
 
 def exp_zero_seq(base):
@@ -380,8 +381,8 @@ def gauss_newton(op, x, rhs, niter, zero_seq=exp_zero_seq(2.0),
         # Update x
         x.lincomb(1, x0, 1, dx)  # x = x0 + dx
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x):
+            return
 
 
 def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
@@ -511,10 +512,10 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
             if projection is not None:
                 projection(x)
 
-            if callback is not None and callback_loop == 'inner':
-                callback(x)
-        if callback is not None and callback_loop == 'outer':
-            callback(x)
+            if callback_loop == 'inner' and callback_stop(callback, x):
+                return
+        if callback_loop == 'outer' and callback_stop(callback, x):
+            return
 
 
 if __name__ == '__main__':
@@ -9,9 +9,16 @@
 """Maximum Likelihood Expectation Maximization algorithm."""
 
 from __future__ import print_function, division, absolute_import
+import hashlib
+from multiprocessing.pool import ThreadPool
 import numpy as np
+import os
+import weakref
 
-__all__ = ('mlem', 'osmlem', 'loglikelihood')
+from odl.solvers.util import callback_stop
+from odl.space import npy_tensors
+
+__all__ = ('mlem', 'osmlem', 'loglikelihood', 'SensitivityCache')
 
 
 AVAILABLE_MLEM_NOISE = ('poisson',)
@@ -58,6 +65,10 @@ def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
         Usable with ``noise='poisson'``. The algorithm contains a ``A^T 1``
         term, if this parameter is given, it is replaced by it.
         Default: ``op.adjoint(op.range.one())``
+    sensitivity_cache : `SensitivityCache`, optional
+        Usable with ``noise='poisson'``. Cache from which the default
+        sensitivities are taken, to avoid recomputing them in repeated
+        reconstructions with the same operator.
 
     Notes
     -----
@@ -121,6 +132,16 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
         Usable with ``noise='poisson'``. The algorithm contains an ``A^T 1``
         term, if this parameter is given, it is replaced by it.
         Default: ``op[i].adjoint(op[i].range.one())``
+    sensitivity_cache : `SensitivityCache`, optional
+        Usable with ``noise='poisson'``. Cache from which the default
+        sensitivities are taken, to avoid recomputing them in repeated
+        reconstructions with the same operators.
+    num_threads : positive int, optional
+        Usable with ``noise='poisson'``. Number of threads for the
+        elementwise parts of the update, which are evaluated in fused
+        passes over blocks of `odl.space.npy_tensors.CHUNK_SIZE` entries
+        for spaces with ``impl='numpy'``.
+        Default: `odl.space.npy_tensors.CHUNK_NUM_THREADS`
 
     Notes
     -----
@@ -176,7 +197,11 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
 
         # Extract the sensitivites parameter
         sensitivities = kwargs.pop('sensitivities', None)
-        if sensitivities is None:
+        sensitivity_cache = kwargs.pop('sensitivity_cache', None)
+        if sensitivities is None and sensitivity_cache is not None:
+            sensitivities = [np.maximum(sensitivity_cache(opi), eps)
+                             for opi in op]
+        elif sensitivities is None:
             sensitivities = [np.maximum(opi.adjoint(opi.range.one()), eps)
                              for opi in op]
         else:
@@ -186,24 +211,282 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
             except TypeError:
                 sensitivities = [sensitivities] * n_ops
 
+        num_threads = kwargs.pop('num_threads', None)
+        if num_threads is None:
+            num_threads = npy_tensors.CHUNK_NUM_THREADS
+
         tmp_dom = op[0].domain.element()
         tmp_ran = [opi.range.element() for opi in op]
 
-        for _ in range(niter):
-            for i in range(n_ops):
-                op[i](x, out=tmp_ran[i])
-                tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
-                data[i].divide(tmp_ran[i], out=tmp_ran[i])
+        # Flat views of the data for the fused update, if possible
+        dom_arrs = _fused_arrays([x, tmp_dom])
+        fused = [False] * n_ops
+        if dom_arrs is not None:
+            ran_arrs = [_fused_arrays([tmp_ran[i], data[i]])
+                        for i in range(n_ops)]
+            inv_sens = [_fused_inverse(sens, x.shape)
+                        for sens in sensitivities]
+            fused = [ran_arrs[i] is not None and inv_sens[i] is not None
+                     for i in range(n_ops)]
+
+        pool = ThreadPool(num_threads) if num_threads > 1 else None
+        try:
+            for _ in range(niter):
+                for i in range(n_ops):
+                    op[i](x, out=tmp_ran[i])
+                    if fused[i]:
+                        _run_blocks(_mlem_ratio, ran_arrs[i] + [eps], pool)
+                    else:
+                        tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
+                        data[i].divide(tmp_ran[i], out=tmp_ran[i])
+
+                    op[i].adjoint(tmp_ran[i], out=tmp_dom)
+                    if fused[i]:
+                        _run_blocks(_mlem_update, dom_arrs + [inv_sens[i]],
+                                    pool)
+                    else:
+                        tmp_dom /= sensitivities[i]
+                        x *= tmp_dom
+
+                    if callback_stop(callback, x):
+                        return
+        finally:
+            if pool is not None:
+                pool.close()
+    else:
+        raise RuntimeError('unknown noise model')
 
-                op[i].adjoint(tmp_ran[i], out=tmp_dom)
-                tmp_dom /= sensitivities[i]
 
-                x *= tmp_dom
+def _fused_arrays(elements):
+    """Return flat views of the data of ``elements``, or ``None``.
 
-                if callback is not None:
-                    callback(x)
+    The views are only available for contiguous elements of spaces with
+    ``impl='numpy'``, where writing to them changes the elements.
+    """
+    arrays = []
+    for elem in elements:
+        if getattr(elem.space, 'impl', None) != 'numpy':
+            return None
+        arr = elem.asarray()
+        if not arr.flags.c_contiguous:
+            return None
+        arrays.append(arr.reshape(-1))
+    return arrays
+
+
+def _fused_inverse(sensitivities, shape):
+    """Return ``1 / sensitivities`` for the fused update, or ``None``."""
+    if np.isscalar(sensitivities):
+        return 1.0 / sensitivities
+    sens = np.asarray(sensitivities)
+    if sens.shape != shape:
+        return None
+    return np.ascontiguousarray(1 / sens).reshape(-1)
+
+
+def _mlem_ratio(proj, data, eps):
+    """Compute ``proj = data / max(proj, eps)`` in-place."""
+    np.maximum(proj, eps, out=proj)
+    np.divide(data, proj, out=proj)
+
+
+def _mlem_update(x, back_proj, inv_sens):
+    """Compute ``x *= back_proj * inv_sens`` in-place."""
+    np.multiply(back_proj, inv_sens, out=back_proj)
+    np.multiply(x, back_proj, out=x)
+
+
+def _run_blocks(func, arrays, pool=None):
+    """Evaluate ``func`` on corresponding blocks of flat ``arrays``.
+
+    All steps of ``func`` are done on one block before moving on to the
+    next, such that the data is read from memory only once. Scalars in
+    ``arrays`` are passed on as they are. With a ``pool``, the blocks
+    are distributed among its threads.
+    """
+    size = next(arr.size for arr in arrays if np.ndim(arr) > 0)
+    block_size = npy_tensors.CHUNK_SIZE
+    slices = [slice(start, start + block_size)
+              for start in range(0, size, block_size)]
+
+    def func_block(slc):
+        """Evaluate ``func`` on one block."""
+        func(*[arr[slc] if np.ndim(arr) > 0 else arr for arr in arrays])
+
+    if pool is None or len(slices) == 1:
+        for slc in slices:
+            func_block(slc)
     else:
-        raise RuntimeError('unknown noise model')
+        pool.map(func_block, slices)
+
+
+class SensitivityCache(object):
+
+    """Cache for the sensitivities ``A^* 1`` of MLEM-type methods.
+
+    Computing the sensitivities costs one back-projection per operator,
+    which is significant when the same setup is reconstructed many times.
+    A cache instance can be passed to `mlem` and `osmlem` as
+    ``sensitivity_cache`` to compute them only once per operator.
+
+    Operators with a ``geometry``, e.g., `RayTransform`, are identified by
+    a hash of their type, back-end, spaces and geometry, such that
+    sensitivities are shared between operators with the same setup and
+    can be stored in ``cache_dir``. Other operators are only cached in
+    memory, for as long as the operator object exists.
+    """
+
+    def __init__(self, cache_dir=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Directory in which the sensitivities of operators with a
+            geometry are stored, or from which they are loaded if they
+            exist already. The directory can be shared between processes.
+            It is created if it does not exist.
+
+        Examples
+        --------
+        >>> op = odl.ScalingOperator(odl.rn(3), 2.0)
+        >>> cache = odl.solvers.SensitivityCache()
+        >>> cache(op)
+        rn(3).element([ 2.,  2.,  2.])
+        >>> len(cache)
+        1
+        """
+        if cache_dir is not None and not os.path.isdir(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except OSError:
+                # Created concurrently by another process
+                if not os.path.isdir(cache_dir):
+                    raise
+
+        self.cache_dir = cache_dir
+        self.__by_key = {}
+        self.__by_op = weakref.WeakKeyDictionary()
+
+    def __call__(self, op):
+        """Return ``op.adjoint(op.range.one())``, computed at most once.
+
+        Parameters
+        ----------
+        op : `Operator`
+            Linear operator whose sensitivities should be returned.
+
+        Returns
+        -------
+        sensitivities : ``op.domain`` element
+            New element holding the sensitivities, which can be modified
+            without affecting the cache.
+        """
+        key = self._key(op)
+        if key is None:
+            try:
+                sens = self.__by_op.get(op)
+            except TypeError:
+                # Unhashable operator, no caching possible
+                return op.adjoint(op.range.one())
+            if sens is None:
+                sens = op.adjoint(op.range.one())
+                self.__by_op[op] = sens
+            return sens.copy()
+
+        sens = self.__by_key.get(key)
+        if sens is not None:
+            return op.domain.element(sens.copy())
+
+        if self.cache_dir is not None:
+            fname = os.path.join(self.cache_dir,
+                                 'sensitivity_{}.npy'.format(key))
+            if os.path.exists(fname):
+                sens = np.load(fname)
+                self.__by_key[key] = sens
+                return op.domain.element(sens.copy())
+
+        sens_elem = op.adjoint(op.range.one())
+        sens = sens_elem.asarray().copy()
+
+        if self.cache_dir is not None:
+            # Write to a temporary file first to avoid partially written
+            # files being picked up by other processes
+            tmp_fname = os.path.join(
+                self.cache_dir,
+                'sensitivity_{}.{}.tmp.npy'.format(key, os.getpid()))
+            np.save(tmp_fname, sens)
+            os.rename(tmp_fname, fname)
+
+        self.__by_key[key] = sens
+        return sens_elem
+
+    @staticmethod
+    def _key(op):
+        """Return a string identifying ``op``, or ``None`` if impossible.
+
+        The key only depends on the setup of ``op``, not on the process,
+        such that it can be used to share sensitivities via ``cache_dir``.
+        Therefore, the geometry enters through its array data rather than
+        its ``repr``, which may abbreviate arrays or contain memory
+        addresses.
+        """
+        geometry = getattr(op, 'geometry', None)
+        if geometry is None:
+            return None
+
+        sha = hashlib.sha1()
+        for string in (type(op).__name__, str(getattr(op, 'impl', '')),
+                       repr(op.domain), repr(op.range),
+                       type(geometry).__name__,
+                       type(geometry.detector).__name__):
+            sha.update(string.encode('utf-8'))
+
+        def update(arr):
+            arr = np.ascontiguousarray(arr, dtype=float)
+            sha.update(str(arr.shape).encode('utf-8'))
+            sha.update(arr.tobytes())
+
+        # Sampling points and cell boundaries of angles and detector
+        for part in (geometry.motion_partition, geometry.det_partition):
+            for vec in part.coord_vectors:
+                update(vec)
+            for vec in part.cell_boundary_vecs:
+                update(vec)
+
+        # Positions and orientations of the system at all angles,
+        # including all shifts and the translation of the geometry
+        mparams = geometry.motion_grid.points().T
+        if geometry.motion_partition.ndim == 1:
+            mparams = mparams[0]
+        update(geometry.det_refpoint(mparams))
+        update(geometry.rotation_matrix(mparams))
+        if hasattr(geometry, 'src_position'):
+            update(geometry.src_position(mparams))
+
+        # Detector surface in its initial state
+        dparams = geometry.det_grid.points().T
+        if geometry.det_partition.ndim == 1:
+            dparams = dparams[0]
+        update(geometry.detector.surface(dparams))
+        return sha.hexdigest()
+
+    def clear(self):
+        """Remove all sensitivities held in memory."""
+        self.__by_key.clear()
+        self.__by_op.clear()
+
+    def __len__(self):
+        """Return ``len(self)``, the number of sensitivities in memory."""
+        return len(self.__by_key) + len(self.__by_op)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        if self.cache_dir is None:
+            return '{}()'.format(self.__class__.__name__)
+        else:
+            return '{}(cache_dir={!r})'.format(self.__class__.__name__,
+                                               self.cache_dir)
 
 
 def loglikelihood(x, data, noise='poisson'):
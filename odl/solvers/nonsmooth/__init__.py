@@ -32,3 +32,6 @@ __all__ += proximal_gradient_solvers.__all__
 
 from .alternating_dual_updates import *
 __all__ += alternating_dual_updates.__all__
+
+from .stochastic_primal_dual_hybrid_gradient import *
+__all__ += stochastic_primal_dual_hybrid_gradient.__all__
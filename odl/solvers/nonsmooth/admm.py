@@ -3,7 +3,8 @@
 from __future__ import division
 from builtins import range
 
-from odl.operator import Operator, OpDomainError
+from odl.operator import Operator, OpDomainError, TemporaryPool
+from odl.solvers.util import callback_stop
 
 
 __all__ = ('admm_linearized',)
@@ -121,6 +122,9 @@ def admm_linearized(x, f, g, L, tau, sigma, niter, **kwargs):
     prox_tau_f = f.proximal(tau)
     prox_sigma_g = g.proximal(sigma)
 
+    # Further intermediate results, see `temporary_pool_limit`
+    pool = TemporaryPool()
+
     for _ in range(niter):
         # tmp_ran has value Lx^k here
         # tmp_dom <- L^*(Lx^k + u^k - z^k)
@@ -136,14 +140,16 @@ def admm_linearized(x, f, g, L, tau, sigma, niter, **kwargs):
         # tmp_ran <- Lx^(k+1)
         L(x, out=tmp_ran)
         # z^(k+1) <- prox[sigma*g](Lx^(k+1) + u^k)
-        prox_sigma_g(tmp_ran + u, out=z)  # 1 copy here
+        with pool.element(L.range) as tmp:
+            tmp.lincomb(1, tmp_ran, 1, u)
+            prox_sigma_g(tmp, out=z)
 
         # u^(k+1) = u^k + Lx^(k+1) - z^(k+1)
         u += tmp_ran
         u -= z
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x):
+            return
 
 
 def admm_linearized_simple(x, f, g, L, tau, sigma, niter, **kwargs):
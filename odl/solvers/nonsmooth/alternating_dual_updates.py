@@ -17,6 +17,9 @@ from __future__ import print_function, division, absolute_import
 
 import numpy as np
 
+from odl.operator import TemporaryPool
+from odl.solvers.util import callback_stop
+
 __all__ = ('adupdates',)
 
 
@@ -164,12 +167,17 @@ def adupdates(x, g, L, stepsize, inner_stepsizes, niter, random=False,
                                        else stepsize * np.asarray(inner_ss))
              for (func, inner_ss) in zip(g, inner_stepsizes)]
 
+    # Further intermediate results, see `temporary_pool_limit`
+    pool = TemporaryPool()
+
     # Iteratively find a solution
     for _ in range(niter):
         # Update x = x - 1/stepsize * sum([ops[i].adjoint(duals[i])
         # for i in range(length)])
-        for i in range(length):
-            x -= (1.0 / stepsize) * L[i].adjoint(duals[i])
+        with pool.element(x.space) as tmp_dom:
+            for i in range(length):
+                L[i].adjoint(duals[i], out=tmp_dom)
+                x.lincomb(1, x, -1.0 / stepsize, tmp_dom)
 
         if random:
             rng = np.random.permutation(range(length))
@@ -180,16 +188,26 @@ def adupdates(x, g, L, stepsize, inner_stepsizes, niter, random=False,
             step = (stepsize * inner_stepsizes[j]
                     if np.isscalar(inner_stepsizes[j])
                     else stepsize * np.asarray(inner_stepsizes[j]))
-            arg = duals[j] + step * L[j](x)
             tmp_ran = tmp_rans[L[j].range]
-            proxs[j](arg, out=tmp_ran)
-            x -= 1.0 / stepsize * L[j].adjoint(tmp_ran - duals[j])
+            with pool.element(L[j].range) as arg:
+                # arg = duals[j] + step * L[j](x)
+                L[j](x, out=arg)
+                arg *= step
+                arg += duals[j]
+                proxs[j](arg, out=tmp_ran)
+
+                # x = x - 1 / stepsize * L[j].adjoint(tmp_ran - duals[j])
+                arg.lincomb(1, tmp_ran, -1, duals[j])
+                with pool.element(x.space) as tmp_dom:
+                    L[j].adjoint(arg, out=tmp_dom)
+                    x.lincomb(1, x, -1.0 / stepsize, tmp_dom)
+
             duals[j].assign(tmp_ran)
 
-            if callback is not None and callback_loop == 'inner':
-                callback(x)
-        if callback is not None and callback_loop == 'outer':
-            callback(x)
+            if callback_loop == 'inner' and callback_stop(callback, x):
+                return
+        if callback_loop == 'outer' and callback_stop(callback, x):
+            return
 
 
 def adupdates_simple(x, g, L, stepsize, inner_stepsizes, niter,
@@ -11,6 +11,7 @@
 from __future__ import print_function, division, absolute_import
 
 from odl.operator import Operator
+from odl.solvers.util import callback_stop
 
 
 __all__ = ('douglas_rachford_pd',)
@@ -218,8 +219,8 @@ def douglas_rachford_pd(x, f, g, L, tau, sigma, niter,
             v[i].lincomb(1, v[i], lam_k, z2[i])
             v[i].lincomb(1, v[i], -lam_k, p2[i])
 
-        if callback is not None:
-            callback(p1)
+        if callback_stop(callback, p1):
+            break
 
     # The final result is actually in p1 according to the algorithm, so we need
     # to assign here.
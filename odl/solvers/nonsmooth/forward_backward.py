@@ -10,7 +10,8 @@
 
 from __future__ import print_function, division, absolute_import
 
-from odl.operator import Operator
+from odl.operator import Operator, TemporaryPool
+from odl.solvers.util import callback_stop
 
 
 __all__ = ('forward_backward_pd',)
@@ -168,23 +169,40 @@ def forward_backward_pd(x, f, g, L, h, tau, sigma, niter,
     v = [Li.range.zero() for Li in L]
     y = x.space.zero()
 
+    # Intermediate results, see `temporary_pool_limit`
+    pool = TemporaryPool()
+
     for k in range(niter):
         x_old = x
 
-        tmp_1 = grad_h(x) + sum(Li.adjoint(vi) for Li, vi in zip(L, v))
-        prox_f(tau)(x - tau * tmp_1, out=x)
+        with pool.element(x.space) as tmp_1:
+            # tmp_1 = grad_h(x) + sum(Li.adjoint(vi) for Li, vi in zip(L, v))
+            grad_h(x, out=tmp_1)
+            with pool.element(x.space) as tmp_adj:
+                for Li, vi in zip(L, v):
+                    Li.adjoint(vi, out=tmp_adj)
+                    tmp_1 += tmp_adj
+
+            # tmp_1 = x - tau * tmp_1
+            tmp_1.lincomb(1, x, -tau, tmp_1)
+            prox_f(tau)(tmp_1, out=x)
+
         y.lincomb(2.0, x, -1, x_old)
 
         for i in range(m):
-            if l is not None:
-                # In this case gradients were given.
-                tmp_2 = sigma[i] * (L[i](y) - grad_cc_l[i](v[i]))
-            else:
-                # In this case gradients were not given. Therefore the gradient
+            with pool.element(L[i].range) as tmp_2:
+                L[i](y, out=tmp_2)
+                if l is not None:
+                    # In this case gradients were given.
+                    with pool.element(L[i].range) as tmp_3:
+                        grad_cc_l[i](v[i], out=tmp_3)
+                        tmp_2 -= tmp_3
+                # Otherwise, gradients were not given. Therefore the gradient
                 # step is omitted. For more details, see the documentation.
-                tmp_2 = sigma[i] * L[i](y)
 
-            prox_cc_g[i](sigma[i])(v[i] + tmp_2, out=v[i])
+                # tmp_2 = v[i] + sigma[i] * tmp_2
+                tmp_2.lincomb(1, v[i], sigma[i], tmp_2)
+                prox_cc_g[i](sigma[i])(tmp_2, out=v[i])
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x):
+            return
@@ -16,6 +16,8 @@ from __future__ import print_function, division, absolute_import
 import numpy as np
 
 from odl.operator import Operator
+from odl.solvers.util import callback_stop
+from odl.space.pspace import ProductSpaceElement
 
 
 __all__ = ('pdhg',)
@@ -91,7 +93,17 @@ def pdhg(x, f, g, L, tau, sigma, niter, **kwargs):
         Default: ``None``
     y : ``op.range`` element, optional
         Required to resume iteration. For ``None``, ``op.range.zero()``
-        is used.
+        is used. If ``dual_dtype`` is given, ``y`` must be an element of
+        ``op.range.astype(dual_dtype)``.
+        Default: ``None``
+    dual_dtype : optional
+        Data type in which the dual variable ``y`` is stored between
+        iterations, e.g., ``'float16'`` for a ``'float32'`` primal
+        variable. This reduces the memory footprint and traffic of the
+        dual variable, while the dual update itself is computed in the
+        data type of ``op.range``. The proximal of ``f.convex_conj``
+        must then allow aliased input and output.
+        For ``None``, the data type of ``op.range`` is used.
         Default: ``None``
 
     Notes
@@ -235,13 +247,20 @@ def pdhg(x, f, g, L, tau, sigma, niter, **kwargs):
         raise TypeError('`x_relax` {} is not in the domain of '
                         '`L` {}'.format(x_relax.space, L.domain))
 
-    # Initialize the dual variable
+    # Initialize the dual variable, possibly with reduced precision
+    dual_dtype = kwargs.pop('dual_dtype', None)
+    if dual_dtype is None:
+        dual_space = L.range
+    else:
+        dual_space = L.range.astype(dual_dtype)
+    mixed_precision = (dual_space != L.range)
+
     y = kwargs.pop('y', None)
     if y is None:
-        y = L.range.zero()
-    elif y not in L.range:
-        raise TypeError('`y` {} is not in the range of `L` '
-                        '{}'.format(y.space, L.range))
+        y = dual_space.zero()
+    elif y not in dual_space:
+        raise TypeError('`y` {} is not in the space of the dual variable '
+                        '{}'.format(y.space, dual_space))
 
     # Get the proximals
     proximal_dual = f.convex_conj.proximal
@@ -265,17 +284,28 @@ def pdhg(x, f, g, L, tau, sigma, niter, **kwargs):
 
         # Gradient ascent in the dual variable y
         # Compute dual_tmp = y + sigma * L(x_relax)
-        L(x_relax, out=dual_tmp)
-        dual_tmp.lincomb(1, y, sigma, dual_tmp)
+        L._call_trusted(x_relax, out=dual_tmp)
+        if mixed_precision:
+            dual_tmp.lincomb(sigma, dual_tmp)
+            _add_cast(dual_tmp, y)
+        else:
+            dual_tmp.lincomb(1, y, sigma, dual_tmp)
 
         # Apply the dual proximal
         if not proximal_constant:
             proximal_dual_sigma = proximal_dual(sigma)
-        proximal_dual_sigma(dual_tmp, out=y)
+        if mixed_precision:
+            # Keep the full precision result for the primal update
+            proximal_dual_sigma(dual_tmp, out=dual_tmp)
+            y[:] = dual_tmp
+            y_full = dual_tmp
+        else:
+            proximal_dual_sigma(dual_tmp, out=y)
+            y_full = y
 
         # Gradient descent in the primal variable x
         # Compute primal_tmp = x + (- tau) * L.derivative(x).adjoint(y)
-        L.derivative(x).adjoint(y, out=primal_tmp)
+        L.derivative(x).adjoint._call_trusted(y_full, out=primal_tmp)
         primal_tmp.lincomb(1, x, -tau, primal_tmp)
 
         # Apply the primal proximal
@@ -297,8 +327,17 @@ def pdhg(x, f, g, L, tau, sigma, niter, **kwargs):
         # Over-relaxation in the primal variable x
         x_relax.lincomb(1 + theta, x, -theta, x_old)
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, x_old=x_old):
+            return
+
+
+def _add_cast(x, y):
+    """In-place ``x += y`` for ``y`` in a space with different data type."""
+    if isinstance(x, ProductSpaceElement):
+        for xi, yi in zip(x, y):
+            _add_cast(xi, yi)
+    else:
+        x.ufuncs.add(y, out=x)
 
 
 if __name__ == '__main__':
@@ -11,6 +11,8 @@
 from __future__ import print_function, division, absolute_import
 import numpy as np
 
+from odl.solvers.util import callback_stop
+
 
 __all__ = ('proximal_gradient', 'accelerated_proximal_gradient')
 
@@ -113,8 +115,8 @@ def proximal_gradient(x, f, g, gamma, niter, callback=None, **kwargs):
         # Update x
         x.lincomb(1 - lam_k, x, lam_k, f_prox(tmp))
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x):
+            return
 
 
 def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
@@ -209,8 +211,8 @@ def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
         # Update y
         y.lincomb(1 + alpha, x, -alpha, y)
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x):
+            return
 
 
 if __name__ == '__main__':
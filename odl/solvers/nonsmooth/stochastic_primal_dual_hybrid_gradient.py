@@ -0,0 +1,329 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Stochastic primal-dual hybrid gradient (SPDHG) algorithm.
+
+SPDHG is a variant of the primal-dual hybrid gradient algorithm for problems
+where the operator splits into many blocks, e.g., subsets of projection
+angles in tomography. In each iteration only a few of the blocks are
+evaluated.
+"""
+
+from __future__ import print_function, division, absolute_import
+from numbers import Integral
+import numpy as np
+
+from odl.operator import Operator, BroadcastOperator
+from odl.solvers.util import callback_stop
+from odl.space import ProductSpace
+
+
+__all__ = ('spdhg', 'spdhg_step_sizes')
+
+
+def spdhg(x, f, g, L, tau, sigma, niter, **kwargs):
+    """Stochastic primal-dual hybrid gradient algorithm.
+
+    Variant of `pdhg` for the problem ::
+
+        min_{x in X} sum_i f_i(L_i x) + g(x)
+
+    that only evaluates a subset of the operators ``L_i`` and their
+    adjoints in each iteration. For tomography with many angles, grouping
+    the angles into subsets and using one ``L_i`` per subset reduces the
+    cost of an iteration to a fraction of one full projection.
+
+    Parameters
+    ----------
+    x : ``L.domain`` element
+        Starting point of the iteration, updated in-place.
+    f : sequence of `Functional` or `SeparableSum`
+        The functions ``f_i`` in the problem definition. Each needs to have
+        ``f_i.convex_conj.proximal``.
+    g : `Functional`
+        The function ``g`` in the problem definition. Needs to have
+        ``g.proximal``.
+    L : sequence of `Operator` or `BroadcastOperator`
+        The linear operators ``L_i``, with common domain ``g.domain`` and
+        ranges ``f_i.domain``.
+    tau : positive float
+        Step size parameter for the update of the primal (``g``) variable.
+    sigma : positive float or sequence of positive floats
+        Step size parameters for the update of the dual (``f_i``) variables,
+        either one per block or one for all blocks.
+    niter : non-negative int
+        Number of iterations.
+
+    Other Parameters
+    ----------------
+    prob : sequence of floats, optional
+        Probabilities ``p_i`` that block ``i`` is selected in an iteration,
+        must be consistent with ``fun_select``. For serial sampling of one
+        block per iteration, they sum to 1.
+        Default: ``1 / len(L)`` for each block
+    fun_select : {'random', 'sequential'} or callable, optional
+        Rule to select the blocks updated in an iteration. ``'random'``
+        draws one block according to ``prob``, ``'sequential'`` cycles
+        through the blocks in order, as for ordered subsets. A callable is
+        called with the iteration number and must return a sequence of
+        block indices.
+        Default: ``'random'``
+    theta : float, optional
+        Relaxation parameter, required to fulfill ``0 <= theta <= 1``.
+        Default: 1
+    y : ``ProductSpace(L_1.range, ..., L_n.range)`` element, optional
+        Required to resume iteration. For ``None``, zero is used.
+        Default: ``None``
+    z : ``L.domain`` element, optional
+        Required to resume iteration, must then equal
+        ``sum_i L_i.adjoint(y_i)``. For ``None``, it is computed from ``y``.
+        Default: ``None``
+    callback : callable, optional
+        Function called with the current iterate after each iteration.
+
+    Notes
+    -----
+    The algorithm keeps the dual variables :math:`y_i` together with
+    :math:`z = \\sum_i L_i^* y_i`. For a selection :math:`S` of blocks, an
+    iteration reads
+
+    .. math::
+        x^{k+1} = \\mathrm{prox}_{\\tau g}(x^k - \\tau \\bar{z}^k)
+
+        y_i^{k+1} = \\mathrm{prox}_{\\sigma_i f_i^*}
+        (y_i^k + \\sigma_i L_i x^{k+1}), \\quad i \\in S
+
+        z^{k+1} = z^k + \\sum_{i \\in S} L_i^* (y_i^{k+1} - y_i^k)
+
+        \\bar{z}^{k+1} = z^{k+1} + \\sum_{i \\in S} \\frac{\\theta}{p_i}
+        L_i^* (y_i^{k+1} - y_i^k),
+
+    and all other dual variables are left unchanged. See [CERS2018] for
+    details.
+
+    For serial sampling of one block per iteration, convergence is
+    guaranteed if
+
+    .. math::
+        \\tau \\sigma_i \|L_i\|^2 < p_i
+
+    for all :math:`i`, see `spdhg_step_sizes` for a choice that satisfies
+    this condition.
+
+    See Also
+    --------
+    odl.solvers.nonsmooth.primal_dual_hybrid_gradient.pdhg :
+        Deterministic variant, which evaluates all blocks in each
+        iteration.
+
+    References
+    ----------
+    [CERS2018] Chambolle, A, Ehrhardt, M J, Richtarik, P, and Schoenlieb,
+    C-B. *Stochastic Primal-Dual Hybrid Gradient Algorithm with Arbitrary
+    Sampling and Imaging Applications*. SIAM Journal on Optimization, 28
+    (2018), pp 2783-2808.
+    """
+    from odl.solvers.functional.default_functionals import SeparableSum
+
+    # Forward operators
+    if isinstance(L, BroadcastOperator):
+        L = L.operators
+    L = list(L)
+    if not all(isinstance(Li, Operator) for Li in L):
+        raise TypeError('`L` {!r} is not a sequence of `Operator` instances'
+                        ''.format(L))
+    num_blocks = len(L)
+    if num_blocks == 0:
+        raise ValueError('`L` is empty')
+
+    if any(Li.domain != L[0].domain for Li in L):
+        raise ValueError('domains of `L` are not all equal')
+    domain = L[0].domain
+
+    # Functionals
+    if isinstance(f, SeparableSum):
+        f = f.functionals
+    f = list(f)
+    if len(f) != num_blocks:
+        raise ValueError('`len(f)` should equal `len(L)`, but {} != {}'
+                         ''.format(len(f), num_blocks))
+
+    # Starting point
+    if x not in domain:
+        raise TypeError('`x` {!r} is not in the domain of `L` {!r}'
+                        ''.format(x, domain))
+
+    # Step size parameters
+    tau, tau_in = float(tau), tau
+    if tau <= 0:
+        raise ValueError('`tau` must be positive, got {}'.format(tau_in))
+
+    if np.isscalar(sigma):
+        sigma = [sigma] * num_blocks
+    sigma, sigma_in = [float(si) for si in sigma], sigma
+    if len(sigma) != num_blocks or any(si <= 0 for si in sigma):
+        raise ValueError('`sigma` must be positive with one value per block, '
+                         'got {}'.format(sigma_in))
+
+    # Number of iterations
+    if not isinstance(niter, Integral) or niter < 0:
+        raise ValueError('`niter` {} not understood'
+                         ''.format(niter))
+
+    # Selection of the blocks
+    prob = kwargs.pop('prob', None)
+    if prob is None:
+        prob = [1 / num_blocks] * num_blocks
+    prob, prob_in = np.array(prob, dtype=float), prob
+    if prob.shape != (num_blocks,) or np.any(prob <= 0) or np.any(prob > 1):
+        raise ValueError('`prob` must be in (0, 1] with one value per block, '
+                         'got {}'.format(prob_in))
+
+    fun_select = kwargs.pop('fun_select', 'random')
+    if fun_select == 'random':
+        def fun_select(k):
+            return [np.random.choice(num_blocks, p=prob)]
+    elif fun_select == 'sequential':
+        def fun_select(k):
+            return [k % num_blocks]
+    elif not callable(fun_select):
+        raise ValueError('`fun_select` {!r} not understood'
+                         ''.format(fun_select))
+
+    # Relaxation parameter
+    theta = kwargs.pop('theta', 1)
+    theta, theta_in = float(theta), theta
+    if not 0 <= theta <= 1:
+        raise ValueError('`theta` {} not in [0, 1]'
+                         ''.format(theta_in))
+
+    # Callback object
+    callback = kwargs.pop('callback', None)
+    if callback is not None and not callable(callback):
+        raise TypeError('`callback` {} is not callable'
+                        ''.format(callback))
+
+    # Initialize the dual variables and their accumulated adjoint
+    dual_space = ProductSpace(*[Li.range for Li in L])
+    y = kwargs.pop('y', None)
+    if y is None:
+        y = dual_space.zero()
+    elif y not in dual_space:
+        raise TypeError('`y` {} is not in the space of the dual variables '
+                        '{}'.format(y.space, dual_space))
+
+    z = kwargs.pop('z', None)
+    if z is None:
+        z = domain.zero()
+        dz = domain.element()
+        for Li, yi in zip(L, y):
+            Li.adjoint(yi, out=dz)
+            z += dz
+    elif z not in domain:
+        raise TypeError('`z` {} is not in the domain of `L` {}'
+                        ''.format(z.space, domain))
+
+    if kwargs:
+        raise TypeError('unexpected keyword argument: {}'.format(kwargs))
+
+    # Pre-compute proximals for efficiency
+    proximal_dual_sigma = [fi.convex_conj.proximal(si)
+                           for fi, si in zip(f, sigma)]
+    proximal_primal_tau = g.proximal(tau)
+
+    # Temporaries, `z_relax` doubles as argument of the primal proximal
+    z_relax = z.copy()
+    dz = domain.element()
+    y_old = dual_space.element()
+
+    for k in range(niter):
+        selected = fun_select(k)
+
+        # Gradient descent in the primal variable x
+        # Compute z_relax = x + (- tau) * z_relax
+        z_relax.lincomb(1, x, -tau, z_relax)
+        proximal_primal_tau(z_relax, out=x)
+
+        # Gradient ascent in the selected dual variables
+        z_relax.assign(z)
+        for i in selected:
+            y_old[i].assign(y[i])
+
+            # Compute y[i] = prox(y_old[i] + sigma[i] * L[i](x))
+            L[i]._call_trusted(x, out=y[i])
+            y[i].lincomb(1, y_old[i], sigma[i], y[i])
+            proximal_dual_sigma[i](y[i], out=y[i])
+
+            # Compute dz = L[i].adjoint(y[i] - y_old[i])
+            y_old[i].lincomb(-1, y_old[i], 1, y[i])
+            L[i].adjoint._call_trusted(y_old[i], out=dz)
+            z += dz
+
+            # Over-relaxation in the accumulated dual variable
+            z_relax.lincomb(1, z_relax, 1 + theta / prob[i], dz)
+
+        if callback_stop(callback, x):
+            return
+
+
+def spdhg_step_sizes(L, prob=None, rho=0.99):
+    """Return step sizes ``(tau, sigma)`` for `spdhg`.
+
+    The step sizes are chosen as ::
+
+        sigma_i = rho / ||L_i||,  tau = rho * min_i(p_i / ||L_i||)
+
+    which satisfies the convergence condition
+    ``tau * sigma_i * ||L_i||^2 < p_i`` for ``rho < 1``.
+
+    Parameters
+    ----------
+    L : sequence of `Operator` or `BroadcastOperator`
+        The operators ``L_i`` that are passed to `spdhg`.
+    prob : sequence of floats, optional
+        Probabilities with which the blocks are selected.
+        Default: ``1 / len(L)`` for each block
+    rho : float in (0, 1), optional
+        Safety factor for the step sizes.
+
+    Returns
+    -------
+    tau : float
+        Primal step size.
+    sigma : list of float
+        Dual step sizes, one per block.
+
+    Examples
+    --------
+    >>> L = [odl.ScalingOperator(odl.rn(3), 2.0),
+    ...      odl.ScalingOperator(odl.rn(3), 4.0)]
+    >>> tau, sigma = odl.solvers.spdhg_step_sizes(L, rho=0.5)
+    >>> tau
+    0.0625
+    >>> sigma
+    [0.25, 0.125]
+    """
+    if isinstance(L, BroadcastOperator):
+        L = L.operators
+    L = list(L)
+    if prob is None:
+        prob = [1 / len(L)] * len(L)
+
+    rho, rho_in = float(rho), rho
+    if not 0 < rho < 1:
+        raise ValueError('`rho` {} not in (0, 1)'.format(rho_in))
+
+    norms = [Li.norm(estimate=True) for Li in L]
+    sigma = [rho / norm for norm in norms]
+    tau = rho * min(pi / norm for pi, norm in zip(prob, norms))
+    return tau, sigma
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -11,7 +11,7 @@
 from __future__ import print_function, division, absolute_import
 import numpy as np
 
-from odl.solvers.util import ConstantLineSearch
+from odl.solvers.util import ConstantLineSearch, callback_stop
 
 
 __all__ = ('steepest_descent', 'adam')
@@ -101,8 +101,8 @@ def steepest_descent(f, x, line_search=1.0, maxiter=1000, tol=1e-16,
         if projection is not None:
             projection(x)
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=grad_x):
+            return
 
 
 def adam(f, x, learning_rate=1e-3, beta1=0.9, beta2=0.999, eps=1e-8,
@@ -176,8 +176,8 @@ def adam(f, x, learning_rate=1e-3, beta1=0.9, beta2=0.999, eps=1e-8,
 
         x.lincomb(1, x, -step, m / (np.sqrt(v) + eps))
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=grad_x):
+            return
 
 
 if __name__ == '__main__':
@@ -11,11 +11,12 @@
 from __future__ import print_function, division, absolute_import
 import numpy as np
 
-from odl.solvers.util import ConstantLineSearch
+from odl.solvers.util import ConstantLineSearch, callback_stop
 from odl.solvers.iterative.iterative import conjugate_gradient
 
 
-__all__ = ('newtons_method', 'bfgs_method', 'broydens_method')
+__all__ = ('newtons_method', 'bfgs_method', 'lbfgs_method',
+           'broydens_method', 'LBFGSMemory')
 
 
 def _bfgs_direction(s, y, x, hessinv_estimate=None):
@@ -124,6 +125,194 @@ def _broydens_direction(s, y, x, hessinv_estimate=None, impl='first'):
     return r
 
 
+class LBFGSMemory(object):
+
+    """Storage of the correction pairs of the limited memory BFGS method.
+
+    The pairs ``(s_i, y_i)`` are kept in a preallocated ring buffer of
+    ``num_store`` slots, such that a new pair overwrites the oldest one
+    in place and no space elements are allocated during the iteration.
+    Alongside the pairs, the inner products ``<s_i, y_j>`` and
+    ``<y_i, y_j>`` are cached, which is all that is needed to apply the
+    compact representation of the inverse Hessian estimate, see
+    `apply`.
+
+    Since the memory lives outside of `lbfgs_method`, it can be passed
+    to several consecutive calls to warm-start the solver.
+    """
+
+    def __init__(self, space, num_store=10):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `LinearSpace`
+            Space of the correction pairs, usually the domain of the
+            functional to minimize. Must be a real space.
+        num_store : positive int, optional
+            Maximum number of correction pairs to store.
+
+        Examples
+        --------
+        >>> space = odl.rn(3)
+        >>> memory = odl.solvers.LBFGSMemory(space, num_store=2)
+        >>> memory.update(space.element([1, 0, 0]),
+        ...               space.element([2, 0, 0]))
+        >>> len(memory)
+        1
+        >>> memory.apply(space.element([1, 1, 1]))
+        rn(3).element([ 0.5,  0.5,  0.5])
+        """
+        num_store, num_store_in = int(num_store), num_store
+        if num_store != num_store_in or num_store <= 0:
+            raise ValueError('`num_store` must be a positive integer, '
+                             'got {}'.format(num_store_in))
+
+        self.__space = space
+        self.__num_store = num_store
+        self.__s = [space.element() for _ in range(num_store)]
+        self.__y = [space.element() for _ in range(num_store)]
+
+        # Gram matrices indexed by slot, `__sy[i, j] = <s_i, y_j>` is only
+        # valid if pair `i` is not newer than pair `j`
+        self.__sy = np.zeros((num_store, num_store))
+        self.__yy = np.zeros((num_store, num_store))
+
+        self.__start = 0
+        self.__len = 0
+
+    @property
+    def space(self):
+        """Space of the stored correction pairs."""
+        return self.__space
+
+    @property
+    def num_store(self):
+        """Maximum number of stored correction pairs."""
+        return self.__num_store
+
+    def __len__(self):
+        """Return ``len(self)``, the number of stored pairs."""
+        return self.__len
+
+    def _slots(self):
+        """Return the occupied slots, from oldest to newest pair."""
+        return [(self.__start + i) % self.num_store for i in range(len(self))]
+
+    def reset(self):
+        """Forget all stored correction pairs."""
+        self.__start = 0
+        self.__len = 0
+
+    def update(self, s, y, y_inner_s=None):
+        """Add a correction pair, replacing the oldest one if full.
+
+        Parameters
+        ----------
+        s : `LinearSpaceElement`
+            Difference ``x_{k+1} - x_k`` between two iterates.
+        y : `LinearSpaceElement`
+            Difference ``grad f(x_{k+1}) - grad f(x_k)`` of the gradients
+            in the two iterates.
+        y_inner_s : float, optional
+            Precomputed inner product ``<y, s>``.
+        """
+        if len(self) < self.num_store:
+            slot = (self.__start + len(self)) % self.num_store
+            self.__len += 1
+        else:
+            slot = self.__start
+            self.__start = (self.__start + 1) % self.num_store
+
+        self.__s[slot].assign(s)
+        self.__y[slot].assign(y)
+
+        # Only the inner products involving the new pair change
+        for i in self._slots():
+            if i == slot:
+                continue
+            self.__sy[i, slot] = self.__s[i].inner(y)
+            self.__yy[i, slot] = self.__yy[slot, i] = self.__y[i].inner(y)
+
+        if y_inner_s is None:
+            y_inner_s = y.inner(s)
+        self.__sy[slot, slot] = y_inner_s
+        self.__yy[slot, slot] = y.inner(y)
+
+    def apply(self, x, out=None):
+        """Apply the inverse Hessian estimate ``Hn^-1`` to ``x``.
+
+        Parameters
+        ----------
+        x : `LinearSpaceElement`
+            Point in which to evaluate the product.
+        out : `LinearSpaceElement`, optional
+            Element to which the result is written. May be ``x``.
+
+        Returns
+        -------
+        out : `LinearSpaceElement`
+            The result of ``Hn^-1(x)``. If ``out`` was given, the returned
+            object is a reference to it.
+
+        Notes
+        -----
+        The estimate is the same as the one computed by the two-loop
+        recursion, with initial estimate
+        :math:`H_0^{-1} = \\gamma I`,
+        :math:`\\gamma = \\langle s_n, y_n \\rangle /
+        \\langle y_n, y_n \\rangle`. It is evaluated using the compact
+        representation from [BNS1994]
+
+        .. math::
+            H_n^{-1} x = \\gamma x + S p - \\gamma Y u, \\quad
+            u = R^{-1} S^T x, \\quad
+            p = R^{-T} \\left( (D + \\gamma Y^T Y) u - \\gamma Y^T x
+            \\right),
+
+        where :math:`S` and :math:`Y` hold the stored pairs,
+        :math:`R` is the upper triangle of :math:`S^T Y` and :math:`D` its
+        diagonal. All inner products with ``x`` are independent of each
+        other, and the remaining work is on small matrices.
+
+        References
+        ----------
+        [BNS1994] Byrd, R H, Nocedal, J, and Schnabel, R B. *Representations
+        of quasi-Newton matrices and their use in limited memory methods*.
+        Mathematical Programming, 63 (1994), pp 129--156.
+        """
+        if out is None:
+            out = self.space.element()
+
+        if len(self) == 0:
+            out.assign(x)
+            return out
+
+        import scipy.linalg
+
+        slots = self._slots()
+        s_inner_x = np.array([self.__s[i].inner(x) for i in slots])
+        y_inner_x = np.array([self.__y[i].inner(x) for i in slots])
+
+        idx = np.ix_(slots, slots)
+        r_mat = np.triu(self.__sy[idx])
+        d_mat = np.diag(np.diag(r_mat))
+        newest = slots[-1]
+        gamma = self.__sy[newest, newest] / self.__yy[newest, newest]
+
+        u = scipy.linalg.solve_triangular(r_mat, s_inner_x)
+        p = scipy.linalg.solve_triangular(
+            r_mat, (d_mat + gamma * self.__yy[idx]).dot(u) - gamma * y_inner_x,
+            trans='T')
+
+        out.lincomb(gamma, x)
+        for k, i in enumerate(slots):
+            out.lincomb(1, out, p[k], self.__s[i])
+            out.lincomb(1, out, -gamma * u[k], self.__y[i])
+
+        return out
+
+
 def newtons_method(f, x, line_search=1.0, maxiter=1000, tol=1e-16,
                    cg_iter=None, callback=None):
     """Newton's method for minimizing a functional.
@@ -239,8 +428,8 @@ def newtons_method(f, x, line_search=1.0, maxiter=1000, tol=1e-16,
         # Updating
         x += step_length * search_direction
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=deriv_in_point):
+            return
 
 
 def bfgs_method(f, x, line_search=1.0, maxiter=1000, tol=1e-15, num_store=None,
@@ -353,8 +542,114 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
             ss = ss[-num_store:]
             ys = ys[-num_store:]
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=grad_x):
+            return
+
+
+def lbfgs_method(f, x, line_search=1.0, maxiter=1000, tol=1e-15,
+                 num_store=10, memory=None, callback=None):
+    """Limited memory BFGS method to minimize a differentiable function.
+
+    Notes
+    -----
+    This is a variant of `bfgs_method` with limited memory, tuned for
+    large problems. The correction pairs are kept in a `LBFGSMemory`,
+    which preallocates them, caches their inner products and applies the
+    inverse Hessian estimate in compact form. The search direction, step
+    and gradient difference are reused between iterations, so no space
+    elements are allocated in the loop.
+
+    The initial estimate of the inverse Hessian is scaled with
+    :math:`\\langle s_n, y_n \\rangle / \\langle y_n, y_n \\rangle`
+    as described in [NW2006], Section 7.2. If a pair has non-positive
+    curvature :math:`\\langle s_n, y_n \\rangle \\leq 0`, e.g., due to
+    an inexact line search, the memory is reset to keep the estimate
+    positive definite, and the next step is a steepest descent step.
+
+    Parameters
+    ----------
+    f : `Functional`
+        Functional with ``f.gradient``. Its domain must be a real space.
+    x : ``f.domain`` element
+        Starting point of the iteration, updated in-place.
+    line_search : float or `LineSearch`, optional
+        Strategy to choose the step length. If a float is given, uses it as a
+        fixed step length.
+    maxiter : int, optional
+        Maximum number of iterations.
+    tol : float, optional
+        Tolerance that should be used for terminating the iteration.
+    num_store : positive int, optional
+        Maximum number of correction pairs to store. Ignored if ``memory``
+        is given.
+    memory : `LBFGSMemory`, optional
+        Memory of correction pairs to start from. It is updated in-place
+        and can be passed to a subsequent call to warm-start the method.
+        Default: new empty memory with ``num_store`` slots.
+    callback : callable, optional
+        Object executing code per iteration, e.g. plotting each iterate.
+
+    References
+    ----------
+    [NW2006] Nocedal, J, and Wright, S. *Numerical optimization*.
+    Springer, 2006.
+    """
+    grad = f.gradient
+    if x not in grad.domain:
+        raise TypeError('`x` {!r} is not in the domain of `grad` {!r}'
+                        ''.format(x, grad.domain))
+
+    if memory is None:
+        memory = LBFGSMemory(grad.domain, num_store)
+    elif memory.space != grad.domain:
+        raise ValueError('`memory.space` {!r} is not the domain of `grad` '
+                         '{!r}'.format(memory.space, grad.domain))
+
+    if not callable(line_search):
+        line_search = ConstantLineSearch(line_search)
+
+    grad_x = grad(x)
+    search_dir = x.space.element()
+    grad_diff = x.space.element()
+    for i in range(maxiter):
+        # Determine a stepsize using line search
+        memory.apply(grad_x, out=search_dir)
+        search_dir.lincomb(-1, search_dir)
+        dir_deriv = search_dir.inner(grad_x)
+        if np.abs(dir_deriv) == 0:
+            return  # we found an optimum
+        step = line_search(x, direction=search_dir, dir_derivative=dir_deriv)
+
+        # Update x, `search_dir` now holds the step `s`
+        search_dir.lincomb(step, search_dir)
+        x.lincomb(1, x, 1, search_dir)
+
+        # grad_diff = grad(x) - grad(x_old)
+        grad_diff.assign(grad_x)
+        grad(x, out=grad_x)
+        grad_diff.lincomb(-1, grad_diff, 1, grad_x)
+
+        y_inner_s = grad_diff.inner(search_dir)
+
+        # Test for convergence
+        if np.abs(y_inner_s) < tol:
+            if grad_x.norm() < tol:
+                return
+            else:
+                # Reset if needed
+                memory.reset()
+                continue
+
+        # Update Hessian. A pair with non-positive curvature cannot be
+        # used, and keeping the old pairs may repeat the same poor search
+        # direction, hence restart from steepest descent.
+        if y_inner_s > 0:
+            memory.update(search_dir, grad_diff, y_inner_s)
+        else:
+            memory.reset()
+
+        if callback_stop(callback, x, residual=grad_x):
+            return
 
 
 def broydens_method(f, x, line_search=1.0, impl='first', maxiter=1000,
@@ -482,8 +777,8 @@ def broydens_method(f, x, line_search=1.0, impl='first', maxiter=1000,
             ss.append(u)
             ys.append(delta_grad)
 
-        if callback is not None:
-            callback(x)
+        if callback_stop(callback, x, residual=grad_x):
+            return
 
 
 if __name__ == '__main__':
@@ -10,7 +10,7 @@
 
 from __future__ import print_function, division, absolute_import
 
-from odl.solvers.util import ConstantLineSearch
+from odl.solvers.util import ConstantLineSearch, callback_stop
 
 
 __all__ = ('conjugate_gradient_nonlinear',)
@@ -128,5 +128,5 @@ def conjugate_gradient_nonlinear(f, x, line_search=1.0, maxiter=1000, nreset=0,
             # Update position
             x.lincomb(1, x, a, s)  # x = x + a * s
 
-            if callback is not None:
-                callback(x)
+            if callback_stop(callback, x, residual=dx):
+                return
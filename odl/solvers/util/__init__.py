@@ -15,3 +15,6 @@ __all__ += callback.__all__
 
 from .steplen import *
 __all__ += steplen.__all__
+
+from .monitor import *
+__all__ += monitor.__all__
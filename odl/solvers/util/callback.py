@@ -102,6 +102,23 @@ class Callback(object):
         """
         pass
 
+    def solver_info(self, **info):
+        """Receive quantities computed by the solver in this iteration.
+
+        Solvers call this method right before the callback itself, see
+        `callback_stop`. The default implementation ignores ``info``.
+        """
+        pass
+
+    @property
+    def stop_reason(self):
+        """Reason for the solver to stop, or ``None`` to continue.
+
+        Regular callbacks never stop a solver, see `ConvergenceMonitor`
+        for callbacks that do.
+        """
+        return None
+
     def __repr__(self):
         """Return ``repr(self)``."""
         return '{}()'.format(self.__class__.__name__)
@@ -134,6 +151,19 @@ class _CallbackAnd(Callback):
         for callback in self.callbacks:
             callback.reset()
 
+    def solver_info(self, **info):
+        """Pass solver quantities on to all callbacks."""
+        for callback in self.callbacks:
+            callback.solver_info(**info)
+
+    @property
+    def stop_reason(self):
+        """Stop reason of the first callback that requests a stop."""
+        for callback in self.callbacks:
+            if callback.stop_reason is not None:
+                return callback.stop_reason
+        return None
+
     def __repr__(self):
         """Return ``repr(self)``."""
         return ' & '.join('{!r}'.format(p) for p in self.callbacks)
@@ -164,6 +194,15 @@ class _CallbackCompose(Callback):
         """Reset the internal callback to its initial state."""
         self.callback.reset()
 
+    @property
+    def stop_reason(self):
+        """Stop reason of the internal callback.
+
+        Solver quantities are not passed on, since they do not match the
+        transformed iterate.
+        """
+        return getattr(self.callback, 'stop_reason', None)
+
     def __repr__(self):
         """Return ``repr(self)``.
 
@@ -0,0 +1,288 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Convergence monitors for stopping iterative methods early.
+
+Monitors are callbacks that can request a solver to stop before the
+maximum number of iterations is reached. In each iteration, solvers pass
+quantities they have computed anyway to the callback via
+`Callback.solver_info`, using the following keywords where available:
+
+- ``x_old``: the iterate before the current iteration,
+- ``residual``: a residual that vanishes at the solution, e.g.,
+  ``rhs - A(x)`` for linear equations or the gradient of a smooth
+  objective.
+
+Monitors that need a quantity not provided by a solver either fall back
+to computing it themselves or raise an error, see the respective class.
+"""
+
+from __future__ import print_function, division, absolute_import
+import time
+
+from odl.solvers.util.callback import Callback
+from odl.util import signature_string
+
+__all__ = ('ConvergenceMonitor', 'MonitorRelativeChange', 'MonitorResidual',
+           'MonitorTime', 'callback_stop')
+
+
+def callback_stop(callback, x, **info):
+    """Call a solver callback and return whether the solver should stop.
+
+    This is the hook used by the solvers in `odl.solvers` to run their
+    ``callback`` at the end of an iteration.
+
+    Parameters
+    ----------
+    callback : callable or None
+        The callback given to the solver. Stopping is only possible for
+        `Callback` instances, e.g., a `ConvergenceMonitor`.
+    x : `LinearSpaceElement`
+        Current iterate.
+    info :
+        Quantities the solver has computed in the current iteration, see
+        the module documentation for the common keywords.
+
+    Returns
+    -------
+    stop : bool
+        ``True`` if the callback requests the solver to stop.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> monitor = odl.solvers.MonitorResidual(tol=1e-3)
+    >>> callback_stop(monitor, space.one(), residual=space.one())
+    False
+    >>> callback_stop(monitor, space.one(), residual=space.zero())
+    True
+    >>> monitor.stop_reason
+    'residual norm 0 <= 0.001'
+    """
+    if callback is None:
+        return False
+    elif isinstance(callback, Callback):
+        callback.solver_info(**info)
+        callback(x)
+        return callback.stop_reason is not None
+    else:
+        callback(x)
+        return False
+
+
+class ConvergenceMonitor(Callback):
+
+    """Abstract base class for callbacks that stop a solver early.
+
+    Subclasses implement the ``_check`` method, which is called with the
+    current iterate and the quantities passed by the solver and returns a
+    string describing why to stop, or ``None`` to continue. Once a stop
+    has been requested, the reason is kept in `stop_reason` until `reset`
+    is called.
+
+    Monitors can be combined with other callbacks using ``&``, the
+    combination stops as soon as one of the monitors does.
+    """
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self.iter = 0
+        self.__info = {}
+        self.__stop_reason = None
+
+    def solver_info(self, **info):
+        """Store solver quantities for the next call."""
+        self.__info = info
+
+    def __call__(self, x):
+        """Check the stopping criterion for the iterate ``x``."""
+        if self.__stop_reason is None:
+            self.__stop_reason = self._check(x, **self.__info)
+        self.__info = {}
+        self.iter += 1
+
+    def _check(self, x, **info):
+        """Return the reason to stop in ``x``, or ``None``."""
+        raise NotImplementedError('abstract method')
+
+    @property
+    def stop_reason(self):
+        """Reason for the solver to stop, or ``None`` to continue."""
+        return self.__stop_reason
+
+    def reset(self):
+        """Set `iter` to 0 and clear `stop_reason`."""
+        self.iter = 0
+        self.__info = {}
+        self.__stop_reason = None
+
+
+class MonitorRelativeChange(ConvergenceMonitor):
+
+    """Stop when the relative change of the iterate falls below a tolerance.
+
+    The criterion is ``||x - x_old|| <= tol * ||x||``. If the solver does
+    not provide ``x_old``, the monitor keeps a copy of the previous
+    iterate itself.
+    """
+
+    def __init__(self, tol):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        tol : positive float
+            Tolerance for the relative change.
+
+        Examples
+        --------
+        >>> space = odl.rn(2)
+        >>> monitor = MonitorRelativeChange(tol=0.1)
+        >>> monitor(space.element([1, 1]))
+        >>> monitor(space.element([1, 2]))
+        >>> print(monitor.stop_reason)
+        None
+        >>> monitor(space.element([1, 2.01]))
+        >>> monitor.stop_reason
+        'relative change 0.00445 <= 0.1'
+        """
+        super(MonitorRelativeChange, self).__init__()
+        self.tol = float(tol)
+        self.__x_old = None
+
+    def _check(self, x, x_old=None, **info):
+        """Compare ``x`` with the previous iterate."""
+        if x_old is None:
+            if self.__x_old is None:
+                self.__x_old = x.copy()
+                return None
+            x_old = self.__x_old
+
+        change = x.dist(x_old)
+        norm = x.norm()
+        if x_old is self.__x_old:
+            self.__x_old.assign(x)
+
+        if change == 0:
+            return 'iterate unchanged'
+        elif change <= self.tol * norm:
+            return 'relative change {:.3g} <= {}'.format(change / norm,
+                                                          self.tol)
+        else:
+            return None
+
+    def reset(self):
+        """Set `iter` to 0 and clear `stop_reason` and stored iterates."""
+        super(MonitorRelativeChange, self).reset()
+        self.__x_old = None
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({})'.format(self.__class__.__name__,
+                               signature_string([self.tol], []))
+
+
+class MonitorResidual(ConvergenceMonitor):
+
+    """Stop when the norm of the solver residual falls below a tolerance.
+
+    The residual must be provided by the solver, e.g., ``rhs - A(x)`` in
+    `conjugate_gradient` or the gradient of the objective in
+    `steepest_descent`.
+    """
+
+    def __init__(self, tol, relative=False):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        tol : positive float
+            Tolerance for the residual norm.
+        relative : bool, optional
+            If ``True``, compare the residual norm relative to the norm of
+            the first residual seen by the monitor.
+        """
+        super(MonitorResidual, self).__init__()
+        self.tol = float(tol)
+        self.relative = bool(relative)
+        self.__norm_first = None
+
+    def _check(self, x, residual=None, **info):
+        """Compare the residual norm with the tolerance."""
+        if residual is None:
+            raise ValueError('the solver does not provide a `residual`')
+
+        norm = residual.norm()
+        if self.relative:
+            if self.__norm_first is None:
+                self.__norm_first = norm
+            if self.__norm_first != 0:
+                norm /= self.__norm_first
+
+        if norm <= self.tol:
+            return '{}residual norm {:.3g} <= {}'.format(
+                'relative ' if self.relative else '', norm, self.tol)
+        else:
+            return None
+
+    def reset(self):
+        """Set `iter` to 0 and clear `stop_reason` and the first residual."""
+        super(MonitorResidual, self).reset()
+        self.__norm_first = None
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        optargs = [('relative', self.relative, False)]
+        inner_str = signature_string([self.tol], optargs)
+        return '{}({})'.format(self.__class__.__name__, inner_str)
+
+
+class MonitorTime(ConvergenceMonitor):
+
+    """Stop when a time budget is exhausted.
+
+    The clock starts with the first call, i.e., after the first iteration.
+    """
+
+    def __init__(self, seconds):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        seconds : positive float
+            Maximum wall time in seconds.
+        """
+        super(MonitorTime, self).__init__()
+        self.seconds = float(seconds)
+        self.__start = None
+
+    def _check(self, x, **info):
+        """Compare the elapsed time with the budget."""
+        if self.__start is None:
+            self.__start = time.time()
+        elapsed = time.time() - self.__start
+        if elapsed >= self.seconds:
+            return 'time {:.3g} s >= {} s'.format(elapsed, self.seconds)
+        else:
+            return None
+
+    def reset(self):
+        """Set `iter` to 0 and clear `stop_reason` and the clock."""
+        super(MonitorTime, self).reset()
+        self.__start = None
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({})'.format(self.__class__.__name__,
+                               signature_string([self.seconds], []))
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -352,7 +352,7 @@ class TensorSpace(LinearSpace):
         >>> False in spc
         False
         """
-        return getattr(other, 'space', None) == self
+        return super(TensorSpace, self).__contains__(other)
 
     def __eq__(self, other):
         """Return ``self == other``.
@@ -13,7 +13,9 @@ from future.utils import native
 from builtins import object
 import ctypes
 from functools import partial
+from multiprocessing.pool import ThreadPool
 import numpy as np
+import threading
 
 from odl.set.sets import RealNumbers, ComplexNumbers
 from odl.set.space import LinearSpaceTypeError
@@ -36,6 +38,31 @@ _BLAS_DTYPES = (np.dtype('float32'), np.dtype('float64'),
 THRESHOLD_SMALL = 100
 THRESHOLD_MEDIUM = 50000
 
+# Number of entries of the blocks processed by the chunked BLAS engine,
+# used for large or non-contiguous arrays, and number of threads among
+# which the blocks are distributed. With more than one thread, all large
+# arithmetic operations, ufuncs and reductions are split into blocks.
+# The blocks do not depend on the number of threads, hence neither do
+# the results.
+CHUNK_SIZE = 2 ** 16
+CHUNK_NUM_THREADS = 1
+
+# Inner products, norms and distances of half precision arrays are
+# accumulated in double precision. With `ACCUMULATE_DOUBLE`, this also
+# applies to single precision arrays, such that they can be used as
+# compact storage without losing accuracy in the reductions.
+ACCUMULATE_DOUBLE = False
+_HALF_DTYPES = (np.dtype('float16'),)
+_SINGLE_DTYPES = (np.dtype('float32'), np.dtype('complex64'))
+
+# Ufuncs whose reductions can be evaluated block by block
+_REORDERABLE_UFUNCS = (np.add, np.multiply, np.maximum, np.minimum,
+                       np.fmax, np.fmin, np.logical_and, np.logical_or)
+
+# Thread pools of the chunked BLAS engine, created on first use
+_THREAD_POOLS = {}
+_THREAD_POOLS_LOCK = threading.Lock()
+
 
 class NumpyTensorSpace(TensorSpace):
 
@@ -688,7 +715,8 @@ class NumpyTensorSpace(TensorSpace):
         >>> result is out
         True
         """
-        np.multiply(x1.data, x2.data, out=out.data)
+        if not _ufunc_chunked(np.multiply, (x1.data, x2.data), out.data):
+            np.multiply(x1.data, x2.data, out=out.data)
 
     def _divide(self, x1, x2, out):
         """Compute the entry-wise quotient ``x1 / x2``.
@@ -717,7 +745,8 @@ class NumpyTensorSpace(TensorSpace):
         >>> result is out
         True
         """
-        np.divide(x1.data, x2.data, out=out.data)
+        if not _ufunc_chunked(np.divide, (x1.data, x2.data), out.data):
+            np.divide(x1.data, x2.data, out=out.data)
 
     def __eq__(self, other):
         """Return ``self == other``.
@@ -1679,10 +1708,16 @@ numpy.ufunc.reduceat.html
                 else:
                     out_ctx = writable_array(out, **array_kwargs)
 
-                # Evaluate ufunc
+                # Evaluate ufunc, in threads for large arrays if enabled
                 with out_ctx as out_arr:
-                    kwargs['out'] = out_arr
-                    res = ufunc(*inputs, **kwargs)
+                    if out_arr is None:
+                        out_arr = _ufunc_out_array(ufunc, inputs, kwargs)
+                    if (out_arr is not None and
+                            _ufunc_chunked(ufunc, inputs, out_arr, **kwargs)):
+                        res = out_arr
+                    else:
+                        kwargs['out'] = out_arr
+                        res = ufunc(*inputs, **kwargs)
 
                 # Wrap result if necessary (lazily)
                 if out is None:
@@ -1737,12 +1772,19 @@ numpy.ufunc.reduceat.html
             else:
                 out_ctx = writable_array(out, **array_kwargs)
 
-            # Evaluate ufunc method
-            with out_ctx as out_arr:
-                if method != 'at':
-                    # No kwargs allowed for 'at'
-                    kwargs['out'] = out_arr
-                res = getattr(ufunc, method)(*inputs, **kwargs)
+            # Evaluate ufunc method, full reductions in threads for large
+            # arrays if enabled
+            if method == 'reduce' and out is None:
+                res = _reduce_chunked(ufunc, inputs, kwargs)
+            else:
+                res = None
+
+            if res is None:
+                with out_ctx as out_arr:
+                    if method != 'at':
+                        # No kwargs allowed for 'at'
+                        kwargs['out'] = out_arr
+                    res = getattr(ufunc, method)(*inputs, **kwargs)
 
             # Shortcut for scalar or no return value
             if np.isscalar(res) or res is None:
@@ -1776,6 +1818,9 @@ def _blas_is_applicable(*args):
     BLAS methods are usually slower, and array-writing routines do
     not work at all. Hence, only contiguous arrays are allowed.
 
+    Arrays that fail this test only due to their size or their memory
+    layout can still be processed with `_chunked_blas_is_applicable`.
+
     Parameters
     ----------
     x1,...,xN : `NumpyTensor`
@@ -1786,21 +1831,235 @@ def _blas_is_applicable(*args):
     blas_is_applicable : bool
         ``True`` if all mentioned requirements are met, ``False`` otherwise.
     """
-    if any(x.dtype != args[0].dtype for x in args[1:]):
-        return False
-    elif any(x.dtype not in _BLAS_DTYPES for x in args):
+    if not _chunked_blas_is_applicable(*args):
         return False
     elif not (all(x.flags.f_contiguous for x in args) or
               all(x.flags.c_contiguous for x in args)):
         return False
     elif any(x.size > np.iinfo('int32').max for x in args):
-        # Temporary fix for 32 bit int overflow in BLAS
-        # TODO: use chunking instead
+        # BLAS uses 32 bit integers for sizes, use chunks instead
         return False
     else:
         return True
 
 
+def _chunked_blas_is_applicable(*args):
+    """Whether BLAS routines can be applied to blocks of the arrays.
+
+    The chunked engine processes arrays block by block, where each
+    block is small and contiguous, hence only the data type matters.
+
+    Parameters
+    ----------
+    x1,...,xN : `NumpyTensor`
+        The tensors to be tested for BLAS conformity.
+
+    Returns
+    -------
+    blas_is_applicable : bool
+        ``True`` if all arrays have the same BLAS data type.
+    """
+    if any(x.dtype != args[0].dtype for x in args[1:]):
+        return False
+    elif any(x.dtype not in _BLAS_DTYPES for x in args):
+        return False
+    else:
+        return True
+
+
+def _chunk_indices(shape, chunk_size):
+    """Return indices of blocks of about ``chunk_size`` entries.
+
+    The blocks are taken in C order, i.e., indexing a C-contiguous array
+    with any of the returned indices results in a contiguous block.
+
+    Parameters
+    ----------
+    shape : sequence of int
+        Shape of the arrays to be split into blocks.
+    chunk_size : positive int
+        Number of entries per block. It is exceeded only if a single
+        entry along the slowest varying split axis has more entries.
+
+    Returns
+    -------
+    indices : list of tuple
+        Indices of the blocks, which cover the array without overlap.
+
+    Examples
+    --------
+    >>> _chunk_indices((4, 3), 6)
+    [(slice(0, 2, None),), (slice(2, 4, None),)]
+    >>> _chunk_indices((1, 5), 3)
+    [(0, slice(0, 3, None)), (0, slice(3, 6, None))]
+    """
+    shape = tuple(int(n) for n in shape)
+
+    # Find the axis from which on the trailing part fits into a chunk
+    axis = len(shape)
+    block_size = 1
+    while axis > 0 and block_size * shape[axis - 1] <= chunk_size:
+        axis -= 1
+        block_size *= shape[axis]
+
+    if axis == 0:
+        return [()]
+
+    step = max(chunk_size // block_size, 1)
+    return [idx + (slice(start, start + step),)
+            for idx in np.ndindex(*shape[:axis - 1])
+            for start in range(0, shape[axis - 1], step)]
+
+
+def _chunk_arrays(*arrays):
+    """Return views of ``arrays`` that are split in C order.
+
+    If all arrays are Fortran-contiguous, their transposes are returned,
+    such that the blocks of `_chunk_indices` are contiguous.
+    """
+    if (all(arr.flags.f_contiguous for arr in arrays) and
+            not all(arr.flags.c_contiguous for arr in arrays)):
+        return [arr.T for arr in arrays]
+    else:
+        return list(arrays)
+
+
+def _run_chunked(func, indices):
+    """Return ``[func(index) for index in indices]``, possibly threaded.
+
+    The blocks are distributed among `CHUNK_NUM_THREADS` threads.
+    """
+    num_threads = min(int(CHUNK_NUM_THREADS), len(indices))
+    if num_threads <= 1:
+        return [func(index) for index in indices]
+
+    with _THREAD_POOLS_LOCK:
+        pool = _THREAD_POOLS.get(num_threads, None)
+        if pool is None:
+            pool = _THREAD_POOLS[num_threads] = ThreadPool(num_threads)
+    return pool.map(func, indices)
+
+
+def _use_threads(*arrays):
+    """Whether elementwise operations on ``arrays`` should be threaded.
+
+    This requires more than one thread in `CHUNK_NUM_THREADS` and large
+    arrays of equal shape.
+    """
+    return (CHUNK_NUM_THREADS > 1 and
+            arrays[0].size >= THRESHOLD_MEDIUM and
+            all(arr.shape == arrays[0].shape for arr in arrays[1:]))
+
+
+def _map_chunked(func, *arrays):
+    """Return ``func`` evaluated on all blocks of ``arrays``.
+
+    The blocks are given to ``func`` as positional arguments, in the
+    same order as ``arrays``.
+    """
+    arrays = _chunk_arrays(*arrays)
+
+    def func_chunk(index):
+        """Evaluate ``func`` on one block."""
+        return func(*[arr[index] for arr in arrays])
+
+    return _run_chunked(func_chunk,
+                        _chunk_indices(arrays[0].shape, CHUNK_SIZE))
+
+
+def _ufunc_inputs_chunkable(ufunc, inputs, kwargs):
+    """Whether ``ufunc(*inputs, **kwargs)`` can be split into blocks.
+
+    This is the case for elementwise ufuncs whose inputs are arrays of
+    equal shape or scalars, without a ``where`` argument.
+    """
+    return (ufunc.signature is None and
+            'where' not in kwargs and
+            all(isinstance(inp, np.ndarray) or np.isscalar(inp)
+                for inp in inputs) and
+            any(np.ndim(inp) > 0 for inp in inputs) and
+            _use_threads(*[inp for inp in inputs if np.ndim(inp) > 0]))
+
+
+def _ufunc_out_array(ufunc, inputs, kwargs):
+    """Return an output array for ``ufunc``, or ``None``.
+
+    The array is only created if `_ufunc_chunked` can be used; its
+    data type is determined by evaluating ``ufunc`` on empty arrays.
+    """
+    if not _ufunc_inputs_chunkable(ufunc, inputs, kwargs):
+        return None
+
+    empty_inputs = [inp[(slice(0, 0),) * inp.ndim] if np.ndim(inp) > 0
+                    else inp
+                    for inp in inputs]
+    dtype = ufunc(*empty_inputs, **kwargs).dtype
+    shape = next(inp.shape for inp in inputs if np.ndim(inp) > 0)
+    return np.empty(shape, dtype=dtype)
+
+
+def _ufunc_chunked(ufunc, inputs, out, **kwargs):
+    """Evaluate ``ufunc(*inputs, out=out)`` block by block in threads.
+
+    Returns
+    -------
+    evaluated : bool
+        ``False`` if the evaluation is not possible or not worthwhile,
+        see `_use_threads`, in which case nothing is done.
+        Inputs that overlap partially with ``out`` are not supported.
+    """
+    if not (_ufunc_inputs_chunkable(ufunc, inputs, kwargs) and
+            _use_threads(out, *[inp for inp in inputs
+                                if np.ndim(inp) > 0])):
+        return False
+
+    arrays = [inp for inp in inputs if np.ndim(inp) > 0]
+    out_ptr = out.__array_interface__['data'][0]
+    for arr in arrays:
+        if (np.may_share_memory(arr, out) and
+                (arr.__array_interface__['data'][0] != out_ptr or
+                 arr.strides != out.strides)):
+            return False
+
+    is_array = [np.ndim(inp) > 0 for inp in inputs]
+
+    def ufunc_chunk(out_block, *blocks):
+        """Evaluate the ufunc in one block."""
+        blocks = iter(blocks)
+        args = [next(blocks) if arr else inp
+                for inp, arr in zip(inputs, is_array)]
+        ufunc(*args, out=out_block, **kwargs)
+
+    _map_chunked(ufunc_chunk, out, *arrays)
+    return True
+
+
+def _reduce_chunked(ufunc, inputs, kwargs):
+    """Return ``ufunc.reduce(*inputs, **kwargs)`` evaluated in threads.
+
+    Only reductions over all axes without ``out`` are supported. If not
+    applicable, ``None`` is returned.
+    """
+    if (ufunc not in _REORDERABLE_UFUNCS or
+            len(inputs) != 1 or
+            not isinstance(inputs[0], np.ndarray) or
+            any(key not in ('axis', 'dtype', 'keepdims') for key in kwargs) or
+            kwargs.get('keepdims', False)):
+        return None
+
+    arr = inputs[0]
+    axis = kwargs.get('axis', 0)
+    if axis is not None and not (arr.ndim == 1 and axis in (0, -1, (0,))):
+        return None
+    elif arr.ndim == 0 or not _use_threads(arr):
+        return None
+
+    dtype = kwargs.get('dtype', None)
+    partials = _map_chunked(
+        lambda block: ufunc.reduce(block, axis=None, dtype=dtype), arr)
+    return ufunc.reduce(np.array(partials), dtype=dtype)
+
+
 def _lincomb_impl(a, x1, b, x2, out):
     """Optimized implementation of ``out[:] = a * x1 + b * x2``."""
     # Lazy import to improve `import odl` time
@@ -1813,8 +2072,13 @@ def _lincomb_impl(a, x1, b, x2, out):
         out.data[:] = a * x1.data + b * x2.data
         return
 
+    elif x1 is x2 and b != 0:
+        # x1 is aligned with x2 -> out = (a+b)*x1
+        _lincomb_impl(a + b, x1, 0, x1, out)
+        return
+
     elif (size < THRESHOLD_MEDIUM or
-          not _blas_is_applicable(x1.data, x2.data, out.data)):
+          not _chunked_blas_is_applicable(x1.data, x2.data, out.data)):
 
         def fallback_axpy(x1, x2, n, a):
             """Fallback axpy implementation avoiding copy."""
@@ -1834,11 +2098,16 @@ def _lincomb_impl(a, x1, b, x2, out):
             x2[...] = x1[...]
             return x2
 
-        axpy, scal, copy = (fallback_axpy, fallback_scal, fallback_copy)
+        funcs = (fallback_axpy, fallback_scal, fallback_copy)
         x1_arr = x1.data
         x2_arr = x2.data
         out_arr = out.data
 
+    elif _use_chunks(x1.data, x2.data, out.data):
+        # Too large for a single BLAS call, non-contiguous or threaded
+        _lincomb_chunked(a, x1, b, x2, out)
+        return
+
     else:
         # Need flat data for BLAS, otherwise in-place does not work.
         # Raveling must happen in fixed order for non-contiguous out,
@@ -1852,25 +2121,35 @@ def _lincomb_impl(a, x1, b, x2, out):
         x1_arr = x1.data.ravel(order=ravel_order)
         x2_arr = x2.data.ravel(order=ravel_order)
         out_arr = out.data.ravel(order=ravel_order)
-        axpy, scal, copy = scipy.linalg.blas.get_blas_funcs(
+        funcs = scipy.linalg.blas.get_blas_funcs(
             ['axpy', 'scal', 'copy'], arrays=(x1_arr, x2_arr, out_arr))
 
-    if x1 is x2 and b != 0:
-        # x1 is aligned with x2 -> out = (a+b)*x1
-        _lincomb_impl(a + b, x1, 0, x1, out)
-    elif out is x1 and out is x2:
+    _lincomb_arrays(a, x1_arr, b, x2_arr, out_arr, size,
+                    out is x1, out is x2, funcs)
+
+
+def _lincomb_arrays(a, x1_arr, b, x2_arr, out_arr, size,
+                    out_is_x1, out_is_x2, funcs):
+    """Compute ``out_arr = a * x1_arr + b * x2_arr`` with given functions.
+
+    ``funcs`` are the ``axpy``, ``scal`` and ``copy`` functions with BLAS
+    signature, which modify their last array argument in place.
+    """
+    axpy, scal, copy = funcs
+
+    if out_is_x1 and out_is_x2:
         # All the vectors are aligned -> out = (a+b)*out
         if (a + b) != 0:
             scal(a + b, out_arr, size)
         else:
             out_arr[:] = 0
-    elif out is x1:
+    elif out_is_x1:
         # out is aligned with x1 -> out = a*out + b*x2
         if a != 1:
             scal(a, out_arr, size)
         if b != 0:
             axpy(x2_arr, out_arr, size, b)
-    elif out is x2:
+    elif out_is_x2:
         # out is aligned with x2 -> out = a*x1 + b*out
         if b != 1:
             scal(b, out_arr, size)
@@ -1903,6 +2182,35 @@ def _lincomb_impl(a, x1, b, x2, out):
                 axpy(x1_arr, out_arr, size, a)
 
 
+def _lincomb_chunked(a, x1, b, x2, out):
+    """Compute ``out[:] = a * x1 + b * x2`` with BLAS, block by block.
+
+    Blocks of non-contiguous arrays are copied to contiguous buffers, and
+    the result is written back to ``out``.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.linalg
+
+    x1_arr, x2_arr, out_arr = _chunk_arrays(x1.data, x2.data, out.data)
+    funcs = scipy.linalg.blas.get_blas_funcs(
+        ['axpy', 'scal', 'copy'], dtype=out.dtype)
+    out_is_x1, out_is_x2 = out is x1, out is x2
+
+    def lincomb_chunk(index):
+        """Evaluate the linear combination in one block."""
+        out_block = out_arr[index]
+        # Contiguous blocks are raveled to views and updated in place
+        out_flat = out_block.ravel()
+        x1_flat = out_flat if out_is_x1 else x1_arr[index].ravel()
+        x2_flat = out_flat if out_is_x2 else x2_arr[index].ravel()
+        _lincomb_arrays(a, x1_flat, b, x2_flat, out_flat, out_flat.size,
+                        out_is_x1, out_is_x2, funcs)
+        if not out_block.flags.c_contiguous:
+            out_block[...] = out_flat.reshape(out_block.shape)
+
+    _run_chunked(lincomb_chunk, _chunk_indices(out_arr.shape, CHUNK_SIZE))
+
+
 def _weighting(weights, exponent):
     """Return a weighting whose type is inferred from the arguments."""
     if np.isscalar(weights):
@@ -1996,7 +2304,9 @@ def _norm_default(x):
     # Lazy import to improve `import odl` time
     import scipy.linalg
 
-    if _blas_is_applicable(x.data):
+    if _use_chunks(x.data) or _accumulate_double(x.data):
+        return _norm_chunked(x.data)
+    elif _blas_is_applicable(x.data):
         nrm2 = scipy.linalg.blas.get_blas_funcs('nrm2', dtype=x.dtype)
         norm = partial(nrm2, n=native(x.size))
     else:
@@ -2006,11 +2316,25 @@ def _norm_default(x):
 
 def _pnorm_default(x, p):
     """Default p-norm implementation."""
+    if _use_threads(x.data) or _accumulate_double(x.data):
+        return _pnorm_chunked(x.data, p)
     return np.linalg.norm(x.data.ravel(), ord=p)
 
 
+def _pdist_default(x1, x2, p):
+    """Default p-distance implementation."""
+    if _accumulate_double(x1.data, x2.data):
+        # Take the difference with the accumulation data type
+        return _pnorm_chunked(x1.data, p, other=x2.data)
+    else:
+        return _pnorm_default(x1 - x2, p)
+
+
 def _pnorm_diagweight(x, p, w):
     """Diagonally weighted p-norm implementation."""
+    if _use_threads(x.data, w) or _accumulate_double(x.data):
+        return _pnorm_chunked(x.data, p, w)
+
     # Ravel both in the same order (w is a numpy array)
     order = 'F' if all(a.flags.f_contiguous for a in (x.data, w)) else 'C'
 
@@ -2028,6 +2352,9 @@ def _pnorm_diagweight(x, p, w):
 
 def _inner_default(x1, x2):
     """Default Euclidean inner product implementation."""
+    if _use_chunks(x1.data, x2.data) or _accumulate_double(x1.data, x2.data):
+        return _inner_chunked(x1.data, x2.data)
+
     # Ravel both in the same order
     order = 'F' if all(a.data.flags.f_contiguous for a in (x1, x2)) else 'C'
 
@@ -2045,6 +2372,155 @@ def _inner_default(x1, x2):
                        x1.data.ravel(order))
 
 
+def _dist_default(x1, x2):
+    """Default Euclidean distance implementation."""
+    if ((x1.size >= THRESHOLD_MEDIUM and
+         _chunked_blas_is_applicable(x1.data, x2.data)) or
+            _accumulate_double(x1.data, x2.data)):
+        # Avoids the temporary array for the difference
+        return _dist_chunked(x1.data, x2.data)
+    else:
+        return _norm_default(x1 - x2)
+
+
+def _use_chunks(*arrays):
+    """Whether BLAS operations on ``arrays`` should be done block by block.
+
+    This is the case for large arrays that are either non-contiguous,
+    too large for a single BLAS call, or if threads are enabled.
+    """
+    return (arrays[0].size >= THRESHOLD_MEDIUM and
+            _chunked_blas_is_applicable(*arrays) and
+            (CHUNK_NUM_THREADS > 1 or not _blas_is_applicable(*arrays)))
+
+
+def _accumulation_dtype(*arrays):
+    """Return the data type in which reductions over ``arrays`` accumulate.
+
+    Half precision is always accumulated in double precision, single
+    precision only if `ACCUMULATE_DOUBLE` is ``True``.
+    """
+    dtypes = []
+    for arr in arrays:
+        if (arr.dtype in _HALF_DTYPES or
+                (ACCUMULATE_DOUBLE and arr.dtype in _SINGLE_DTYPES)):
+            dtypes.append(np.promote_types(arr.dtype, 'float64'))
+        else:
+            dtypes.append(arr.dtype)
+    return np.result_type(*dtypes)
+
+
+def _accumulate_double(*arrays):
+    """Whether reductions over ``arrays`` need a larger data type."""
+    acc_dtype = _accumulation_dtype(*arrays)
+    return any(arr.dtype != acc_dtype for arr in arrays)
+
+
+def _flat_block(block, dtype):
+    """Return ``block`` raveled to contiguous data of type ``dtype``.
+
+    A copy is only made if necessary.
+    """
+    return np.asarray(block, dtype=dtype, order='C').ravel()
+
+
+def _norm_chunked(arr):
+    """Euclidean norm of ``arr``, computed with BLAS block by block."""
+    # Lazy import to improve `import odl` time
+    import scipy.linalg
+
+    dtype = _accumulation_dtype(arr)
+    nrm2 = scipy.linalg.blas.get_blas_funcs('nrm2', dtype=dtype)
+
+    def norm_chunk(block):
+        """Return the norm of one block."""
+        return nrm2(_flat_block(block, dtype))
+
+    return np.linalg.norm(_map_chunked(norm_chunk, arr))
+
+
+def _dist_chunked(arr1, arr2):
+    """Euclidean distance of ``arr1`` and ``arr2``, block by block."""
+    # Lazy import to improve `import odl` time
+    import scipy.linalg
+
+    dtype = _accumulation_dtype(arr1, arr2)
+    nrm2 = scipy.linalg.blas.get_blas_funcs('nrm2', dtype=dtype)
+
+    def dist_chunk(block1, block2):
+        """Return the distance in one block."""
+        diff = np.subtract(block1, block2, dtype=dtype)
+        return nrm2(diff.ravel())
+
+    return np.linalg.norm(_map_chunked(dist_chunk, arr1, arr2))
+
+
+def _inner_chunked(arr1, arr2, weights=None):
+    """Euclidean inner product of ``arr1`` and ``arr2``, block by block.
+
+    If given, ``weights`` is an array of the same shape that is applied
+    to ``arr1`` in each block.
+    """
+    dtype = _accumulation_dtype(arr1, arr2)
+    if is_real_dtype(dtype):
+        dot = np.dot
+    else:
+        # x2 as first argument because we want linearity in x1
+        def dot(x1, x2):
+            return np.vdot(x2, x1)
+
+    def inner_chunk(block1, block2, weights_block=None):
+        """Return the inner product in one block."""
+        block1 = _flat_block(block1, dtype)
+        if weights_block is not None:
+            block1 = block1 * weights_block.ravel()
+        return dot(block1, _flat_block(block2, dtype))
+
+    if weights is None:
+        inners = _map_chunked(inner_chunk, arr1, arr2)
+    else:
+        inners = _map_chunked(inner_chunk, arr1, arr2, weights)
+    return np.sum(inners)
+
+
+def _pnorm_chunked(arr, p, weights=None, other=None):
+    """p-norm of ``arr`` with optional ``weights``, block by block.
+
+    If ``other`` is given, the p-distance of ``arr`` and ``other`` is
+    computed instead, with the difference taken in each block.
+    """
+    if other is None:
+        dtype = _accumulation_dtype(arr)
+    else:
+        dtype = _accumulation_dtype(arr, other)
+
+    def pnorm_chunk(block, weights_block=None, other_block=None):
+        """Return the maximum or the p-th power sum in one block."""
+        if other_block is None:
+            block = np.abs(np.asarray(block, dtype=dtype))
+        else:
+            block = np.abs(np.subtract(block, other_block, dtype=dtype))
+        if p != float('inf'):
+            block = np.power(block, p)
+        if weights_block is not None:
+            block = block * weights_block
+        return np.max(block) if p == float('inf') else np.sum(block)
+
+    if other is not None:
+        partials = _map_chunked(
+            lambda block, other_block: pnorm_chunk(block, None, other_block),
+            arr, other)
+    elif weights is None:
+        partials = _map_chunked(pnorm_chunk, arr)
+    else:
+        partials = _map_chunked(pnorm_chunk, arr, weights)
+
+    if p == float('inf'):
+        return np.max(partials)
+    else:
+        return np.sum(partials) ** (1 / p)
+
+
 # TODO: implement intermediate weighting schemes with arrays that are
 # broadcast, i.e. between scalar and full-blown in dimensionality?
 
@@ -2145,7 +2621,10 @@ class NumpyTensorSpaceArrayWeighting(ArrayWeighting):
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
         else:
-            inner = _inner_default(x1 * self.array, x2)
+            if _use_threads(x1.data, x2.data, self.array):
+                inner = _inner_chunked(x1.data, x2.data, self.array)
+            else:
+                inner = _inner_default(x1 * self.array, x2)
             if is_real_dtype(x1.dtype):
                 return float(inner)
             else:
@@ -2292,12 +2771,12 @@ class NumpyTensorSpaceConstWeighting(ConstWeighting):
             The distance between the tensors.
         """
         if self.exponent == 2.0:
-            return float(np.sqrt(self.const) * _norm_default(x1 - x2))
+            return float(np.sqrt(self.const) * _dist_default(x1, x2))
         elif self.exponent == float('inf'):
-            return float(self.const * _pnorm_default(x1 - x2, self.exponent))
+            return float(self.const * _pdist_default(x1, x2, self.exponent))
         else:
             return float((self.const ** (1 / self.exponent) *
-                          _pnorm_default(x1 - x2, self.exponent)))
+                          _pdist_default(x1, x2, self.exponent)))
 
 
 class NumpyTensorSpaceCustomInner(CustomInner):
@@ -15,6 +15,7 @@ import numpy as np
 
 from odl.set import LinearSpace
 from odl.set.space import LinearSpaceElement
+from odl.space.npy_tensors import NumpyTensorSpace
 from odl.space.weighting import (
     Weighting, ArrayWeighting, ConstWeighting,
     CustomInner, CustomNorm, CustomDist)
@@ -78,6 +79,16 @@ class ProductSpace(LinearSpace):
 
             float : same weighting factor in each component
 
+        contiguous : bool, optional
+            If ``True``, store the parts of each element as views into
+            a single contiguous array of shape ``(n,) + space.shape``.
+            Arithmetic operations, inner products and norms then act on
+            the whole array at once instead of looping over the parts,
+            and `ProductSpaceElement.asarray` does not copy.
+            This option requires a power space of a space with
+            ``impl='numpy'``, e.g., `rn` or `uniform_discr`.
+            Default: ``False``
+
         Other Parameters
         ----------------
         dist : callable, optional
@@ -133,6 +144,13 @@ class ProductSpace(LinearSpace):
 
         >>> r2x2x2 = ProductSpace(odl.rn(2), 3)
 
+        Powerspace with contiguous storage of the elements
+
+        >>> r2x2x2 = ProductSpace(odl.rn(2), 3, contiguous=True)
+        >>> x = r2x2x2.one()
+        >>> x.asarray().flags.c_contiguous
+        True
+
         Notes
         -----
         Inner product, norm and distance are evaluated by collecting
@@ -198,6 +216,7 @@ class ProductSpace(LinearSpace):
         inner = kwargs.pop('inner', None)
         weighting = kwargs.pop('weighting', None)
         exponent = float(kwargs.pop('exponent', 2.0))
+        contiguous = bool(kwargs.pop('contiguous', False))
         if kwargs:
             raise TypeError('got unexpected keyword arguments: {}'
                             ''.format(kwargs))
@@ -273,6 +292,31 @@ class ProductSpace(LinearSpace):
         else:  # all None -> no weighing
             self.__weighting = ProductSpaceConstWeighting(1.0, exponent)
 
+        # Space of the arrays backing the elements in the contiguous case
+        if contiguous:
+            if (len(self) == 0 or not self.is_power_space or
+                    getattr(self.spaces[0], 'impl', None) != 'numpy'):
+                raise ValueError('`contiguous=True` requires a power space '
+                                 "of a space with `impl='numpy'`, got {!r}"
+                                 ''.format(self))
+            base_weighting = self.spaces[0].weighting
+            if (isinstance(self.weighting, ProductSpaceConstWeighting) and
+                    self.weighting.exponent == 2.0 and
+                    getattr(base_weighting, 'const', None) is not None and
+                    base_weighting.exponent == 2.0):
+                # Inner products and norms can be evaluated on the
+                # whole array with the product of the weighting constants
+                block_weighting = self.weighting.const * base_weighting.const
+            else:
+                block_weighting = None
+            self.__block_space = NumpyTensorSpace(
+                (len(self),) + self.spaces[0].shape, self.spaces[0].dtype,
+                weighting=block_weighting)
+            self.__block_inner = (block_weighting is not None)
+        else:
+            self.__block_space = None
+            self.__block_inner = False
+
     def __len__(self):
         """Return ``len(self)``.
 
@@ -345,6 +389,11 @@ class ProductSpace(LinearSpace):
         """``True`` if all member spaces are equal."""
         return self.__is_power_space
 
+    @property
+    def is_contiguous(self):
+        """``True`` if elements are stored in a single contiguous array."""
+        return self.__block_space is not None
+
     @property
     def exponent(self):
         """Exponent of the product space norm/dist, ``None`` for custom."""
@@ -384,12 +433,14 @@ class ProductSpace(LinearSpace):
     @property
     def real_space(self):
         """Variant of this space with real dtype."""
-        return ProductSpace(*[space.real_space for space in self.spaces])
+        return ProductSpace(*[space.real_space for space in self.spaces],
+                            contiguous=self.is_contiguous)
 
     @property
     def complex_space(self):
         """Variant of this space with complex dtype."""
-        return ProductSpace(*[space.complex_space for space in self.spaces])
+        return ProductSpace(*[space.complex_space for space in self.spaces],
+                            contiguous=self.is_contiguous)
 
     def astype(self, dtype):
         """Return a copy of this space with new ``dtype``.
@@ -418,7 +469,8 @@ class ProductSpace(LinearSpace):
             return self
         else:
             return ProductSpace(*[space.astype(dtype)
-                                  for space in self.spaces])
+                                  for space in self.spaces],
+                                contiguous=self.is_contiguous)
 
     def element(self, inp=None, cast=True):
         """Create an element in the product space.
@@ -466,6 +518,9 @@ class ProductSpace(LinearSpace):
             [ 1.,  2.,  3.]
         ])
         """
+        if self.is_contiguous:
+            return self._contiguous_element(inp, cast)
+
         # If data is given as keyword arg, prefer it over arg list
         if inp is None:
             inp = [space.element() for space in self.spaces]
@@ -490,6 +545,59 @@ class ProductSpace(LinearSpace):
 
         return self.element_type(self, parts)
 
+    def _contiguous_element(self, inp, cast):
+        """Create an element backed by a contiguous array.
+
+        Arrays of the right shape and data type are wrapped without
+        copying, other input is copied into a new array.
+        """
+        block_space = self.__block_space
+        if inp is None:
+            return self._element_from_block(
+                np.empty(block_space.shape, dtype=block_space.dtype))
+
+        if inp in self and inp.space.is_contiguous:
+            return inp
+
+        if (cast and isinstance(inp, np.ndarray) and
+                inp.shape == block_space.shape and
+                inp.dtype == block_space.dtype):
+            return self._element_from_block(inp)
+
+        if len(inp) != len(self):
+            raise ValueError('length of `inp` {} does not match length of '
+                             'space {}'.format(len(inp), len(self)))
+
+        base = self.spaces[0]
+        is_elements = all(isinstance(v, LinearSpaceElement) and
+                          v.space == base for v in inp)
+        if not is_elements and not cast:
+            raise TypeError('input {!r} not a sequence of elements of the '
+                            'component spaces'.format(inp))
+
+        block = np.empty(block_space.shape, dtype=block_space.dtype)
+        for i, arg in enumerate(inp):
+            if not is_elements:
+                # Delegate constructors
+                arg = base.element(arg)
+            block[i] = arg.asarray()
+        return self._element_from_block(block)
+
+    def _element_from_block(self, block):
+        """Wrap ``block`` in an element, the parts are views into it."""
+        parts = [self.spaces[0].element(block_part) for block_part in block]
+        return self.element_type(self, parts, block=block)
+
+    def _blocks(self, *elements):
+        """Return the arrays backing ``elements`` as block space elements.
+
+        If not all elements are backed by a contiguous array, ``None`` is
+        returned.
+        """
+        if not all(x.space.is_contiguous for x in elements):
+            return None
+        return [self.__block_space.element(x.asarray()) for x in elements]
+
     @property
     def examples(self):
         """Return examples from all sub-spaces."""
@@ -524,6 +632,10 @@ class ProductSpace(LinearSpace):
         >>> zero_3 == zero_2x3[1]
         True
         """
+        if self.is_contiguous:
+            return self._element_from_block(
+                np.zeros(self.__block_space.shape,
+                         dtype=self.__block_space.dtype))
         return self.element([space.zero() for space in self.spaces])
 
     def one(self):
@@ -552,34 +664,63 @@ class ProductSpace(LinearSpace):
         >>> one_3 == one_2x3[1]
         True
         """
+        if self.is_contiguous:
+            return self._element_from_block(
+                np.ones(self.__block_space.shape,
+                        dtype=self.__block_space.dtype))
         return self.element([space.one() for space in self.spaces])
 
     def _lincomb(self, a, x, b, y, out):
         """Linear combination ``out = a*x + b*y``."""
+        blocks = self._blocks(x, y, out)
+        if blocks is not None:
+            self.__block_space._lincomb(a, blocks[0], b, blocks[1],
+                                        blocks[2])
+            return
+
         for space, xp, yp, outp in zip(self.spaces, x.parts, y.parts,
                                        out.parts):
             space._lincomb(a, xp, b, yp, outp)
 
     def _dist(self, x1, x2):
         """Distance between two elements."""
+        blocks = self._blocks(x1, x2) if self.__block_inner else None
+        if blocks is not None:
+            return self.__block_space._dist(*blocks)
         return self.weighting.dist(x1, x2)
 
     def _norm(self, x):
         """Norm of an element."""
+        blocks = self._blocks(x) if self.__block_inner else None
+        if blocks is not None:
+            return self.__block_space._norm(*blocks)
         return self.weighting.norm(x)
 
     def _inner(self, x1, x2):
         """Inner product of two elements."""
+        blocks = self._blocks(x1, x2) if self.__block_inner else None
+        if blocks is not None:
+            return self.field.element(self.__block_space._inner(*blocks))
         return self.weighting.inner(x1, x2)
 
     def _multiply(self, x1, x2, out):
         """Product ``out = x1 * x2``."""
+        blocks = self._blocks(x1, x2, out)
+        if blocks is not None:
+            self.__block_space._multiply(*blocks)
+            return
+
         for spc, xp, yp, outp in zip(self.spaces, x1.parts, x2.parts,
                                      out.parts):
             spc._multiply(xp, yp, outp)
 
     def _divide(self, x1, x2, out):
         """Quotient ``out = x1 / x2``."""
+        blocks = self._blocks(x1, x2, out)
+        if blocks is not None:
+            self.__block_space._divide(*blocks)
+            return
+
         for spc, xp, yp, outp in zip(self.spaces, x1.parts, x2.parts,
                                      out.parts):
             spc._divide(xp, yp, outp)
@@ -621,7 +762,19 @@ class ProductSpace(LinearSpace):
 
     def __hash__(self):
         """Return ``hash(self)``."""
-        return hash((type(self), self.spaces, self.weighting))
+        # Cached since nested product spaces are costly to hash
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash((type(self), self.spaces, self.weighting))
+            return self.__hash
+
+    def __getstate__(self):
+        """Return the state for pickling, without the cached hash."""
+        # Hashes of strings differ between processes
+        state = super(ProductSpace, self).__getstate__()
+        state.pop('_ProductSpace__hash', None)
+        return state
 
     def __getitem__(self, indices):
         """Return ``self[indices]``.
@@ -737,7 +890,7 @@ class ProductSpace(LinearSpace):
         elif self.is_power_space:
             posargs = [self.spaces[0], len(self)]
             posmod = '!r'
-            optargs = []
+            optargs = [('contiguous', self.is_contiguous, False)]
             oneline = True
         elif self.size <= 2 * edgeitems:
             posargs = self.spaces
@@ -778,10 +931,22 @@ class ProductSpaceElement(LinearSpaceElement):
 
     """Elements of a `ProductSpace`."""
 
-    def __init__(self, space, parts):
-        """Initialize a new instance."""
+    def __init__(self, space, parts, block=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `ProductSpace`
+            Space to which this element belongs.
+        parts : sequence of `LinearSpaceElement`'s
+            Components of this element.
+        block : `numpy.ndarray`, optional
+            Contiguous array holding the data of all ``parts``, which
+            must be views into it. Required for contiguous spaces.
+        """
         super(ProductSpaceElement, self).__init__(space)
         self.__parts = tuple(parts)
+        self.__block = block
 
     @property
     def parts(self):
@@ -988,6 +1153,9 @@ class ProductSpaceElement(LinearSpaceElement):
 
             self[ind].asarray() == self.asarray()[ind]
 
+        For elements of a contiguous space, the array backing the parts
+        is returned without copying, see `ProductSpace.is_contiguous`.
+
         Parameters
         ----------
         out : `numpy.ndarray`, optional
@@ -1012,6 +1180,12 @@ class ProductSpaceElement(LinearSpaceElement):
         if not self.space.is_power_space:
             raise ValueError('cannot use `asarray` if `space.is_power_space` '
                              'is `False`')
+        elif self.__block is not None:
+            if out is None:
+                return self.__block
+            else:
+                out[:] = self.__block
+                return out
         else:
             if out is None:
                 out = np.empty(self.shape, self.dtype)
@@ -13,9 +13,11 @@ import numpy as np
 import pytest
 
 import odl
-from odl.deform import LinDeformFixedTempl, LinDeformFixedDisp
+from odl.deform import (
+    LinDeformFixedTempl, LinDeformFixedDisp, DeformationPlan, linear_deform)
 from odl.space.entry_points import tensor_space_impl
-from odl.util.testutils import almost_equal, simple_fixture
+from odl.util.testutils import (
+    almost_equal, all_almost_equal, all_equal, noise_element, simple_fixture)
 
 
 # --- pytest fixtures --- #
@@ -153,6 +155,61 @@ def inv_deformed_template(x):
     return template_function(disp_x)
 
 
+# --- DeformationPlan --- #
+
+
+def test_deformation_plan(ndim, interp, monkeypatch):
+    """Check `DeformationPlan` against shifts and interpolation."""
+    space = odl.uniform_discr([-1] * ndim, [1] * ndim, [6, 5, 4][:ndim],
+                              interp=interp)
+    f, g = noise_element(space), noise_element(space)
+
+    # Displacement by one cell in each axis is a shift of the values
+    disp_field = space.tangent_bundle.element(
+        [np.full(space.shape, side) for side in space.cell_sides])
+    plan = DeformationPlan(disp_field)
+    f_shifted = plan([f])[0]
+    inner = tuple(slice(None, -1) for _ in range(ndim))
+    shifted = tuple(slice(1, None) for _ in range(ndim))
+    assert all_equal(f_shifted[inner], f.asarray()[shifted])
+
+    # Random displacement, partly pointing outside of the domain
+    disp_field = 0.5 * noise_element(space.tangent_bundle)
+    plan = DeformationPlan(disp_field)
+    f_deformed, g_deformed = plan([f, g])
+
+    if interp == 'linear':
+        points = space.points()
+        for i, vi in enumerate(disp_field):
+            points[:, i] += vi.asarray().ravel()
+        expected = f.interpolation(points.T, bounds_check=False)
+        assert all_almost_equal(f_deformed, expected.reshape(space.shape))
+
+    # Deforming several functions at once or in chunks does not change
+    # the result
+    assert all_equal(plan([g])[0], g_deformed)
+    monkeypatch.setattr(odl.deform.linearized, '_DEFORM_CHUNK_SIZE', 7)
+    plan = DeformationPlan(disp_field)
+    out = [space.element(), space.element()]
+    plan([f, g], out=[out[0].asarray(), out[1].asarray()])
+    assert all_almost_equal(out[0], f_deformed)
+    assert all_almost_equal(out[1], g_deformed)
+    assert all_equal(linear_deform(f, disp_field), f_deformed)
+
+    # Plans for slices along the first axis give the respective part
+    plan = DeformationPlan(disp_field, slc=slice(2, 5))
+    assert plan.shape == (3,) + space.shape[1:]
+    assert plan.nbytes < DeformationPlan(disp_field).nbytes
+    f_part, g_part = plan([f, g])
+    assert all_almost_equal(f_part, f_deformed[2:5])
+    assert all_almost_equal(g_part, g_deformed[2:5])
+
+    # Deformation with plans for parts of the grid
+    monkeypatch.setattr(odl.deform.linearized, '_PLAN_CHUNK_SIZE',
+                        space.size // 3)
+    assert all_almost_equal(linear_deform(f, disp_field), f_deformed)
+
+
 # --- LinDeformFixedTempl --- #
 
 
@@ -213,6 +270,23 @@ def test_fixed_templ_deriv(space):
     assert rlt_err < error_bound(space.interp)
 
 
+def test_fixed_templ_modified_template(monkeypatch):
+    """Check that the derivative follows in-place changes of the template."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (6, 5), interp='linear')
+    template = noise_element(space)
+    disp_field = 0.1 * noise_element(space.tangent_bundle)
+    vector_field = noise_element(space.tangent_bundle)
+    monkeypatch.setattr(odl.deform.linearized, '_PLAN_CHUNK_SIZE', 7)
+
+    op = LinDeformFixedTempl(template)
+    op.derivative(disp_field)
+    template *= 2
+    expected = LinDeformFixedTempl(template.copy())
+    assert all_almost_equal(op(disp_field), expected(disp_field))
+    assert all_almost_equal(op.derivative(disp_field)(vector_field),
+                            expected.derivative(disp_field)(vector_field))
+
+
 # --- LinDeformFixedDisp --- #
 
 
@@ -12,6 +12,7 @@ from __future__ import division
 import numpy as np
 
 import odl
+from odl.discr import discr_mappings
 from odl.discr.grid import sparse_meshgrid
 from odl.discr.discr_mappings import (
     PointCollocation, NearestInterpolation, LinearInterpolation,
@@ -315,6 +316,49 @@ def test_per_axis_interpolation():
     assert repr(interp_op) != ''
 
 
+def test_linear_interpolation_plan(monkeypatch):
+    """Check chunked evaluation and reuse of interpolation plans."""
+    # Lazy import since it is only needed here
+    import scipy.interpolate
+
+    space = odl.uniform_discr([0, -1, 0], [1, 1, 2], (6, 7, 8),
+                              interp='linear')
+    values = odl.phantom.white_noise(space).asarray()
+    interp_op = space.interpolation
+    points = np.array([np.random.uniform(xmin, xmax, size=50)
+                       for xmin, xmax in zip(space.grid.min_pt,
+                                             space.grid.max_pt)])
+    mesh = sparse_meshgrid([0.3, 0.4], [-0.5, 0.2, 0.7], [1.0, 1.5])
+
+    coords = space.grid.coord_vectors
+    true_arr = scipy.interpolate.interpn(coords, values, points.T)
+    true_mesh = scipy.interpolate.interpn(
+        coords, values,
+        np.stack(np.broadcast_arrays(*mesh), axis=-1))
+
+    # Small chunks to evaluate in several pieces
+    monkeypatch.setattr(discr_mappings, '_INTERP_CHUNK_SIZE', 7)
+    discr_mappings._PLAN_CACHE.clear()
+    function = interp_op(values)
+    assert all_almost_equal(function(points), true_arr)
+    assert all_almost_equal(function(mesh), true_mesh)
+    assert len(discr_mappings._PLAN_CACHE) == 2
+
+    # The plans are reused for different values in the same points
+    function_2 = interp_op(2 * values)
+    assert all_almost_equal(function_2(points.copy()), 2 * true_arr)
+    out = np.empty(true_mesh.shape, dtype=space.dtype)
+    function_2(mesh, out=out)
+    assert all_almost_equal(out, 2 * true_mesh)
+    assert len(discr_mappings._PLAN_CACHE) == 2
+
+    # Plans exceeding the size limit are not kept
+    monkeypatch.setitem(discr_mappings._PLAN_CACHE_LIMITS, 'max_bytes', 0)
+    discr_mappings._PLAN_CACHE.clear()
+    assert all_almost_equal(function(points), true_arr)
+    assert len(discr_mappings._PLAN_CACHE) == 0
+
+
 def test_collocation_interpolation_identity():
     """Check if collocation is left-inverse to interpolation."""
     # Interpolation followed by collocation on the same grid should be
@@ -436,6 +436,27 @@ def test_type_errors():
         op.adjoint(r4_elem1, r4_elem2)
 
 
+def test_call_trusted(dom_eq_ran):
+    """Check that `Operator._call_trusted` matches `Operator.__call__`."""
+    if dom_eq_ran:
+        mat = np.random.rand(3, 3)
+    else:
+        mat = np.random.rand(4, 3)
+
+    op = MatrixOperator(mat)
+    x = noise_element(op.domain)
+    out = op.range.element()
+
+    result = op._call_trusted(x)
+    assert result in op.range
+    assert all_almost_equal(result, op(x))
+    assert op._call_trusted(x, out=out) is out
+    assert all_almost_equal(out, op(x))
+
+    y = noise_element(op.range)
+    assert all_almost_equal(op.adjoint._call_trusted(y), op.adjoint(y))
+
+
 def test_arithmetic(dom_eq_ran):
     """Test that all standard arithmetic works."""
     if dom_eq_ran:
@@ -11,10 +11,12 @@ import numpy as np
 import pytest
 
 import odl
-from odl.operator.oputils import matrix_representation, power_method_opnorm
+from odl.operator.oputils import (
+    matrix_representation, power_method_opnorm, simplify_operator)
 from odl.space.pspace import ProductSpace
 from odl.operator.pspace_ops import ProductSpaceOperator
-from odl.util.testutils import almost_equal
+from odl.util.testutils import (
+    all_almost_equal, almost_equal, noise_element)
 
 
 def test_matrix_representation():
@@ -212,5 +214,64 @@ def test_power_method_opnorm_exceptions():
         power_method_opnorm(op, maxiter=1, xstart=op.domain.one())
 
 
+def test_simplify_operator():
+    """Check that simplified operators are equivalent and simpler."""
+    space = odl.uniform_discr(0, 1, 5)
+    ident = odl.IdentityOperator(space)
+    scal = odl.ScalingOperator(space, 2.0)
+    a = noise_element(space)
+    b = noise_element(space)
+    mult_a = odl.MultiplyOperator(a)
+    mult_b = odl.MultiplyOperator(b)
+    grad = odl.Gradient(space)
+    nonlin = odl.PowerOperator(space, 2)
+    x = noise_element(space)
+
+    # (operator, expected type of the simplified operator)
+    ops_and_types = [
+        (ident * ident, odl.IdentityOperator),
+        (3 * ident * 2, odl.ScalingOperator),
+        (0.5 * scal, odl.IdentityOperator),
+        (scal * ident * scal, odl.ScalingOperator),
+        (mult_a * mult_b * scal, odl.MultiplyOperator),
+        (mult_a * (2 * mult_b), odl.MultiplyOperator),
+        (mult_a + mult_b + scal, odl.MultiplyOperator),
+        (a * (ident * b), odl.MultiplyOperator),
+        (scal - scal, odl.ZeroOperator),
+        (grad * mult_a * mult_b, odl.OperatorComp),
+        (2 * (grad * 3), odl.OperatorLeftScalarMult),
+        (2 * grad + 3 * grad, odl.OperatorLeftScalarMult),
+        (grad * odl.ZeroOperator(space), odl.ZeroOperator),
+        (nonlin * ident * 2, odl.OperatorRightScalarMult),
+        (scal * nonlin * scal, odl.OperatorLeftScalarMult),
+        (odl.ZeroOperator(space) + nonlin, odl.PowerOperator),
+    ]
+
+    for op, expected_type in ops_and_types:
+        simple_op = simplify_operator(op)
+        assert type(simple_op) is expected_type
+        assert simple_op.domain == op.domain
+        assert simple_op.range == op.range
+        assert simple_op.is_linear or not op.is_linear
+        assert all_almost_equal(simple_op(x), op(x))
+
+    # Scalars and pointwise operators are merged across linear operators
+    op = 3 * grad * mult_a * mult_b * 2
+    simple_op = simplify_operator(op)
+    assert type(simple_op) is odl.OperatorComp
+    assert simple_op.left is grad
+    assert type(simple_op.right) is odl.MultiplyOperator
+    assert all_almost_equal(simple_op(x), op(x))
+
+    # Operators that cannot be simplified are returned as they are
+    op = grad * mult_a
+    assert simplify_operator(op) is op
+    assert simplify_operator(grad) is grad
+
+    # Functional expressions are kept
+    func = odl.solvers.L2NormSquared(space) * ident
+    assert simplify_operator(func) is func
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -8,9 +8,28 @@
 
 from __future__ import division
 import pytest
+import time
 
 import odl
-from odl.util.testutils import all_almost_equal, simple_fixture
+from odl.util.testutils import all_almost_equal, noise_element, simple_fixture
+
+
+# --- helper classes --- #
+
+
+class CountingExecutor(object):
+
+    """Serial executor that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def map(self, func, iterable):
+        self.calls += 1
+        return map(func, iterable)
+
+
+# --- pytest fixtures --- #
 
 
 base_op = simple_fixture(
@@ -162,6 +181,89 @@ def test_pspace_op_swap_call():
     assert result == op(z, out=op.range.element())
 
 
+def test_pspace_op_executor():
+    """Check that the result does not depend on the executor."""
+    space = odl.uniform_discr([0, 0], [1, 1], (10, 10))
+    grad = odl.Gradient(space)
+    scal = odl.ScalingOperator(space, 2.0)
+    mult = odl.MultiplyOperator(noise_element(space))
+    # Operators are not shared between rows, such that they run concurrently
+    ops = [[grad.adjoint, scal],
+           [0, 2 * odl.MultiplyOperator(mult.multiplicand)],
+           [0, 0],
+           [2 * grad.adjoint, mult]]
+    domain = odl.ProductSpace(grad.range, space)
+    x = noise_element(domain)
+
+    counting_executor = CountingExecutor()
+    op_serial = odl.ProductSpaceOperator(ops, domain=domain,
+                                         range=space ** 4)
+    assert op_serial.executor == 'serial'
+    expected = op_serial(x)
+    for executor in ['threads', counting_executor]:
+        op = odl.ProductSpaceOperator(ops, domain=domain, range=space ** 4,
+                                      executor=executor)
+        assert op.executor is executor
+        assert all_almost_equal(op(x), expected)
+        out = op.range.element()
+        op(x, out=out)
+        assert all_almost_equal(out, expected)
+        assert op.adjoint.executor is executor
+
+    assert counting_executor.calls == 2
+
+    # Broadcast and diagonal operators pass on the executor, also when
+    # nested
+    for executor in ['serial', 'threads', counting_executor]:
+        broadcast = odl.BroadcastOperator(scal, mult, executor=executor)
+        diagonal = odl.DiagonalOperator(broadcast, grad, executor=executor)
+        assert diagonal.executor is executor
+        assert broadcast.executor is executor
+        y = noise_element(diagonal.domain)
+        result = diagonal(y)
+        assert all_almost_equal(result[0], [scal(y[0]), mult(y[0])])
+        assert all_almost_equal(result[1], grad(y[1]))
+
+    with pytest.raises(TypeError):
+        odl.ProductSpaceOperator([[scal]], executor='processes')
+    with pytest.raises(TypeError):
+        odl.BroadcastOperator(scal, mult, exeuctor='serial')
+
+
+def test_pspace_op_executor_shared_ops():
+    """Check that operators shared by several rows run serially."""
+    space = odl.uniform_discr([0, 0], [1, 1], (10, 10))
+
+    class BufferedOperator(odl.Operator):
+        """Identity that passes the input through an internal buffer."""
+        def __init__(self):
+            super(BufferedOperator, self).__init__(space, space, linear=True)
+            self.buffer = space.element()
+
+        def _call(self, x, out):
+            self.buffer.assign(x)
+            time.sleep(0.01)
+            out.assign(self.buffer)
+
+    op = BufferedOperator()
+    x = odl.ProductSpace(space, 2).element([space.one(), space.zero()])
+    counting_executor = CountingExecutor()
+    for executor in ['threads', counting_executor]:
+        # Shared operator inside a scaling, sum and composition
+        for ops in [(op, 2 * op), (op * 2.0, -op), (op + op, op * op)]:
+            diagonal = odl.DiagonalOperator(*ops, executor=executor)
+            diagonal_serial = odl.DiagonalOperator(*ops, executor='serial')
+            assert all_almost_equal(diagonal(x), diagonal_serial(x))
+
+    assert counting_executor.calls == 0
+
+    # Distinct operators are evaluated concurrently
+    diagonal = odl.DiagonalOperator(BufferedOperator(), BufferedOperator(),
+                                    executor=counting_executor)
+    assert all_almost_equal(diagonal(x), x)
+    assert counting_executor.calls == 1
+
+
 def test_comp_proj():
     r3 = odl.rn(3)
     r3xr3 = odl.ProductSpace(r3, 2)
@@ -0,0 +1,149 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import numpy as np
+import pytest
+import threading
+
+import odl
+from odl.operator import TemporaryPool, temporary_pool_limit
+from odl.util.testutils import all_almost_equal, noise_element
+
+
+# --- Fixtures --- #
+
+
+@pytest.fixture
+def pool_limit(request):
+    """Enable temporary pools for the duration of a test."""
+    old_limit = temporary_pool_limit()
+    temporary_pool_limit(2 ** 20)
+
+    def fin():
+        temporary_pool_limit(old_limit)
+
+    request.addfinalizer(fin)
+    return 2 ** 20
+
+
+# --- Tests --- #
+
+
+def test_pool_reuse(pool_limit):
+    """Elements are reused when the pool is enabled."""
+    space = odl.rn(10)
+    pool = TemporaryPool()
+    with pool.element(space) as tmp:
+        assert tmp in space
+        tmp_id = id(tmp)
+    with pool.element(space) as tmp:
+        assert id(tmp) == tmp_id
+
+        # Nested use gives a different element
+        with pool.element(space) as tmp2:
+            assert tmp2 is not tmp
+
+
+def test_pool_disabled():
+    """By default, a new element is allocated each time."""
+    assert temporary_pool_limit() == 0
+    space = odl.rn(10)
+    pool = TemporaryPool()
+    with pool.element(space) as tmp:
+        pass
+    with pool.element(space) as tmp2:
+        assert tmp2 is not tmp
+
+
+def test_pool_limit(pool_limit):
+    """Elements exceeding the memory limit are not kept."""
+    small = odl.rn(10)
+    large = odl.rn(pool_limit // 8 + 1)
+    pool = TemporaryPool()
+    with pool.element(large) as tmp:
+        pass
+    with pool.element(large) as tmp2:
+        assert tmp2 is not tmp
+
+    # Lowering the limit empties the pools
+    with pool.element(small) as tmp:
+        pass
+    temporary_pool_limit(1)
+    temporary_pool_limit(pool_limit)
+    with pool.element(small) as tmp2:
+        assert tmp2 is not tmp
+
+    with pytest.raises(ValueError):
+        temporary_pool_limit(-1)
+
+
+def test_pool_threads(pool_limit):
+    """Concurrent users of a pool get distinct elements."""
+    space = odl.rn(1000)
+    pool = TemporaryPool()
+    errors = []
+
+    def work(value):
+        for _ in range(100):
+            with pool.element(space) as tmp:
+                tmp[:] = value
+                if not np.all(tmp.asarray() == value):
+                    errors.append(value)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+
+
+def test_operator_expressions_with_pool(pool_limit):
+    """Operator expressions give the same results with pools enabled."""
+    space = odl.uniform_discr(0, 1, 10)
+    A = odl.MultiplyOperator(noise_element(space))
+    B = odl.ScalingOperator(space, 2.0)
+    x = noise_element(space)
+    y = noise_element(space)
+
+    ops_and_results = [
+        (A * B, A(B(x))),
+        (A + B, A(x) + B(x)),
+        (3 * A, 3 * A(x)),
+        (A * 3, A(3 * x)),
+        (A * y, A(y * x)),
+        (odl.OperatorPointwiseProduct(A, B), A(x) * B(x)),
+        (odl.BroadcastOperator(A, B) * (A + B), [A(A(x) + B(x)),
+                                                 B(A(x) + B(x))]),
+        (odl.ProductSpaceOperator([[A, B]]), [A(x) + B(x)]),
+    ]
+
+    for op, expected in ops_and_results:
+        if op.domain == space:
+            arg = x
+        else:
+            arg = op.domain.element([x, x])
+
+        # Repeated evaluation reuses the temporaries
+        for _ in range(2):
+            assert all_almost_equal(op(arg), expected)
+            out = op.range.element()
+            op(arg, out=out)
+            assert all_almost_equal(out, expected)
+
+        # Aliased input and output
+        if op.domain == op.range:
+            arg_copy = arg.copy()
+            op(arg_copy, out=arg_copy)
+            assert all_almost_equal(arg_copy, expected)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -7,7 +7,12 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+import os
+import pickle
 import pytest
+import subprocess
+import sys
+
 import odl
 from odl.util.testutils import simple_fixture, noise_element
 
@@ -75,5 +80,61 @@ def test_comparsion(linear_space):
         x > y
 
 
+def test_contains_equal_spaces():
+    """Check membership for equal but not identical spaces."""
+    space1 = odl.uniform_discr([0, 0], [1, 1], (3, 4))
+    space2 = odl.uniform_discr([0, 0], [1, 1], (3, 4))
+    assert space1 is not space2
+    assert space1._interned() is space2._interned()
+    assert space1.one() in space2
+    assert space2.one() in space1
+
+    pspace1 = odl.ProductSpace(space1, odl.ProductSpace(space1, 2))
+    pspace2 = odl.ProductSpace(space2, odl.ProductSpace(space2, 2))
+    assert pspace1._interned() is pspace2._interned()
+    assert pspace1.zero() in pspace2
+
+    other = odl.uniform_discr([0, 0], [1, 2], (3, 4))
+    assert other._interned() is not space1._interned()
+    assert other.one() not in space1
+    assert space1.one() not in other
+    assert odl.rn(3, dtype='float32').one() not in odl.rn(3)
+
+
+def test_pickle_hash_other_process(tmpdir):
+    """Check hashes of spaces pickled in a process with another hash seed."""
+    fname = str(tmpdir.join('spaces.pkl'))
+    script = (
+        'import pickle, odl\n'
+        'space = odl.uniform_discr([0, 0], [1, 1], (3, 4))\n'
+        'pspace = odl.ProductSpace(space, 2)\n'
+        'spaces = [space, pspace, space.partition.grid]\n'
+        '# Fill the caches before pickling\n'
+        'for s in spaces:\n'
+        '    hash(s)\n'
+        'space._interned()\n'
+        'pspace._interned()\n'
+        'with open({!r}, "wb") as f:\n'
+        '    pickle.dump(spaces, f)\n'.format(fname))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(path for path in sys.path if path)
+    env['PYTHONHASHSEED'] = ('2' if os.environ.get('PYTHONHASHSEED') == '1'
+                             else '1')
+    subprocess.check_call([sys.executable, '-c', script], env=env)
+
+    with open(fname, 'rb') as f:
+        loaded = pickle.load(f)
+
+    space = odl.uniform_discr([0, 0], [1, 1], (3, 4))
+    pspace = odl.ProductSpace(space, 2)
+    for orig, other in zip([space, pspace, space.partition.grid], loaded):
+        assert other == orig
+        assert hash(other) == hash(orig)
+        assert other in {orig: 1}
+
+    assert loaded[0]._interned() is space._interned()
+    assert space.one() in loaded[0]
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
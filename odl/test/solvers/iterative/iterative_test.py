@@ -9,6 +9,10 @@
 """Test iterative solvers."""
 
 from __future__ import division
+import os
+import subprocess
+import sys
+
 import odl
 from odl.util.testutils import all_almost_equal
 import pytest
@@ -139,5 +143,90 @@ def test_steepst_descent():
     assert all_almost_equal(x, [1, 1, 1], places=2)
 
 
+def test_sensitivity_cache(tmpdir):
+    """Test reuse of MLEM sensitivities in memory and on disk."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    data = ray_trafo(space.one())
+
+    x = space.one()
+    odl.solvers.mlem(ray_trafo, x, data, niter=2)
+
+    cache = odl.solvers.SensitivityCache(cache_dir=str(tmpdir))
+    x_cached = space.one()
+    odl.solvers.mlem(ray_trafo, x_cached, data, niter=2,
+                     sensitivity_cache=cache)
+    assert all_almost_equal(x, x_cached)
+    assert len(cache) == 1
+    assert len(tmpdir.listdir()) == 1
+
+    # New operator with the same setup uses the stored result
+    ray_trafo_2 = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    cache_2 = odl.solvers.SensitivityCache(cache_dir=str(tmpdir))
+    sens = cache_2(ray_trafo_2)
+    assert all_almost_equal(sens, ray_trafo.adjoint(ray_trafo.range.one()))
+
+    # Returned elements are copies
+    sens *= 0
+    assert all_almost_equal(cache_2(ray_trafo_2),
+                            ray_trafo.adjoint(ray_trafo.range.one()))
+
+    # Operators without geometry are cached in memory only
+    op = odl.IdentityOperator(space)
+    assert all_almost_equal(cache(op), space.one())
+    assert len(cache) == 2
+    assert len(tmpdir.listdir()) == 1
+
+
+def test_sensitivity_cache_other_process(tmpdir):
+    """Test sharing of sensitivities with another process via disk."""
+    cache_dir = str(tmpdir.join('sub', 'dir'))
+    script = (
+        'import odl\n'
+        'space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))\n'
+        'geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)\n'
+        'ray_trafo = odl.tomo.RayTransform(space, geometry, impl="numpy")\n'
+        'cache = odl.solvers.SensitivityCache(cache_dir={!r})\n'
+        'cache(ray_trafo)\n'.format(cache_dir))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(path for path in sys.path if path)
+    env['PYTHONHASHSEED'] = ('2' if os.environ.get('PYTHONHASHSEED') == '1'
+                             else '1')
+    subprocess.check_call([sys.executable, '-c', script], env=env)
+
+    # The directory has been created, and the stored file is found by
+    # the same setup in this process
+    space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=6)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    cache = odl.solvers.SensitivityCache(cache_dir=cache_dir)
+    key = cache._key(ray_trafo)
+    assert os.listdir(cache_dir) == ['sensitivity_{}.npy'.format(key)]
+    assert all_almost_equal(cache(ray_trafo),
+                            ray_trafo.adjoint(ray_trafo.range.one()))
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_osmlem_fused(monkeypatch):
+    """Test the fused blockwise OSMLEM update against the plain formula."""
+    monkeypatch.setattr(odl.space.npy_tensors, 'CHUNK_SIZE', 7)
+    space = odl.uniform_discr(0, 1, 50)
+    weights = [space.element(np.linspace(0.5, 2, 50)),
+               space.element(np.linspace(2, 0.5, 50))]
+    ops = [odl.MultiplyOperator(w) for w in weights]
+    data = [op(space.element(np.linspace(1, 3, 50))) for op in ops]
+
+    expected = space.one()
+    for _ in range(3):
+        for op, rhs, w in zip(ops, data, weights):
+            expected *= op.adjoint(rhs / op(expected)) / w
+
+    for num_threads in [1, 3]:
+        x = space.one()
+        odl.solvers.osmlem(ops, x, data, niter=3, num_threads=num_threads)
+        assert all_almost_equal(x, expected)
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -133,5 +133,28 @@ def test_pdhg_product_space():
     assert all_almost_equal(discr_vec, vec_expl, PLACES)
 
 
+def test_pdhg_dual_dtype():
+    """Test the PDHG algorithm with dual variable in half precision."""
+    space = odl.uniform_discr([0, 0], [1, 1], (10, 10), dtype='float32')
+    op = odl.Gradient(space)
+    data = space.element(np.eye(10))
+
+    f = 0.1 * odl.solvers.GroupL1Norm(op.range)
+    g = odl.solvers.L2NormSquared(space).translated(data)
+    sigma = tau = 0.2
+
+    x_full = space.zero()
+    pdhg(x_full, f, g, op, tau=tau, sigma=sigma, niter=20)
+
+    x_mixed = space.zero()
+    y = op.range.astype('float16').zero()
+    pdhg(x_mixed, f, g, op, tau=tau, sigma=sigma, niter=20,
+         dual_dtype='float16', y=y)
+
+    assert x_mixed in space
+    assert all_almost_equal(x_mixed, x_full, places=2)
+    assert y.norm() > 0
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -0,0 +1,74 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the Stochastic Primal-Dual Hybrid Gradient algorithm."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers import spdhg, spdhg_step_sizes
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+# Places for the accepted error when comparing results
+PLACES = 6
+
+fun_select = simple_fixture('fun_select', ['random', 'sequential'])
+
+
+def test_spdhg_least_squares(fun_select):
+    """Test SPDHG on a consistent least squares problem split in blocks."""
+    np.random.seed(0)
+    space = odl.rn(4)
+    L = [odl.MatrixOperator(np.random.rand(3, 4), domain=space)
+         for _ in range(4)]
+    x_true = space.element([1, 2, 3, 4])
+
+    f = [odl.solvers.L2NormSquared(Li.range).translated(Li(x_true))
+         for Li in L]
+    g = odl.solvers.ZeroFunctional(space)
+    tau, sigma = spdhg_step_sizes(L)
+
+    x = space.zero()
+    spdhg(x, f, g, L, tau, sigma, niter=600, fun_select=fun_select)
+    assert all_almost_equal(x, x_true, PLACES)
+
+    # Resume iteration with a callable selecting all blocks
+    y = odl.ProductSpace(*[Li.range for Li in L]).zero()
+    x = space.zero()
+    prob = [1] * len(L)
+    spdhg(x, f, g, L, tau, sigma, niter=100, y=y, prob=prob,
+          fun_select=lambda k: range(len(L)))
+    spdhg(x, f, g, L, tau, sigma, niter=100, y=y, prob=prob,
+          fun_select=lambda k: range(len(L)))
+    assert all_almost_equal(x, x_true, PLACES)
+
+
+def test_spdhg_errors():
+    """Test that SPDHG rejects inconsistent arguments."""
+    space = odl.rn(3)
+    L = [odl.IdentityOperator(space)] * 2
+    f = [odl.solvers.L2NormSquared(space)] * 2
+    g = odl.solvers.ZeroFunctional(space)
+    x = space.zero()
+
+    with pytest.raises(ValueError):
+        spdhg(x, f[:1], g, L, 0.5, 0.5, niter=1)
+    with pytest.raises(ValueError):
+        spdhg(x, f, g, L, 0.5, [0.5], niter=1)
+    with pytest.raises(ValueError):
+        spdhg(x, f, g, L, 0.5, 0.5, niter=1, prob=[0.5, 1.5])
+    with pytest.raises(ValueError):
+        spdhg(x, f, g, L, 0.5, 0.5, niter=1, fun_select='unknown')
+    with pytest.raises(TypeError):
+        spdhg(odl.rn(2).zero(), f, g, L, 0.5, 0.5, niter=1)
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
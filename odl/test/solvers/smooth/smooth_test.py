@@ -12,6 +12,7 @@ from __future__ import division
 import pytest
 import odl
 from odl.operator import OpNotImplementedError
+from odl.util.testutils import all_almost_equal
 
 
 nonlinear_cg_beta = odl.util.testutils.simple_fixture('nonlinear_cg_beta',
@@ -101,6 +102,47 @@ def test_lbfgs_solver(functional_and_linesearch):
     assert functional(x) < 1e-3
 
 
+def test_lbfgs_method(functional_and_linesearch):
+    """Test the ring-buffer limited memory BFGS solver."""
+    functional, line_search = functional_and_linesearch
+
+    x = functional.domain.one()
+    odl.solvers.lbfgs_method(functional, x, tol=1e-3,
+                             line_search=line_search, num_store=5)
+
+    assert functional(x) < 1e-3
+
+
+def test_lbfgs_method_nonpositive_curvature():
+    """Test ``lbfgs_method`` with pairs of non-positive curvature."""
+    # The backtracking line search yields steps with <s, y> < 0 here
+    functional = odl.solvers.RosenbrockFunctional(odl.rn(2))
+    line_search = odl.solvers.BacktrackingLineSearch(functional)
+
+    x = functional.domain.element([-1.2, 1])
+    odl.solvers.lbfgs_method(functional, x, line_search=line_search,
+                             maxiter=100)
+    assert all_almost_equal(x, [1, 1], places=3)
+
+
+def test_lbfgs_method_warm_restart():
+    """Test continuing ``lbfgs_method`` with a stored memory."""
+    rosenbrock = odl.solvers.RosenbrockFunctional(odl.rn(2), scale=2)
+    functional = rosenbrock.translated([-1, -1])
+    memory = odl.solvers.LBFGSMemory(functional.domain, num_store=3)
+
+    x = functional.domain.one()
+    odl.solvers.lbfgs_method(functional, x, maxiter=5, memory=memory)
+    assert len(memory) == 3
+
+    odl.solvers.lbfgs_method(functional, x, tol=1e-3, memory=memory)
+    assert functional(x) < 1e-3
+
+    with pytest.raises(ValueError):
+        odl.solvers.lbfgs_method(odl.solvers.L2NormSquared(odl.rn(3)),
+                                 odl.rn(3).one(), memory=memory)
+
+
 def test_broydens_method(broyden_impl, functional_and_linesearch):
     """Test the ``broydens_method`` quasi-Newton solver."""
     functional, line_search = functional_and_linesearch
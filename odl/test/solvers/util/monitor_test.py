@@ -0,0 +1,83 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the convergence monitors."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+
+
+def test_monitor_residual_conjugate_gradient():
+    """Test stopping CG on the residual it computes."""
+    np.random.seed(0)
+    mat = np.random.rand(10, 10)
+    op = odl.MatrixOperator(mat.T.dot(mat) + 10 * np.eye(10))
+    rhs = op.range.one()
+
+    monitor = odl.solvers.MonitorResidual(tol=1e-6, relative=True)
+    store = odl.solvers.CallbackStore()
+    x = op.domain.zero()
+    odl.solvers.conjugate_gradient(op, x, rhs, niter=100,
+                                   callback=monitor & store)
+
+    assert monitor.stop_reason is not None
+    assert monitor.iter == len(store) < 100
+    assert (op(x) - rhs).norm() < 1e-4
+
+    monitor.reset()
+    assert monitor.stop_reason is None
+    assert monitor.iter == 0
+
+    # Solvers without a residual cannot be monitored this way
+    with pytest.raises(ValueError):
+        odl.solvers.kaczmarz([op], op.domain.zero(), [rhs], niter=1,
+                             callback=monitor)
+
+
+def test_monitor_relative_change_pdhg():
+    """Test stopping PDHG on the relative change of the iterate."""
+    space = odl.rn(3)
+    op = odl.IdentityOperator(space)
+    f = odl.solvers.L2NormSquared(space).translated([1, 2, 3])
+    g = odl.solvers.ZeroFunctional(space)
+
+    monitor = odl.solvers.MonitorRelativeChange(tol=1e-8)
+    x = space.zero()
+    odl.solvers.pdhg(x, f, g, op, tau=0.5, sigma=0.5, niter=1000,
+                     callback=monitor)
+
+    assert monitor.stop_reason is not None
+    assert monitor.iter < 1000
+    assert odl.util.testutils.all_almost_equal(x, [1, 2, 3], places=6)
+
+    # Without `x_old` from the solver, the monitor keeps its own copy
+    monitor = odl.solvers.MonitorRelativeChange(tol=1e-8)
+    x = space.zero()
+    odl.solvers.douglas_rachford_pd(x, g, [f], [op], tau=0.5, sigma=[0.5],
+                                    niter=1000, callback=monitor)
+    assert monitor.stop_reason is not None
+    assert monitor.iter < 1000
+
+
+def test_callbacks_never_stop():
+    """Test that regular callbacks keep solvers running."""
+    space = odl.rn(3)
+    op = odl.IdentityOperator(space)
+    store = odl.solvers.CallbackStore()
+    x = space.zero()
+    odl.solvers.landweber(op, x, space.one(), niter=5,
+                          callback=store & (lambda x: None))
+    assert len(store) == 5
+    assert store.stop_reason is None
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
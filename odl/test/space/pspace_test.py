@@ -571,6 +571,52 @@ def test_power_in_place_modify():
     assert all_almost_equal(z, [z1, z2])
 
 
+def test_power_contiguous():
+    """Check contiguous power spaces against the default storage."""
+    for base in (odl.rn(3), odl.uniform_discr([0, 0], [1, 1], (3, 4))):
+        pspace = odl.ProductSpace(base, 2, weighting=1.5)
+        cpspace = odl.ProductSpace(base, 2, weighting=1.5, contiguous=True)
+        assert cpspace.is_contiguous
+        assert not pspace.is_contiguous
+        assert cpspace == pspace
+
+        [x, y], [cx, cy] = noise_elements(cpspace, 2)
+        x = pspace.element([part.copy() for part in cx])
+        y = pspace.element([part.copy() for part in cy])
+
+        # Parts are views into the contiguous array
+        arr = cx.asarray()
+        assert arr.shape == (2,) + base.shape
+        assert all(np.shares_memory(arr, part.asarray()) for part in cx)
+        assert cpspace.element(arr).asarray() is arr
+
+        assert all_almost_equal(cpspace.lincomb(2, cx, -1, cy),
+                                pspace.lincomb(2, x, -1, y))
+        assert all_almost_equal(cx * cy, x * y)
+        assert all_almost_equal(cx / (cy * cy + 1), x / (y * y + 1))
+        assert almost_equal(cx.inner(cy), x.inner(y))
+        assert almost_equal(cx.norm(), x.norm())
+        assert almost_equal(cx.dist(cy), x.dist(y))
+
+        # Mixing storage types falls back to the parts
+        assert all_almost_equal(cpspace.lincomb(1, cx, 1, y), x + y)
+
+        out = cpspace.element()
+        cpspace.lincomb(1, cx, 1, cy, out=out)
+        assert all_almost_equal(out, x + y)
+        assert all_almost_equal(out[0], x[0] + y[0])
+
+    # Operators with contiguous range
+    space = odl.uniform_discr([0, 0], [1, 1], (4, 5))
+    grad = odl.Gradient(space,
+                        range=odl.ProductSpace(space, 2, contiguous=True))
+    x = noise_element(space)
+    assert all_almost_equal(grad(x), odl.Gradient(space)(x))
+
+    with pytest.raises(ValueError):
+        odl.ProductSpace(odl.rn(2), odl.rn(3), contiguous=True)
+
+
 def test_getitem_single():
     r1 = odl.rn(1)
     r2 = odl.rn(2)
@@ -43,6 +43,14 @@ def _pos_array(space):
     return np.abs(noise_array(space)) + 0.1
 
 
+def _accum_array(arr):
+    """Return ``arr`` in the data type in which reductions accumulate."""
+    if arr.dtype == np.dtype('float16'):
+        return arr.astype('float64')
+    else:
+        return arr
+
+
 def _array_cls(impl):
     """Return the array class for given impl."""
     if impl == 'numpy':
@@ -419,6 +427,94 @@ def test_lincomb_discontig(tspace_impl):
         for b in scalar_values:
             _test_lincomb(tspace, a, b, discontig=True)
 
+    # Use large size to test chunked BLAS impls
+    tspace = odl.rn((300, 400), impl=tspace_impl)
+
+    for a in scalar_values:
+        for b in scalar_values:
+            _test_lincomb(tspace, a, b, discontig=True)
+
+
+def test_chunked_blas(monkeypatch):
+    """Test the chunked BLAS engine for large or non-contiguous arrays."""
+    monkeypatch.setattr(odl.space.npy_tensors, 'CHUNK_SIZE', 1000)
+    for num_threads in [1, 3]:
+        monkeypatch.setattr(odl.space.npy_tensors, 'CHUNK_NUM_THREADS',
+                            num_threads)
+        for dtype in ['float32', 'complex128']:
+            space = odl.tensor_space((300, 400), dtype=dtype)
+            [xarr, yarr, zarr], [x, y, z] = noise_elements(space, 3)
+
+            # Discontiguous input and output
+            x, y, z = x[:, ::2], y[:, ::2], z[:, ::2]
+            xarr, yarr, zarr = xarr[:, ::2], yarr[:, ::2], zarr[:, ::2]
+            res_space = x.space
+
+            res_space.lincomb(2, x, -1, y, out=z)
+            assert all_almost_equal(z, 2 * xarr - yarr, places=4)
+            assert res_space.inner(x, y) == pytest.approx(
+                np.vdot(yarr, xarr), rel=1e-4)
+            assert res_space.norm(x) == pytest.approx(
+                np.linalg.norm(xarr), rel=1e-4)
+            assert res_space.dist(x, y) == pytest.approx(
+                np.linalg.norm(xarr - yarr), rel=1e-4)
+
+
+def test_threaded_elementwise(monkeypatch):
+    """Test threaded arithmetic, ufuncs and reductions."""
+    monkeypatch.setattr(odl.space.npy_tensors, 'CHUNK_SIZE', 1000)
+    space = odl.rn((300, 400))
+    weights = _pos_array(space)
+    wspace = odl.rn((300, 400), weighting=weights)
+    [xarr, yarr], [x, y] = noise_elements(space, 2)
+
+    results = []
+    for num_threads in [2, 3]:
+        monkeypatch.setattr(odl.space.npy_tensors, 'CHUNK_NUM_THREADS',
+                            num_threads)
+        prod = x * y
+        assert all_almost_equal(prod, xarr * yarr)
+        quot = x / (y * y + 1)
+        assert all_almost_equal(quot, xarr / (yarr * yarr + 1))
+        sin = x.ufuncs.sin()
+        assert all_almost_equal(sin, np.sin(xarr))
+        sum_ = x.ufuncs.sum()
+        assert sum_ == pytest.approx(np.sum(xarr))
+        assert x.ufuncs.max() == np.max(xarr)
+
+        xw, yw = wspace.element(xarr), wspace.element(yarr)
+        inner = xw.inner(yw)
+        assert inner == pytest.approx(np.sum(xarr * yarr * weights))
+        pnorm = odl.rn((300, 400), exponent=1.5).element(xarr).norm()
+        assert pnorm == pytest.approx(np.linalg.norm(xarr.ravel(), 1.5))
+        results.append([prod, quot, sin, sum_, inner, pnorm])
+
+    # Results do not depend on the number of threads
+    assert all_equal(results[0], results[1])
+
+
+def test_reductions_accumulate_double(monkeypatch):
+    """Test double precision accumulation for compact storage dtypes."""
+    arr = np.full(10000, 0.1, dtype='float16')
+    space = odl.rn(arr.shape, dtype='float16')
+    x = space.element(arr)
+    exact = np.sqrt(np.sum(arr.astype('float64') ** 2))
+    assert x.norm() == pytest.approx(exact, rel=1e-12)
+    assert x.inner(x) == pytest.approx(exact ** 2, rel=1e-12)
+    assert x.dist(space.zero()) == pytest.approx(exact, rel=1e-12)
+
+    space = odl.rn(arr.shape, dtype='float16', exponent=1)
+    assert space.element(arr).norm() == pytest.approx(
+        np.sum(arr.astype('float64')), rel=1e-12)
+
+    monkeypatch.setattr(odl.space.npy_tensors, 'ACCUMULATE_DOUBLE', True)
+    arr = noise_array(odl.rn((100, 1000), dtype='float32'))
+    space = odl.rn(arr.shape, dtype='float32')
+    x = space.element(arr)
+    exact = np.sqrt(np.sum(arr.astype('float64') ** 2))
+    assert x.norm() == pytest.approx(exact, rel=1e-12)
+    assert x.inner(x) == pytest.approx(exact ** 2, rel=1e-12)
+
 
 def test_lincomb_raise(tspace):
     """Test if lincomb raises correctly for bad input."""
@@ -604,7 +700,8 @@ def test_inner(tspace):
     yd = noise_element(tspace)
 
     # TODO: add weighting
-    correct_inner = np.vdot(yd, xd)
+    correct_inner = np.vdot(_accum_array(yd.asarray()),
+                            _accum_array(xd.asarray()))
     assert tspace.inner(xd, yd) == pytest.approx(correct_inner)
     assert xd.inner(yd) == pytest.approx(correct_inner)
 
@@ -626,7 +723,7 @@ def test_norm(tspace):
     """Test the norm method against numpy.linalg.norm."""
     xarr, x = noise_elements(tspace)
 
-    correct_norm = np.linalg.norm(xarr.ravel())
+    correct_norm = np.linalg.norm(_accum_array(xarr).ravel())
     assert tspace.norm(x) == pytest.approx(correct_norm)
     assert x.norm() == pytest.approx(correct_norm)
 
@@ -654,6 +751,7 @@ def test_pnorm(exponent):
 def test_dist(tspace):
     """Test the dist method against numpy.linalg.norm of the difference."""
     [xarr, yarr], [x, y] = noise_elements(tspace, n=2)
+    xarr, yarr = _accum_array(xarr), _accum_array(yarr)
 
     correct_dist = np.linalg.norm((xarr - yarr).ravel())
     assert tspace.dist(x, y) == pytest.approx(correct_dist)
@@ -1067,7 +1165,7 @@ def test_array_weighting_inner(tspace):
     weight_arr = _pos_array(tspace)
     weighting = NumpyTensorSpaceArrayWeighting(weight_arr)
 
-    true_inner = np.vdot(yarr, xarr * weight_arr)
+    true_inner = np.vdot(_accum_array(yarr), xarr * weight_arr)
     assert weighting.inner(x, y) == pytest.approx(true_inner)
 
     # Exponent != 2 -> no inner product, should raise
@@ -1174,7 +1272,8 @@ def test_const_weighting_inner(tspace):
     [xarr, yarr], [x, y] = noise_elements(tspace, 2)
 
     constant = 1.5
-    true_result_const = constant * np.vdot(yarr, xarr)
+    true_result_const = constant * np.vdot(_accum_array(yarr),
+                                           _accum_array(xarr))
 
     w_const = NumpyTensorSpaceConstWeighting(constant)
     assert w_const.inner(x, y) == pytest.approx(true_result_const)
@@ -1194,7 +1293,8 @@ def test_const_weighting_norm(tspace, exponent):
         factor = constant
     else:
         factor = constant ** (1 / exponent)
-    true_norm = factor * np.linalg.norm(xarr.ravel(), ord=exponent)
+    true_norm = factor * np.linalg.norm(_accum_array(xarr).ravel(),
+                                        ord=exponent)
 
     w_const = NumpyTensorSpaceConstWeighting(constant, exponent=exponent)
     assert w_const.norm(x) == pytest.approx(true_norm)
@@ -1203,6 +1303,7 @@ def test_const_weighting_norm(tspace, exponent):
 def test_const_weighting_dist(tspace, exponent):
     """Test dist with const weighting."""
     [xarr, yarr], [x, y] = noise_elements(tspace, 2)
+    xarr, yarr = _accum_array(xarr), _accum_array(yarr)
 
     constant = 1.5
     if exponent == float('inf'):
@@ -0,0 +1,269 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test filtered back-projection."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.util.testutils import (all_almost_equal, noise_element,
+                                simple_fixture)
+
+
+# --- pytest fixtures --- #
+
+
+padding = simple_fixture('padding', [True, False])
+
+
+# --- Helpers --- #
+
+
+def make_ray_trafo(ndim=2, num_angles=20):
+    """Return a small NumPy ray transform in parallel beam geometry."""
+    space = odl.uniform_discr([-1] * ndim, [1] * ndim, [16] * ndim,
+                              dtype='float32')
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=num_angles)
+    return odl.tomo.RayTransform(space, geometry, impl='numpy')
+
+
+# --- Tests --- #
+
+
+def shares_filter(op1, op2):
+    """Return ``True`` if both filter operators use the same kernel."""
+    return np.shares_memory(op1.kernel, op2.kernel)
+
+
+def test_fbp_filter_cache():
+    """Check that equivalent filters are shared, but not operators."""
+    odl.tomo.clear_fbp_filter_cache()
+    ray_trafo = make_ray_trafo()
+
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo)
+    filter_op_2 = odl.tomo.fbp_filter_op(ray_trafo)
+    assert filter_op_2 is not filter_op
+    assert shares_filter(filter_op_2, filter_op)
+
+    # A new ray transform with an equal geometry reuses the filter
+    ray_trafo_2 = make_ray_trafo()
+    assert shares_filter(odl.tomo.fbp_filter_op(ray_trafo_2), filter_op)
+
+    # Different parameters give different filters
+    filter_op_hann = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann')
+    assert not shares_filter(filter_op_hann, filter_op)
+    filter_op_nopad = odl.tomo.fbp_filter_op(ray_trafo, padding=False)
+    assert not shares_filter(filter_op_nopad, filter_op)
+
+    # Uncached filter is a new, but equivalent filter
+    filter_op_nocache = odl.tomo.fbp_filter_op(ray_trafo, use_cache=False)
+    assert not shares_filter(filter_op_nocache, filter_op)
+    proj = ray_trafo(odl.phantom.shepp_logan(ray_trafo.domain, modified=True))
+    assert all_almost_equal(filter_op(proj), filter_op_nocache(proj))
+
+    odl.tomo.clear_fbp_filter_cache()
+    assert not shares_filter(odl.tomo.fbp_filter_op(ray_trafo), filter_op)
+
+
+def test_fbp_filter_cache_limits():
+    """Check eviction of least recently used filters."""
+    old_limits = odl.tomo.fbp_filter_cache_limits()
+    odl.tomo.clear_fbp_filter_cache()
+    try:
+        odl.tomo.fbp_filter_cache_limits(max_entries=2)
+        ray_trafo = make_ray_trafo()
+        op_ramlak = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Ram-Lak')
+        op_hann = odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann')
+
+        # Use 'Ram-Lak' filter, then add a third one, evicting 'Hann'
+        assert shares_filter(odl.tomo.fbp_filter_op(ray_trafo), op_ramlak)
+        odl.tomo.fbp_filter_op(ray_trafo, filter_type='Cosine')
+        assert shares_filter(odl.tomo.fbp_filter_op(ray_trafo), op_ramlak)
+        assert not shares_filter(
+            odl.tomo.fbp_filter_op(ray_trafo, filter_type='Hann'), op_hann)
+
+        # Filters larger than the byte limit are not kept
+        odl.tomo.fbp_filter_cache_limits(max_entries=16, max_bytes=0)
+        assert not shares_filter(odl.tomo.fbp_filter_op(ray_trafo),
+                                 op_ramlak)
+
+        with pytest.raises(ValueError):
+            odl.tomo.fbp_filter_cache_limits(max_entries=-1)
+    finally:
+        odl.tomo.fbp_filter_cache_limits(*old_limits)
+        odl.tomo.clear_fbp_filter_cache()
+
+
+def test_fbp_filter_op_fourier_reference(padding):
+    """Compare the fused filter with the Fourier transform formulation."""
+    # Odd and even number of detector pixels
+    for det_shape in (24, 25):
+        space = odl.uniform_discr([-1, -1], [1, 1], (16, 16))
+        geometry = odl.tomo.parallel_beam_geometry(space, num_angles=10,
+                                                   det_shape=det_shape)
+        ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+        filter_op = odl.tomo.fbp_filter_op(
+            ray_trafo, padding=padding, filter_type='Hann',
+            frequency_scaling=0.8, use_cache=False)
+        assert isinstance(filter_op, odl.tomo.FBPFilterOperator)
+
+        # Reference: convolution via padded complex Fourier transform
+        proj_space = ray_trafo.range
+        if padding:
+            resizing = odl.ResizingOperator(
+                proj_space, ran_shp=(10, 2 * det_shape - 1))
+            fourier = odl.trafos.FourierTransform(resizing.range, axes=1)
+            fourier = fourier * resizing
+        else:
+            fourier = odl.trafos.FourierTransform(proj_space, axes=1)
+
+        alen = geometry.motion_params.length
+
+        def fourier_filter(x):
+            abs_freq = np.abs(x[1])
+            norm_freq = abs_freq / np.max(abs_freq)
+            filt = np.cos(norm_freq * np.pi / (2 * 0.8)) ** 2
+            filt *= (norm_freq <= 0.8)
+            return filt * abs_freq / (2 * alen)
+
+        ramp_function = fourier.range.element(fourier_filter)
+        reference = fourier.inverse * ramp_function * fourier
+
+        proj = ray_trafo(odl.phantom.shepp_logan(space, modified=True))
+        assert all_almost_equal(filter_op(proj), reference(proj))
+
+        # The filter is self-adjoint
+        other = odl.phantom.white_noise(proj_space)
+        assert (filter_op(proj).inner(other) ==
+                pytest.approx(proj.inner(filter_op(other))))
+
+
+def test_fbp_filter_operator_chunks():
+    """Check that the result does not depend on the chunk size."""
+    ray_trafo = make_ray_trafo(ndim=3)
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo, use_cache=False)
+    filter_op_chunked = odl.tomo.FBPFilterOperator(
+        filter_op.domain, filter_op.axis, filter_op.kernel,
+        filter_op.padded_size, chunk_size=3)
+
+    proj = odl.phantom.white_noise(ray_trafo.range)
+    assert all_almost_equal(filter_op(proj), filter_op_chunked(proj))
+
+    with pytest.raises(ValueError):
+        odl.tomo.FBPFilterOperator(filter_op.domain, 0, filter_op.kernel,
+                                   filter_op.padded_size)
+    with pytest.raises(ValueError):
+        odl.tomo.FBPFilterOperator(filter_op.domain, filter_op.axis,
+                                   filter_op.kernel[:-1],
+                                   filter_op.padded_size)
+
+
+@pytest.mark.skipif('not odl.trafos.PYFFTW_AVAILABLE',
+                    reason='pyfftw not available')
+def test_fbp_filter_operator_pyfftw():
+    """Check filtering with pyfftw against NumPy."""
+    import pyfftw.interfaces.cache
+
+    ray_trafo = make_ray_trafo(ndim=3)
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo, use_cache=False)
+    filter_op_chunked = odl.tomo.FBPFilterOperator(
+        filter_op.domain, filter_op.axis, filter_op.kernel,
+        filter_op.padded_size, chunk_size=3)
+    proj = noise_element(ray_trafo.range)
+
+    axis, size = filter_op.axis, filter_op.padded_size
+    kernel_shape = [1] * proj.ndim
+    kernel_shape[axis] = -1
+    proj_f = np.fft.rfft(proj.asarray(), n=size, axis=axis)
+    proj_f *= filter_op.kernel.reshape(kernel_shape)
+    expected = np.fft.irfft(proj_f, n=size, axis=axis)
+    expected = np.take(expected, np.arange(proj.shape[axis]), axis=axis)
+    for _ in range(2):
+        assert all_almost_equal(filter_op(proj), expected)
+        assert all_almost_equal(filter_op_chunked(proj), expected)
+
+    # The global pyfftw settings are not changed
+    assert not pyfftw.interfaces.cache.is_enabled()
+
+
+def test_streaming_fbp(tmpdir):
+    """Compare chunk-wise FBP with FBP for the full data."""
+    space = odl.uniform_discr([-1] * 3, [1] * 3, [12] * 3, dtype='float32')
+    geometry = odl.tomo.cone_beam_geometry(space, src_radius=5, det_radius=5,
+                                           num_angles=20)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    proj = ray_trafo(odl.phantom.cuboid(space))
+    reco = odl.tomo.fbp_op(ray_trafo, filter_type='Hann')(proj)
+
+    # Memory-mapped file, chunk size not dividing the number of angles
+    fname = str(tmpdir.join('proj.dat'))
+    data = np.memmap(fname, dtype='float32', mode='w+', shape=proj.shape)
+    data[:] = proj
+    data.flush()
+    data = np.memmap(fname, dtype='float32', mode='r', shape=proj.shape)
+    out = space.element()
+    reco_stream = odl.tomo.streaming_fbp(ray_trafo, data, chunk_size=6,
+                                         out=out, filter_type='Hann')
+    assert reco_stream is out
+    assert all_almost_equal(reco_stream, reco, places=4)
+
+    # Iterable of chunks with varying size
+    chunks = [proj.asarray()[:3], proj.asarray()[3:15], proj.asarray()[15:]]
+    reco_stream = odl.tomo.streaming_fbp(ray_trafo, iter(chunks),
+                                         filter_type='Hann')
+    assert all_almost_equal(reco_stream, reco, places=4)
+
+    # Wrong number of projections
+    with pytest.raises(ValueError):
+        odl.tomo.streaming_fbp(ray_trafo, iter(chunks[:2]))
+    with pytest.raises(ValueError):
+        odl.tomo.streaming_fbp(ray_trafo, proj.asarray()[:-1])
+
+
+def test_streaming_fbp_ray_trafo_options(tmpdir):
+    """Check streaming FBP with the matrix of the full ray transform."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (16, 16))
+    geometry = odl.tomo.parallel_beam_geometry(space, num_angles=12)
+    matrix_dir = str(tmpdir)
+    ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy',
+                                      use_matrix=True, matrix_dir=matrix_dir)
+    proj = ray_trafo.range.element(
+        np.random.rand(*ray_trafo.range.shape))
+
+    reco_stream = odl.tomo.streaming_fbp(ray_trafo, proj.asarray(),
+                                         chunk_size=4)
+    reco = odl.tomo.fbp_op(ray_trafo)(proj)
+    assert all_almost_equal(reco_stream, reco)
+
+    # Only the matrix of the full transform is assembled and stored
+    assert len(tmpdir.listdir()) == 1
+
+    # Chunk-wise filtering
+    filter_op = odl.tomo.fbp_filter_op(ray_trafo)
+    filtered = np.vstack([filter_op.filter_chunk(proj.asarray()[i:i + 5])
+                          for i in range(0, 12, 5)])
+    assert all_almost_equal(filtered, filter_op(proj))
+    with pytest.raises(ValueError):
+        filter_op.filter_chunk(proj.asarray()[:, :-1])
+
+
+def test_fbp_reconstruction():
+    """Check that FBP approximately inverts the ray transform."""
+    ray_trafo = make_ray_trafo(num_angles=100)
+    phantom = odl.phantom.shepp_logan(ray_trafo.domain, modified=True)
+    fbp = odl.tomo.fbp_op(ray_trafo)
+    reco = fbp(ray_trafo(phantom))
+    rel_err = (reco - phantom).norm() / phantom.norm()
+    assert rel_err < 0.5
+    assert np.isfinite(reco.asarray()).all()
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -15,8 +15,10 @@ import sys
 
 import odl
 from odl.tomo.backends.astra_cpu import (
-    astra_cpu_forward_projector, astra_cpu_back_projector)
+    astra_cpu_forward_projector, astra_cpu_back_projector,
+    AstraCpuProjectorImpl, AstraCpuBackProjectorImpl)
 from odl.tomo.util.testutils import skip_if_no_astra
+from odl.util.testutils import all_almost_equal, noise_element
 
 # TODO: clean up and improve tests
 
@@ -81,5 +83,47 @@ def test_astra_cpu_projector_fanflat():
     assert backproj.norm() > 0
 
 
+@skip_if_no_astra
+def test_astra_cpu_projector_impl():
+    """Persistent ASTRA CPU projectors with several sub-geometries."""
+    reco_space = odl.uniform_discr([-4, -5], [4, 5], (4, 5), dtype='float32')
+    angle_part = odl.uniform_partition(0, 2 * np.pi, 8)
+    det_part = odl.uniform_partition(-6, 6, 6)
+    geom = odl.tomo.FanFlatGeometry(angle_part, det_part, 100, 10)
+    proj_space = odl.uniform_discr_frompartition(geom.partition,
+                                                 dtype='float32')
+
+    vol_data = noise_element(reco_space)
+    proj_data = noise_element(proj_space)
+    expected_proj = astra_cpu_forward_projector(vol_data, geom, proj_space)
+    expected_backproj = astra_cpu_back_projector(proj_data, geom, reco_space)
+
+    # Splitting the angles is opt-in
+    assert AstraCpuProjectorImpl(geom, reco_space, proj_space).num_threads == 1
+
+    for num_threads in [1, 3]:
+        projector = AstraCpuProjectorImpl(geom, reco_space, proj_space,
+                                          num_threads=num_threads)
+        back_projector = AstraCpuBackProjectorImpl(
+            geom, reco_space, proj_space, num_threads=num_threads)
+        assert len(projector.algo_ids) == num_threads
+
+        # Objects are reused in repeated calls
+        with projector, back_projector:
+            for _ in range(2):
+                assert all_almost_equal(projector.call_forward(vol_data),
+                                        expected_proj, places=4)
+                assert all_almost_equal(
+                    back_projector.call_backward(proj_data),
+                    expected_backproj, places=4)
+
+        # Closing frees the ASTRA objects and stops the threads
+        assert projector.algo_ids == [] and projector._pool is None
+        assert back_projector.algo_ids == []
+        with pytest.raises(RuntimeError):
+            projector.call_forward(vol_data)
+        projector.close()
+
+
 if __name__ == '__main__':
     odl.util.test_file(__file__)
@@ -0,0 +1,138 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test NumPy ray transform back-end."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.tomo.backends.numpy_ray_trafo import (
+    numpy_forward_projector, numpy_back_projector, numpy_ray_trafo_matrix)
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+# --- pytest fixtures --- #
+
+
+geometry_type = simple_fixture('geometry_type', ['par2d', 'par3d',
+                                                 'cone2d', 'cone3d'])
+
+
+def make_setup(geometry_type):
+    """Return reconstruction space and geometry for a small problem."""
+    apart = odl.uniform_partition(0, 2 * np.pi, 12)
+    if geometry_type.endswith('2d'):
+        reco_space = odl.uniform_discr([-4, -5], [4, 5], (8, 10),
+                                       dtype='float32')
+        dpart = odl.uniform_partition(-8, 8, 16)
+    else:
+        reco_space = odl.uniform_discr([-4, -5, -3], [4, 5, 3], (8, 10, 6),
+                                       dtype='float32')
+        dpart = odl.uniform_partition([-8, -6], [8, 6], (16, 12))
+
+    if geometry_type == 'par2d':
+        geom = odl.tomo.Parallel2dGeometry(apart, dpart)
+    elif geometry_type == 'par3d':
+        geom = odl.tomo.Parallel3dAxisGeometry(apart, dpart)
+    elif geometry_type == 'cone2d':
+        geom = odl.tomo.FanFlatGeometry(apart, dpart, src_radius=20,
+                                        det_radius=10)
+    elif geometry_type == 'cone3d':
+        geom = odl.tomo.ConeFlatGeometry(apart, dpart, src_radius=20,
+                                         det_radius=10)
+    else:
+        raise ValueError('geometry type not valid')
+
+    return reco_space, geom
+
+
+# --- Tests --- #
+
+
+def test_numpy_projectors(geometry_type):
+    """NumPy forward and back projection."""
+    reco_space, geom = make_setup(geometry_type)
+    proj_space = odl.uniform_discr_frompartition(geom.partition,
+                                                 dtype='float32')
+    phantom = odl.phantom.cuboid(reco_space)
+
+    # Forward evaluation
+    proj_data = numpy_forward_projector(phantom, geom, proj_space)
+    assert proj_data.shape == proj_space.shape
+    assert proj_data.norm() > 0
+
+    # Backward evaluation
+    backproj = numpy_back_projector(proj_data, geom, reco_space)
+    assert backproj.shape == reco_space.shape
+    assert backproj.norm() > 0
+
+    # Approximately adjoint
+    inner_proj = proj_data.inner(proj_data)
+    inner_vol = backproj.inner(phantom)
+    assert inner_proj == pytest.approx(inner_vol, rel=0.05)
+
+
+def test_numpy_projectors_threads(geometry_type):
+    """Check that the result does not depend on the number of threads."""
+    reco_space, geom = make_setup(geometry_type)
+    proj_space = odl.uniform_discr_frompartition(geom.partition,
+                                                 dtype='float32')
+    phantom = odl.phantom.cuboid(reco_space)
+
+    proj_1 = numpy_forward_projector(phantom, geom, proj_space,
+                                     num_threads=1)
+    proj_4 = numpy_forward_projector(phantom, geom, proj_space,
+                                     num_threads=4)
+    assert all_almost_equal(proj_1, proj_4)
+
+    backproj_1 = numpy_back_projector(proj_1, geom, reco_space,
+                                      num_threads=1)
+    backproj_4 = numpy_back_projector(proj_1, geom, reco_space,
+                                      num_threads=4)
+    assert all_almost_equal(backproj_1, backproj_4)
+
+
+def test_numpy_ray_trafo_matrix(geometry_type, tmpdir):
+    """Check the sparse matrix against the forward projector."""
+    reco_space, geom = make_setup(geometry_type)
+    proj_space = odl.uniform_discr_frompartition(geom.partition,
+                                                 dtype='float32')
+    phantom = odl.phantom.cuboid(reco_space)
+
+    matrix = numpy_ray_trafo_matrix(geom, reco_space, cache_dir=str(tmpdir))
+    assert matrix.shape == (proj_space.size, reco_space.size)
+    proj = numpy_forward_projector(phantom, geom, proj_space)
+    proj_mat = matrix.dot(phantom.asarray().ravel())
+    assert all_almost_equal(proj.asarray().ravel(), proj_mat, places=4)
+
+    # Matrix is cached in the geometry
+    assert numpy_ray_trafo_matrix(geom, reco_space) is matrix
+
+    # Matrix is loaded from disk for an equal geometry
+    assert len(tmpdir.listdir()) == 1
+    _, geom_copy = make_setup(geometry_type)
+    matrix_loaded = numpy_ray_trafo_matrix(geom_copy, reco_space,
+                                           cache_dir=str(tmpdir))
+    assert (matrix_loaded != matrix).nnz == 0
+
+
+def test_numpy_projector_unsupported():
+    """Check that unsupported geometries are rejected."""
+    reco_space = odl.uniform_discr([-1] * 3, [1] * 3, (4, 4, 4))
+    apart = odl.uniform_partition([0, 0], [np.pi, np.pi], (4, 4))
+    dpart = odl.uniform_partition([-2, -2], [2, 2], (4, 4))
+    geom = odl.tomo.Parallel3dEulerGeometry(apart, dpart)
+
+    with pytest.raises(ValueError):
+        odl.tomo.RayTransform(reco_space, geom, impl='numpy')
+
+
+if __name__ == '__main__':
+    odl.util.test_file(__file__)
@@ -17,7 +17,8 @@ import odl
 from odl.tomo.backends import ASTRA_VERSION
 from odl.tomo.util.testutils import (skip_if_no_astra, skip_if_no_astra_cuda,
                                      skip_if_no_skimage)
-from odl.util.testutils import almost_equal, all_almost_equal, simple_fixture
+from odl.util.testutils import (almost_equal, all_almost_equal, never_skip,
+                                noise_element, simple_fixture)
 
 
 # --- pytest fixtures --- #
@@ -26,6 +27,7 @@ from odl.util.testutils import almost_equal, all_almost_equal, simple_fixture
 impl = simple_fixture(
     name='impl', params=[skip_if_no_astra('astra_cpu'),
                          skip_if_no_astra_cuda('astra_cuda'),
+                         never_skip('numpy'),
                          skip_if_no_skimage('skimage')])
 
 geometry_params = ['par2d', 'par3d', 'cone2d', 'cone3d', 'helical']
@@ -90,6 +92,11 @@ projectors = [skip_if_no_astra('par2d astra_cpu uniform'),
               skip_if_no_astra_cuda('cone3d astra_cuda nonuniform'),
               skip_if_no_astra_cuda('cone3d astra_cuda random'),
               skip_if_no_astra_cuda('helical astra_cuda uniform'),
+              never_skip('par2d numpy uniform'),
+              never_skip('par2d numpy half_uniform'),
+              never_skip('par2d numpy nonuniform'),
+              never_skip('cone2d numpy uniform'),
+              never_skip('cone2d numpy random'),
               skip_if_no_skimage('par2d skimage uniform'),
               skip_if_no_skimage('par2d skimage half_uniform')]
 
@@ -322,6 +329,128 @@ def test_complex(impl):
     assert all_almost_equal(data.imag, true_data_im)
 
 
+def test_use_matrix():
+    """Test the sparse matrix mode against the direct evaluation."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20), dtype='float32')
+    geom = odl.tomo.cone_beam_geometry(space, src_radius=5, det_radius=5,
+                                       num_angles=10)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='numpy')
+    ray_trafo_mat = odl.tomo.RayTransform(space, geom, use_matrix=True)
+    assert ray_trafo_mat.impl == 'numpy'
+
+    vol = odl.phantom.shepp_logan(space, modified=True)
+    proj = ray_trafo(vol)
+    proj_mat = ray_trafo_mat(vol)
+    assert all_almost_equal(proj, proj_mat, places=4)
+
+    # The adjoint is the exact adjoint of the matrix
+    backproj_mat = ray_trafo_mat.adjoint(proj_mat)
+    assert (proj_mat.inner(proj_mat) ==
+            pytest.approx(backproj_mat.inner(vol), rel=1e-4))
+
+    with pytest.raises(ValueError):
+        odl.tomo.RayTransform(space, geom, impl='skimage', use_matrix=True)
+
+
+def test_default_impl(monkeypatch):
+    """Test the order in which back-ends are selected by default."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+    par_geom = odl.tomo.parallel_beam_geometry(space, num_angles=10)
+    fan_geom = odl.tomo.cone_beam_geometry(space, src_radius=5,
+                                           det_radius=5, num_angles=10)
+    module = odl.tomo.operators.ray_trafo
+    monkeypatch.setattr(module, 'ASTRA_CUDA_AVAILABLE', False)
+    monkeypatch.setattr(module, 'ASTRA_AVAILABLE', False)
+
+    # scikit-image for parallel beam geometries, NumPy otherwise
+    monkeypatch.setattr(module, 'SKIMAGE_AVAILABLE', True)
+    assert odl.tomo.RayTransform(space, par_geom).impl == 'skimage'
+    assert odl.tomo.RayTransform(space, fan_geom).impl == 'numpy'
+
+    monkeypatch.setattr(module, 'SKIMAGE_AVAILABLE', False)
+    assert odl.tomo.RayTransform(space, par_geom).impl == 'numpy'
+
+    # Error if no back-end supports the setting
+    apart = odl.uniform_partition(0, np.pi, 10)
+    dpart = odl.nonuniform_partition(np.linspace(-1, 1, 10) ** 3)
+    geom = odl.tomo.Parallel2dGeometry(apart, dpart)
+    with pytest.raises(RuntimeError):
+        odl.tomo.RayTransform(space, geom)
+
+
+def test_batched_ray_trafo(impl):
+    """Test the batched ray transform against member-wise evaluation."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20), dtype='float32')
+    if impl == 'skimage':
+        geom = odl.tomo.parallel_beam_geometry(space, num_angles=10)
+    else:
+        geom = odl.tomo.cone_beam_geometry(space, src_radius=5,
+                                           det_radius=5, num_angles=10)
+
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl=impl)
+    batched = odl.tomo.BatchedRayTransform(ray_trafo, 3)
+    assert batched.domain == space ** 3
+    assert batched.range == ray_trafo.range ** 3
+
+    vols = batched.domain.element(
+        [odl.phantom.shepp_logan(space, modified=True),
+         odl.phantom.cuboid(space),
+         space.one()])
+    projs = batched(vols)
+    for vol, proj in zip(vols, projs):
+        assert all_almost_equal(proj, ray_trafo(vol), places=4)
+
+    # Stacked array input
+    projs_arr = batched(vols.asarray())
+    assert all_almost_equal(projs_arr, projs)
+
+    # Adjoint
+    backprojs = batched.adjoint(projs)
+    for proj, backproj in zip(projs, backprojs):
+        assert all_almost_equal(backproj, ray_trafo.adjoint(proj), places=4)
+
+    # Matrix mode
+    if impl == 'numpy':
+        ray_trafo_mat = odl.tomo.RayTransform(space, geom, use_matrix=True)
+        batched_mat = odl.tomo.BatchedRayTransform(ray_trafo_mat, 3)
+        projs_mat = batched_mat(vols)
+        for vol, proj in zip(vols, projs_mat):
+            assert all_almost_equal(proj, ray_trafo_mat(vol), places=4)
+        backprojs_mat = batched_mat.adjoint(projs_mat)
+        for proj, backproj in zip(projs_mat, backprojs_mat):
+            assert all_almost_equal(backproj, ray_trafo_mat.adjoint(proj),
+                                    places=4)
+
+
+@skip_if_no_astra
+def test_astra_cpu_persistent():
+    """Test persistent and threaded ASTRA CPU projectors."""
+    space = odl.uniform_discr([-1, -1], [1, 1], (20, 20), dtype='float32')
+    geom = odl.tomo.cone_beam_geometry(space, src_radius=5, det_radius=5,
+                                       num_angles=10)
+    ray_trafo = odl.tomo.RayTransform(space, geom, impl='astra_cpu')
+    vol = noise_element(space)
+    proj = ray_trafo(vol)
+    backproj = ray_trafo.adjoint(proj)
+
+    for persistent, num_threads in [(True, None), (True, 3), (False, 3)]:
+        ray_trafo_pers = odl.tomo.RayTransform(
+            space, geom, impl='astra_cpu', persistent=persistent,
+            num_threads=num_threads)
+        for _ in range(2):
+            assert all_almost_equal(ray_trafo_pers(vol), proj, places=4)
+            assert all_almost_equal(ray_trafo_pers.adjoint(proj), backproj,
+                                    places=4)
+        # Only persistent projectors are kept
+        assert (ray_trafo_pers._astra_wrapper is not None) == persistent
+
+        batched = odl.tomo.BatchedRayTransform(ray_trafo_pers, 2)
+        projs = batched([vol, vol])
+        assert all_almost_equal(projs, [proj, proj], places=4)
+        assert all_almost_equal(batched.adjoint(projs), [backproj, backproj],
+                                places=4)
+
+
 def test_anisotropic_voxels(geometry):
     """Test projection and backprojection with anisotropic voxels."""
     ndim = geometry.ndim
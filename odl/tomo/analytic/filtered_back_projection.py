@@ -7,14 +7,103 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import print_function, division, absolute_import
+from collections import OrderedDict
 import numpy as np
+import threading
 
 from odl.discr import ResizingOperator
+from odl.operator import Operator
 from odl.trafos import FourierTransform, PYFFTW_AVAILABLE
+from odl.util import writable_array
 
 
-__all__ = ('fbp_op', 'fbp_filter_op', 'tam_danielson_window',
-           'parker_weighting')
+__all__ = ('fbp_op', 'fbp_filter_op', 'FBPFilterOperator', 'streaming_fbp',
+           'tam_danielson_window',
+           'parker_weighting', 'fbp_filter_cache_limits',
+           'clear_fbp_filter_cache')
+
+
+# LRU cache of FBP filter spectra, see `fbp_filter_op`. Values are
+# ``(spectrum, nbytes)`` pairs, the most recently used entry is last.
+# Only the spectra are shared. Operators, and thus their FFT plans, are
+# created anew in each call.
+_FILTER_CACHE = OrderedDict()
+_FILTER_CACHE_LOCK = threading.Lock()
+_FILTER_CACHE_LIMITS = {'max_entries': 16, 'max_bytes': 2 ** 30}
+
+
+def fbp_filter_cache_limits(max_entries=None, max_bytes=None):
+    """Get or set the size limits of the FBP filter cache.
+
+    The filter spectra computed by `fbp_filter_op` are cached, such that
+    subsequent calls with equivalent arguments only need to create a new
+    operator around them. When one of the limits is exceeded, the least
+    recently used filters are evicted.
+
+    Parameters
+    ----------
+    max_entries : nonnegative int, optional
+        Maximum number of cached filters. ``None`` means that the
+        current value is not changed.
+    max_bytes : nonnegative int, optional
+        Maximum total (estimated) size of the cached filters in bytes.
+        ``None`` means that the current value is not changed.
+
+    Returns
+    -------
+    limits : tuple of int
+        The current ``(max_entries, max_bytes)`` after the update.
+
+    See Also
+    --------
+    clear_fbp_filter_cache
+
+    Examples
+    --------
+    >>> old_limits = odl.tomo.fbp_filter_cache_limits(max_entries=4)
+    >>> odl.tomo.fbp_filter_cache_limits()[0]
+    4
+    >>> limits = odl.tomo.fbp_filter_cache_limits(*old_limits)
+    """
+    with _FILTER_CACHE_LOCK:
+        for name, value in [('max_entries', max_entries),
+                            ('max_bytes', max_bytes)]:
+            if value is None:
+                continue
+            value, value_in = int(value), value
+            if value != value_in or value < 0:
+                raise ValueError('`{}` must be a nonnegative integer, got {}'
+                                 ''.format(name, value_in))
+            _FILTER_CACHE_LIMITS[name] = value
+
+        _evict_filters()
+        return (_FILTER_CACHE_LIMITS['max_entries'],
+                _FILTER_CACHE_LIMITS['max_bytes'])
+
+
+def clear_fbp_filter_cache():
+    """Remove all filters from the FBP filter cache.
+
+    See Also
+    --------
+    fbp_filter_cache_limits
+    """
+    with _FILTER_CACHE_LOCK:
+        _FILTER_CACHE.clear()
+
+
+def _evict_filters():
+    """Drop least recently used filters until the cache limits hold.
+
+    The caller must hold ``_FILTER_CACHE_LOCK``.
+    """
+    max_entries = _FILTER_CACHE_LIMITS['max_entries']
+    max_bytes = _FILTER_CACHE_LIMITS['max_bytes']
+    total_bytes = sum(nbytes for _, nbytes in _FILTER_CACHE.values())
+    while _FILTER_CACHE and (len(_FILTER_CACHE) > max_entries or
+                             total_bytes > max_bytes):
+        _, (_, nbytes) = _FILTER_CACHE.popitem(last=False)
+        total_bytes -= nbytes
 
 
 def _axis_in_detector(geometry):
@@ -295,8 +384,241 @@ def parker_weighting(ray_trafo, q=0.25):
         np.broadcast_to(S_sum * scale, ray_trafo.range.shape))
 
 
+class FBPFilterOperator(Operator):
+
+    """Filtering along one detector axis using real FFTs.
+
+    The operator zero-pads the data along ``axis``, computes the
+    real-to-halfcomplex FFT along that axis, multiplies with a real
+    filter and transforms back. These steps are done in one pass over
+    chunks of angles (axis 0), such that only temporaries of the chunk
+    size are needed, and padding is done implicitly by the FFT.
+
+    This is the filtering step of `fbp_op` for all geometries where the
+    filter direction is aligned with a detector axis.
+    """
+
+    def __init__(self, space, axis, kernel, padded_size, chunk_size=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `DiscreteLp`
+            Domain and range of the operator, the projection data space.
+        axis : int
+            Axis of ``space`` along which the filter is applied. It
+            cannot be 0 since the data is processed in chunks along that
+            axis.
+        kernel : `array-like`
+            Real filter values at the nonnegative frequencies of a real FFT
+            of length ``padded_size``, i.e., with
+            ``padded_size // 2 + 1`` entries.
+        padded_size : int
+            Length to which the data is zero-padded along ``axis``. It
+            must be at least ``space.shape[axis]``.
+        chunk_size : positive int, optional
+            Number of angles (entries along axis 0) filtered at a time.
+            For ``None``, it is chosen such that the complex temporaries
+            have roughly ``2 ** 22`` entries.
+
+        Examples
+        --------
+        Using the filter ``[1, 1]`` (identity) for length 3:
+
+        >>> space = odl.uniform_discr([0, 0], [1, 1], (2, 3))
+        >>> op = FBPFilterOperator(space, axis=1, kernel=[1, 1],
+        ...                        padded_size=3)
+        >>> x = space.element([[1, 2, 3], [4, 5, 6]])
+        >>> op(x) == x
+        True
+        """
+        super(FBPFilterOperator, self).__init__(
+            domain=space, range=space, linear=True)
+
+        axis, axis_in = int(axis), axis
+        if axis != axis_in or not 0 < axis < space.ndim:
+            raise ValueError('`axis` must be an integer between 1 and {}, '
+                             'got {}'.format(space.ndim - 1, axis_in))
+
+        padded_size, padded_size_in = int(padded_size), padded_size
+        if (padded_size != padded_size_in or
+                padded_size < space.shape[axis]):
+            raise ValueError('`padded_size` must be an integer >= {}, '
+                             'got {}'.format(space.shape[axis],
+                                             padded_size_in))
+
+        kernel = np.asarray(kernel, dtype=float).reshape(-1)
+        if kernel.shape != (padded_size // 2 + 1,):
+            raise ValueError('`kernel` must have shape {}, got {}'
+                             ''.format((padded_size // 2 + 1,),
+                                       kernel.shape))
+
+        if chunk_size is None:
+            num_per_angle = max(space.size // max(space.shape[0], 1), 1)
+            num_per_angle *= (padded_size // 2 + 1) / space.shape[axis]
+            chunk_size = max(int(2 ** 22 / num_per_angle), 1)
+        else:
+            chunk_size, chunk_size_in = int(chunk_size), chunk_size
+            if chunk_size != chunk_size_in or chunk_size <= 0:
+                raise ValueError('`chunk_size` must be a positive integer, '
+                                 'got {}'.format(chunk_size_in))
+
+        self.__axis = axis
+        self.__padded_size = padded_size
+        self.__chunk_size = chunk_size
+
+        # Shape the kernel such that it broadcasts along `axis`
+        bcast_shape = [1] * space.ndim
+        bcast_shape[axis] = kernel.size
+        self.__kernel = kernel.reshape(bcast_shape)
+
+        # FFTW plans per thread, created on first use, see `_fftw_plans`
+        self.__fftw_plans = threading.local()
+
+    @property
+    def axis(self):
+        """Axis along which the filter is applied."""
+        return self.__axis
+
+    @property
+    def kernel(self):
+        """Filter values at the nonnegative real FFT frequencies."""
+        return self.__kernel.ravel()
+
+    @property
+    def padded_size(self):
+        """Length of the zero-padded data along `axis`."""
+        return self.__padded_size
+
+    @property
+    def chunk_size(self):
+        """Number of angles that are filtered at a time."""
+        return self.__chunk_size
+
+    def _fftw_plans(self, shape):
+        """Return the forward and backward FFTW plans for ``shape``.
+
+        The plans are kept per thread since they hold their own arrays,
+        and they are created for each chunk shape on first use.
+        """
+        plans = getattr(self.__fftw_plans, 'plans', None)
+        if plans is None:
+            plans = self.__fftw_plans.plans = {}
+
+        if shape not in plans:
+            # Lazy import to improve `import odl` time
+            import multiprocessing
+            import pyfftw.builders
+
+            threads = multiprocessing.cpu_count()
+            fwd = pyfftw.builders.rfft(
+                np.empty(shape, dtype=float), n=self.padded_size,
+                axis=self.axis, threads=threads)
+            bwd = pyfftw.builders.irfft(
+                fwd.output_array, n=self.padded_size, axis=self.axis,
+                threads=threads)
+            plans[shape] = (fwd, bwd)
+
+        return plans[shape]
+
+    def _filter_real(self, arr):
+        """Return the filtered real array ``arr``.
+
+        With pyfftw, the result may be a view of an internal array that
+        is overwritten in the next call.
+        """
+        if PYFFTW_AVAILABLE:
+            fwd, bwd = self._fftw_plans(arr.shape)
+            arr_f = fwd(arr)
+            arr_f *= self.__kernel
+            result = bwd(arr_f)
+        else:
+            arr_f = np.fft.rfft(arr, n=self.padded_size, axis=self.axis)
+            arr_f *= self.__kernel
+            result = np.fft.irfft(arr_f, n=self.padded_size, axis=self.axis)
+
+        slc = [slice(None)] * arr.ndim
+        slc[self.axis] = slice(arr.shape[self.axis])
+        return result[tuple(slc)]
+
+    def filter_chunk(self, arr, out=None):
+        """Filter projections for a subset of angles.
+
+        Since the filter acts along detector axes only, projections can
+        be filtered independently, e.g., in chunks read from a file.
+
+        Parameters
+        ----------
+        arr : `array-like`
+            Projections with shape ``(k,) + domain.shape[1:]``, where ``k``
+            is an arbitrary number of angles.
+        out : `numpy.ndarray`, optional
+            Array of the same shape as ``arr`` to which the result is
+            written.
+
+        Returns
+        -------
+        out : `numpy.ndarray`
+            The filtered projections. If ``out`` was provided, the returned
+            object is a reference to it.
+
+        Examples
+        --------
+        Filtering in chunks gives the same result as filtering at once:
+
+        >>> space = odl.uniform_discr([0, 0], [1, 1], (4, 3))
+        >>> op = FBPFilterOperator(space, axis=1, kernel=[1, 0.5, 0.5],
+        ...                        padded_size=4)
+        >>> x = space.element(np.arange(12).reshape(4, 3))
+        >>> chunks = [op.filter_chunk(x.asarray()[:3]),
+        ...           op.filter_chunk(x.asarray()[3:])]
+        >>> np.allclose(np.vstack(chunks), op(x))
+        True
+        """
+        arr = np.asarray(arr)
+        if (arr.ndim != self.domain.ndim or
+                arr.shape[1:] != self.domain.shape[1:]):
+            raise ValueError('`arr` must have shape (k,) + {}, got {}'
+                             ''.format(self.domain.shape[1:], arr.shape))
+        if out is None:
+            out = np.empty(arr.shape, dtype=self.range.dtype)
+        elif out.shape != arr.shape:
+            raise ValueError('`out.shape` must be {}, got {}'
+                             ''.format(arr.shape, out.shape))
+
+        if np.iscomplexobj(out):
+            out.real = self._filter_real(arr.real)
+            out.imag = self._filter_real(arr.imag)
+        else:
+            out[:] = self._filter_real(arr)
+        return out
+
+    def _call(self, x, out):
+        """Filter ``x`` and write the result to ``out``."""
+        x_arr = x.asarray()
+        with writable_array(out) as out_arr:
+            for start in range(0, x_arr.shape[0], self.chunk_size):
+                chunk = slice(start, start + self.chunk_size)
+                self.filter_chunk(x_arr[chunk], out_arr[chunk])
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator, which is the operator itself.
+
+        The filter acts as convolution with a real and even kernel, hence
+        it is self-adjoint.
+        """
+        return self
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, axis={}, kernel={}, padded_size={})'.format(
+            self.__class__.__name__, self.domain, self.axis,
+            np.array2string(self.kernel, separator=', '), self.padded_size)
+
+
 def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
-                  frequency_scaling=1.0):
+                  frequency_scaling=1.0, use_cache=True):
     """Create a filter operator for FBP from a `RayTransform`.
 
     Parameters
@@ -333,6 +655,14 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         The normalized frequencies are rescaled so that they fit into the range
         [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
         set to zero.
+    use_cache : bool, optional
+        If ``True``, the filter spectrum is taken from, or stored in, a
+        module-level cache. It is shared by all calls with the same ray
+        transform range, filter parameters and geometry properties that
+        determine the filter, which saves its computation. The returned
+        operator is new in each call, so it can be used concurrently with
+        operators from other calls. See `fbp_filter_cache_limits` for
+        the size of the cache.
 
     Returns
     -------
@@ -342,44 +672,19 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
     See Also
     --------
     tam_danielson_window : Windowing for helical data
+    fbp_filter_cache_limits : Size of the filter cache
     """
     impl = 'pyfftw' if PYFFTW_AVAILABLE else 'numpy'
     alen = ray_trafo.geometry.motion_params.length
 
     if ray_trafo.domain.ndim == 2:
-        # Define ramp filter
-        def fourier_filter(x):
-            abs_freq = np.abs(x[1])
-            norm_freq = abs_freq / np.max(abs_freq)
-            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
-            scaling = 1 / (2 * alen)
-            return filt * abs_freq * scaling
-
-        # Define (padded) fourier transform
-        if padding:
-            # Define padding operator
-            ran_shp = (ray_trafo.range.shape[0],
-                       ray_trafo.range.shape[1] * 2 - 1)
-            resizing = ResizingOperator(ray_trafo.range, ran_shp=ran_shp)
-
-            fourier = FourierTransform(resizing.range, axes=1, impl=impl)
-            fourier = fourier * resizing
-        else:
-            fourier = FourierTransform(ray_trafo.range, axes=1, impl=impl)
+        rot_dir = None
+        scale = 1.0
 
     elif ray_trafo.domain.ndim == 3:
         # Find the direction that the filter should be taken in
         rot_dir = _rotation_direction_in_detector(ray_trafo.geometry)
 
-        # Find what axes should be used in the fourier transform
-        used_axes = (rot_dir != 0)
-        if used_axes[0] and not used_axes[1]:
-            axes = [1]
-        elif not used_axes[0] and used_axes[1]:
-            axes = [2]
-        else:
-            axes = [1, 2]
-
         # Add scaling for cone-beam case
         if hasattr(ray_trafo.geometry, 'src_radius'):
             scale = (ray_trafo.geometry.src_radius /
@@ -395,50 +700,9 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
                 scale *= alen / (np.pi)
         else:
             scale = 1.0
-
-        # Define ramp filter
-        def fourier_filter(x):
-            # If axis is aligned to a coordinate axis, save some memory and
-            # time by using broadcasting
-            if not used_axes[0]:
-                abs_freq = np.abs(rot_dir[1] * x[2])
-            elif not used_axes[1]:
-                abs_freq = np.abs(rot_dir[0] * x[1])
-            else:
-                abs_freq = np.abs(rot_dir[0] * x[1] + rot_dir[1] * x[2])
-            norm_freq = abs_freq / np.max(abs_freq)
-            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
-            scaling = scale / (2 * alen)
-            return filt * abs_freq * scaling
-
-        # Define (padded) fourier transform
-        if padding:
-            # Define padding operator
-            if used_axes[0]:
-                padded_shape_u = ray_trafo.range.shape[1] * 2 - 1
-            else:
-                padded_shape_u = ray_trafo.range.shape[1]
-
-            if used_axes[1]:
-                padded_shape_v = ray_trafo.range.shape[2] * 2 - 1
-            else:
-                padded_shape_v = ray_trafo.range.shape[2]
-
-            ran_shp = (ray_trafo.range.shape[0],
-                       padded_shape_u,
-                       padded_shape_v)
-            resizing = ResizingOperator(ray_trafo.range, ran_shp=ran_shp)
-
-            fourier = FourierTransform(resizing.range, axes=axes, impl=impl)
-            fourier = fourier * resizing
-        else:
-            fourier = FourierTransform(ray_trafo.range, axes=axes, impl=impl)
     else:
         raise NotImplementedError('FBP only implemented in 2d and 3d')
 
-    # Create ramp in the detector direction
-    ramp_function = fourier.range.element(fourier_filter)
-
     weight = 1
     if not ray_trafo.range.is_weighted:
         # Compensate for potentially unweighted range of the ray transform
@@ -448,14 +712,137 @@ def fbp_filter_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         # Compensate for potentially unweighted domain of the ray transform
         weight /= ray_trafo.domain.cell_volume
 
-    ramp_function *= weight
+    # The filter is fully determined by these parameters
+    cache_key = (ray_trafo.range, impl, bool(padding), filter_type,
+                 float(frequency_scaling), float(alen),
+                 None if rot_dir is None else tuple(rot_dir),
+                 float(scale), float(weight))
+    if use_cache:
+        with _FILTER_CACHE_LOCK:
+            entry = _FILTER_CACHE.pop(cache_key, None)
+            if entry is not None:
+                # Move to the end to mark as most recently used
+                _FILTER_CACHE[cache_key] = entry
+        if entry is not None:
+            return _filter_op_from_spectrum(ray_trafo.range, entry[0])
+
+    # Find the detector axis along which the filter is taken, if the
+    # filter direction is aligned with one
+    if rot_dir is None:
+        filter_axis = 1
+    elif rot_dir[1] == 0:
+        filter_axis = 1
+    elif rot_dir[0] == 0:
+        filter_axis = 2
+    else:
+        filter_axis = None
+
+    if filter_axis is not None:
+        # Fused filtering with real FFTs along one axis
+        size = ray_trafo.range.shape[filter_axis]
+        cell_side = ray_trafo.range.cell_sides[filter_axis]
+        freq_scale = 1.0 if rot_dir is None else abs(rot_dir[filter_axis - 1])
+        fourier_size = 2 * size - 1 if padding else size
+
+        def ramp(abs_freq):
+            norm_freq = abs_freq / np.max(abs_freq)
+            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
+            return filt * abs_freq * (weight * scale / (2 * alen))
+
+        if fourier_size % 2 == 0:
+            # The filter is a circular convolution on the FFT grid
+            padded_size = fourier_size
+            abs_freq = 2 * np.pi * np.fft.rfftfreq(fourier_size, d=cell_side)
+            kernel = ramp(abs_freq * freq_scale)
+        else:
+            # For odd sizes, the reciprocal grid of `FourierTransform` is
+            # shifted by half a stride, which makes the filter a linear
+            # convolution. We compute its kernel in real space and embed it
+            # into a circular one of sufficient length, for which the FFT
+            # is fast.
+            # Lazy import to improve `import odl` time
+            from scipy.fftpack import next_fast_len
+
+            freq_stride = 2 * np.pi / (fourier_size * cell_side)
+            abs_freq = freq_stride * (np.arange(fourier_size // 2 + 1) + 0.5)
+            filt_vals = ramp(abs_freq * freq_scale)
+            filt_vals[-1] /= 2
+            phase = np.exp(1j * np.pi * np.arange(size) / fourier_size)
+            conv_kernel = 2 * np.real(
+                phase * np.fft.ifft(filt_vals, n=fourier_size)[:size])
+            padded_size = next_fast_len(2 * size - 1)
+            circ_kernel = np.zeros(padded_size)
+            circ_kernel[:size] = conv_kernel
+            circ_kernel[padded_size - size + 1:] = conv_kernel[:0:-1]
+            kernel = np.ascontiguousarray(np.fft.rfft(circ_kernel).real)
+
+        # The kernel is shared by all operators created from the cache
+        kernel.flags.writeable = False
+        spectrum = {'axis': filter_axis, 'kernel': kernel,
+                    'padded_size': padded_size}
+        nbytes = kernel.nbytes
+
+    else:
+        # Define ramp filter
+        def fourier_filter(x):
+            abs_freq = np.abs(rot_dir[0] * x[1] + rot_dir[1] * x[2])
+            norm_freq = abs_freq / np.max(abs_freq)
+            filt = _fbp_filter(norm_freq, filter_type, frequency_scaling)
+            scaling = scale / (2 * alen)
+            return filt * abs_freq * scaling
+
+        # Create ramp in the detector direction
+        fourier = _filter_fourier_op(ray_trafo.range, padding, impl)
+        ramp_function = fourier.range.element(fourier_filter)
+        ramp_function *= weight
+
+        spectrum = {'ramp_function': ramp_function, 'padding': padding,
+                    'impl': impl}
+        nbytes = ramp_function.size * ramp_function.space.dtype.itemsize
+
+    if use_cache:
+        with _FILTER_CACHE_LOCK:
+            _FILTER_CACHE[cache_key] = (spectrum, nbytes)
+            _evict_filters()
+
+    return _filter_op_from_spectrum(ray_trafo.range, spectrum)
+
+
+def _filter_fourier_op(space, padding, impl):
+    """Return the (padded) Fourier transform used for general filters."""
+    if padding:
+        # Define padding operator
+        ran_shp = (space.shape[0],
+                   space.shape[1] * 2 - 1,
+                   space.shape[2] * 2 - 1)
+        resizing = ResizingOperator(space, ran_shp=ran_shp)
+
+        fourier = FourierTransform(resizing.range, axes=[1, 2], impl=impl)
+        return fourier * resizing
+    else:
+        return FourierTransform(space, axes=[1, 2], impl=impl)
+
 
-    # Create ramp filter via the convolution formula with fourier transforms
-    return fourier.inverse * ramp_function * fourier
+def _filter_op_from_spectrum(space, spectrum):
+    """Return a new filter operator for ``spectrum``.
+
+    ``spectrum`` is a dictionary as stored in the filter cache, see
+    `fbp_filter_op`. The returned operator does not share any mutable
+    state, e.g., FFT plans or temporaries, with other filter operators.
+    """
+    if 'axis' in spectrum:
+        return FBPFilterOperator(space, spectrum['axis'], spectrum['kernel'],
+                                 spectrum['padded_size'])
+    else:
+        # Create ramp filter via the convolution formula with fourier
+        # transforms
+        fourier = _filter_fourier_op(space, spectrum['padding'],
+                                     spectrum['impl'])
+        return fourier.inverse * spectrum['ramp_function'] * fourier
 
 
 def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
-           frequency_scaling=1.0):
+           frequency_scaling=1.0, use_cache=True):
     """Create filtered back-projection operator from a `RayTransform`.
 
     The filtered back-projection is an approximate inverse to the ray
@@ -495,6 +882,10 @@ def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
         The normalized frequencies are rescaled so that they fit into the range
         [0, frequency_scaling]. Any frequency above ``frequency_scaling`` is
         set to zero.
+    use_cache : bool, optional
+        If ``True``, the filter spectrum is taken from, or stored in, the
+        cache of `fbp_filter_op`. The filter operator is created anew in
+        each call.
 
     Returns
     -------
@@ -506,7 +897,176 @@ def fbp_op(ray_trafo, padding=True, filter_type='Ram-Lak',
     tam_danielson_window : Windowing for helical data
     """
     return ray_trafo.adjoint * fbp_filter_op(ray_trafo, padding, filter_type,
-                                             frequency_scaling)
+                                             frequency_scaling, use_cache)
+
+
+def streaming_fbp(ray_trafo, data, chunk_size=None, out=None, padding=True,
+                  filter_type='Ram-Lak', frequency_scaling=1.0):
+    """Compute a filtered back-projection from data in angular chunks.
+
+    The projection data is filtered and back-projected chunk by chunk, and
+    the back-projections are accumulated in the output volume. Thus, the
+    full data never needs to be in memory at once; peak memory is
+    bounded by one chunk of data plus two volumes.
+
+    The result is the same as ``fbp_op(ray_trafo, ...)(data)``.
+
+    Parameters
+    ----------
+    ray_trafo : `RayTransform`
+        The ray transform (forward operator) for the full data. Its
+        geometry must support indexing along the angle axis, and the filter
+        direction must be aligned with a detector axis, see
+        `FBPFilterOperator`.
+    data : `array-like` or iterable
+        The projection data. If ``data`` has a ``shape`` attribute, e.g.,
+        a `numpy.memmap` or an array of an HDF5 file, it is read in slices
+        of ``chunk_size`` angles along axis 0. Otherwise, it is taken as
+        an iterable yielding consecutive chunks of projections with shapes
+        ``(k,) + ray_trafo.range.shape[1:]``.
+    chunk_size : positive int, optional
+        Number of angles per chunk for ``data`` with ``shape``.
+        For ``None``, chunks of roughly ``2 ** 24`` values are used.
+    out : ``ray_trafo.domain`` element, optional
+        Element to which the result is written.
+    padding, filter_type, frequency_scaling :
+        Parameters for the filter, see `fbp_op`.
+
+    Returns
+    -------
+    out : ``ray_trafo.domain`` element
+        The result of the filtered back-projection. If ``out`` was
+        provided, the returned object is a reference to it.
+
+    See Also
+    --------
+    fbp_op : Filtered back-projection for data in memory
+    odl.contrib.mrc.FileReaderMRC : Reader for MRC data files
+
+    Examples
+    --------
+    Reconstruct from data in a memory-mapped file, which could be
+    larger than the available memory:
+
+    >>> import tempfile
+    >>> space = odl.uniform_discr([-1, -1], [1, 1], (20, 20))
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=30)
+    >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+    >>> proj = ray_trafo(odl.phantom.shepp_logan(space, modified=True))
+    >>> with tempfile.TemporaryFile() as f:
+    ...     data = np.memmap(f, dtype=proj.dtype, shape=proj.shape)
+    ...     data[:] = proj
+    ...     reco = odl.tomo.streaming_fbp(ray_trafo, data, chunk_size=7)
+    >>> fbp = odl.tomo.fbp_op(ray_trafo)
+    >>> (reco - fbp(proj)).norm() < 1e-4 * reco.norm()
+    True
+
+    Chunks can also be supplied by an iterable, e.g., a generator:
+
+    >>> chunks = (proj.asarray()[i:i + 10] for i in range(0, 30, 10))
+    >>> reco = odl.tomo.streaming_fbp(ray_trafo, chunks)
+    >>> (reco - fbp(proj)).norm() < 1e-4 * reco.norm()
+    True
+    """
+    # Avoid circular import
+    from odl.tomo.operators import RayTransform
+
+    filter_op = fbp_filter_op(ray_trafo, padding, filter_type,
+                              frequency_scaling)
+    if not isinstance(filter_op, FBPFilterOperator):
+        raise NotImplementedError('streaming FBP requires the filter '
+                                  'direction to be aligned with a detector '
+                                  'axis')
+
+    proj_space = ray_trafo.range
+    num_angles = proj_space.shape[0]
+    det_shape = proj_space.shape[1:]
+
+    if hasattr(data, 'shape'):
+        if tuple(data.shape) != proj_space.shape:
+            raise ValueError('`data.shape` must be {}, got {}'
+                             ''.format(proj_space.shape, tuple(data.shape)))
+        if chunk_size is None:
+            det_size = int(np.prod(det_shape))
+            chunk_size = max(2 ** 24 // max(det_size, 1), 1)
+        else:
+            chunk_size, chunk_size_in = int(chunk_size), chunk_size
+            if chunk_size != chunk_size_in or chunk_size <= 0:
+                raise ValueError('`chunk_size` must be a positive integer, '
+                                 'got {}'.format(chunk_size_in))
+
+        chunks = (data[i:i + chunk_size]
+                  for i in range(0, num_angles, chunk_size))
+    else:
+        chunks = data
+
+    if out is None:
+        out = ray_trafo.domain.zero()
+    elif out not in ray_trafo.domain:
+        raise TypeError('`out` {!r} is not an element of the domain {!r} '
+                        'of the ray transform'
+                        ''.format(out, ray_trafo.domain))
+    else:
+        out.set_zero()
+
+    # With `use_matrix`, the chunks are back-projected with row blocks of
+    # the matrix of the full ray transform. Assembling (and storing) a
+    # matrix per chunk would be more expensive than the full FBP.
+    kwargs = dict(ray_trafo._extra_kwargs)
+    if ray_trafo.impl == 'numpy' and kwargs.pop('use_matrix', False):
+        matrix = ray_trafo._numpy_matrix(ray_trafo.domain.real_space)
+        det_size = int(np.prod(det_shape))
+        matrix_scaling = (float(proj_space.weighting.const) /
+                          float(ray_trafo.domain.weighting.const))
+    else:
+        matrix = None
+    kwargs.pop('matrix_dir', None)
+
+    tmp = ray_trafo.domain.element()
+    start = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        if chunk.shape[1:] != det_shape:
+            raise ValueError('chunks must have shape (k,) + {}, got {}'
+                             ''.format(det_shape, chunk.shape))
+        stop = start + chunk.shape[0]
+        if stop > num_angles:
+            raise ValueError('got more than {} projections'
+                             ''.format(num_angles))
+
+        if matrix is not None:
+            filtered = filter_op.filter_chunk(chunk)
+            rows = matrix[start * det_size:stop * det_size]
+            tmp[:] = rows.T.dot(filtered.ravel()).reshape(tmp.shape)
+            out.lincomb(1, out, matrix_scaling, tmp)
+            start = stop
+            continue
+
+        sub_ray_trafo = RayTransform(ray_trafo.domain,
+                                     ray_trafo.geometry[start:stop],
+                                     impl=ray_trafo.impl,
+                                     use_cache=ray_trafo.use_cache,
+                                     **kwargs)
+        filtered = sub_ray_trafo.range.element()
+        with writable_array(filtered) as filtered_arr:
+            filter_op.filter_chunk(chunk, filtered_arr)
+
+        # Make the range weighting of the chunk consistent with the full
+        # range, otherwise the back-projections do not sum up
+        factor = 1.0
+        if proj_space.is_weighted:
+            factor = (float(proj_space.weighting.const) /
+                      float(sub_ray_trafo.range.weighting.const))
+
+        sub_ray_trafo.adjoint(filtered, out=tmp)
+        out.lincomb(1, out, factor, tmp)
+        start = stop
+
+    if start != num_angles:
+        raise ValueError('expected {} projections, got {}'
+                         ''.format(num_angles, start))
+
+    return out
 
 
 if __name__ == '__main__':
@@ -23,5 +23,8 @@ __all__ += astra_cpu.__all__
 from .astra_cuda import *
 __all__ += astra_cuda.__all__
 
+from .numpy_ray_trafo import *
+__all__ += numpy_ray_trafo.__all__
+
 from .skimage_radon import *
 __all__ += skimage_radon.__all__
@@ -9,6 +9,9 @@
 """Backend for ASTRA using CPU."""
 
 from __future__ import print_function, division, absolute_import
+from builtins import object
+from multiprocessing import Lock
+from multiprocessing.pool import ThreadPool
 import numpy as np
 try:
     import astra
@@ -23,7 +26,10 @@ from odl.tomo.geometry import Geometry
 from odl.util import writable_array
 
 
-__all__ = ('astra_cpu_forward_projector', 'astra_cpu_back_projector')
+__all__ = ('astra_cpu_forward_projector', 'astra_cpu_back_projector',
+           'astra_cpu_forward_projector_batch',
+           'astra_cpu_back_projector_batch',
+           'AstraCpuProjectorImpl', 'AstraCpuBackProjectorImpl')
 
 
 # TODO: use context manager when creating data structures
@@ -210,6 +216,439 @@ def astra_cpu_back_projector(proj_data, geometry, reco_space, out=None):
     return out
 
 
+def astra_cpu_forward_projector_batch(vol_arr, geometry, vol_space,
+                                      out_arr):
+    """Run ASTRA forward projections of a stack of volumes using the CPU.
+
+    The ASTRA geometries, the projector, the data objects and the
+    algorithm are created only once and reused for all volumes.
+
+    Parameters
+    ----------
+    vol_arr : `numpy.ndarray`
+        Stack of volumes with shape ``(N,) + vol_space.shape``.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    vol_space : `DiscreteLp`
+        Space of the individual volumes.
+    out_arr : `numpy.ndarray`
+        Array with shape ``(N,) + geometry.partition.shape`` to which the
+        projections are written.
+
+    Returns
+    -------
+    out_arr : `numpy.ndarray`
+        The ``out_arr`` parameter, containing the projections.
+    """
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry  {!r} is not a Geometry instance'
+                        ''.format(geometry))
+    if not isinstance(vol_space, DiscreteLp):
+        raise TypeError('`vol_space` {!r} is not a DiscreteLp '
+                        'instance.'.format(vol_space))
+    if vol_space.ndim != geometry.ndim:
+        raise ValueError('dimensions {} of volume space and {} of geometry '
+                         'do not match'
+                         ''.format(vol_space.ndim, geometry.ndim))
+    if not all(s == vol_space.interp_byaxis[0]
+               for s in vol_space.interp_byaxis):
+        raise ValueError('volume interpolation must be the same in each '
+                         'dimension, got {}'.format(vol_space.interp))
+
+    ndim = vol_space.ndim
+
+    # Create astra geometries and projector
+    vol_geom = astra_volume_geometry(vol_space)
+    proj_geom = astra_projection_geometry(geometry)
+    proj_id = astra_projector(vol_space.interp, vol_geom, proj_geom, ndim,
+                              impl='cpu')
+
+    # Create ASTRA data structures linked to buffers that are refilled
+    # for each volume
+    vol_buf = np.empty(vol_space.shape, dtype='float32')
+    sino_buf = np.empty(geometry.partition.shape, dtype='float32')
+    vol_id = astra_data(vol_geom, datatype='volume', data=vol_buf)
+    sino_id = astra_data(proj_geom, datatype='projection', data=sino_buf)
+
+    # Create algorithm
+    algo_id = astra_algorithm('forward', ndim, vol_id, sino_id, proj_id,
+                              impl='cpu')
+
+    try:
+        for i in range(len(vol_arr)):
+            vol_buf[:] = vol_arr[i]
+            sino_buf.fill(0)
+            astra.algorithm.run(algo_id)
+            out_arr[i] = sino_buf
+    finally:
+        # Delete ASTRA objects
+        astra.algorithm.delete(algo_id)
+        astra.data2d.delete((vol_id, sino_id))
+        astra.projector.delete(proj_id)
+
+    return out_arr
+
+
+def astra_cpu_back_projector_batch(proj_arr, geometry, proj_space,
+                                   reco_space, out_arr):
+    """Run ASTRA back-projections of a stack of data sets using the CPU.
+
+    The ASTRA geometries, the projector, the data objects and the
+    algorithm are created only once and reused for all data sets.
+
+    Parameters
+    ----------
+    proj_arr : `numpy.ndarray`
+        Stack of projection data sets with shape
+        ``(N,) + proj_space.shape``.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    proj_space : `DiscreteLp`
+        Space of the individual projection data sets.
+    reco_space : `DiscreteLp`
+        Space of the individual back-projections.
+    out_arr : `numpy.ndarray`
+        Array with shape ``(N,) + reco_space.shape`` to which the
+        back-projections are written.
+
+    Returns
+    -------
+    out_arr : `numpy.ndarray`
+        The ``out_arr`` parameter, containing the back-projections.
+    """
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry  {!r} is not a Geometry instance'
+                        ''.format(geometry))
+    if not isinstance(proj_space, DiscreteLp):
+        raise TypeError('`proj_space` {!r} is not a DiscreteLp '
+                        'instance'.format(proj_space))
+    if not isinstance(reco_space, DiscreteLp):
+        raise TypeError('reconstruction space {!r} is not a DiscreteLp '
+                        'instance'.format(reco_space))
+    if reco_space.ndim != geometry.ndim:
+        raise ValueError('dimensions {} of reconstruction space and {} of '
+                         'geometry do not match'.format(
+                             reco_space.ndim, geometry.ndim))
+    if not all(s == proj_space.interp_byaxis[0]
+               for s in proj_space.interp_byaxis):
+        raise ValueError('data interpolation must be the same in each '
+                         'dimension, got {}'
+                         ''.format(proj_space.interp_byaxis))
+
+    ndim = reco_space.ndim
+
+    # Create astra geometries and projector
+    vol_geom = astra_volume_geometry(reco_space)
+    proj_geom = astra_projection_geometry(geometry)
+    proj_id = astra_projector(proj_space.interp, vol_geom, proj_geom, ndim,
+                              impl='cpu')
+
+    # Create ASTRA data structures linked to buffers that are refilled
+    # for each data set
+    sino_buf = np.empty(proj_space.shape, dtype='float32')
+    vol_buf = np.empty(reco_space.shape, dtype='float32')
+    sino_id = astra_data(proj_geom, datatype='projection', data=sino_buf)
+    vol_id = astra_data(vol_geom, datatype='volume', data=vol_buf)
+
+    # Create algorithm
+    algo_id = astra_algorithm('backward', ndim, vol_id, sino_id, proj_id,
+                              impl='cpu')
+
+    # Weight the adjoint by appropriate weights
+    scaling_factor = float(proj_space.weighting.const)
+    scaling_factor /= float(reco_space.weighting.const)
+
+    try:
+        for i in range(len(proj_arr)):
+            sino_buf[:] = proj_arr[i]
+            vol_buf.fill(0)
+            astra.algorithm.run(algo_id)
+            out_arr[i] = vol_buf
+            out_arr[i] *= scaling_factor
+    finally:
+        # Delete ASTRA objects
+        astra.algorithm.delete(algo_id)
+        astra.data2d.delete((vol_id, sino_id))
+        astra.projector.delete(proj_id)
+
+    return out_arr
+
+
+class AstraCpuImplBase(object):
+
+    """Base class for persistent ASTRA CPU projectors.
+
+    The ASTRA geometries, projectors, data objects and algorithms are
+    created once and kept until `close` is called or the object is
+    deleted. They are linked to buffers that are refilled in each call.
+    The object can be used as a context manager that closes it on exit.
+
+    The angles of the geometry are split into contiguous sub-geometries,
+    one per thread, each with its own set of ASTRA objects. ASTRA releases
+    the GIL while running an algorithm, hence the sub-geometries are
+    processed in parallel.
+    """
+
+    def __init__(self, geometry, reco_space, proj_space, num_threads=1):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        geometry : `Geometry`
+            Geometry defining the tomographic setup.
+        reco_space : `DiscreteLp`
+            Reconstruction space, the space of the images.
+        proj_space : `DiscreteLp`
+            Projection space, the space of the projection data.
+        num_threads : positive int, optional
+            Number of threads, and thus of sub-geometries, used in one
+            call. The threads are started on first use and kept until
+            the object is closed.
+        """
+        assert isinstance(geometry, Geometry)
+        assert isinstance(reco_space, DiscreteLp)
+        assert isinstance(proj_space, DiscreteLp)
+        if geometry.ndim != 2:
+            raise ValueError('ASTRA CPU projectors only support 2D '
+                             'geometries, got a {}D geometry'
+                             ''.format(geometry.ndim))
+
+        self.geometry = geometry
+        self.reco_space = reco_space
+        self.proj_space = proj_space
+
+        num_angles = len(geometry.angles)
+        self.num_threads = max(min(int(num_threads), num_angles), 1)
+
+        # Angle ranges of the sub-geometries
+        bounds = np.linspace(0, num_angles, self.num_threads + 1)
+        bounds = bounds.round().astype(int)
+        self.angle_slices = [slice(start, stop)
+                             for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        self.algo_ids = []
+        self.data_ids = []
+        self.proj_ids = []
+        self.create_ids()
+        self._pool = None
+
+        # Create a mutually exclusive lock so that two callers cant use the
+        # same shared resource at the same time.
+        self._mutex = Lock()
+
+    def sub_geometries(self):
+        """Return the sub-geometries, one per angle slice."""
+        if len(self.angle_slices) == 1:
+            return [self.geometry]
+        else:
+            return [self.geometry[slc] for slc in self.angle_slices]
+
+    def create_ids(self):
+        """Create ASTRA objects, needs to be overridden."""
+        raise NotImplementedError('abstract method')
+
+    def run_algorithms(self):
+        """Run the algorithms of all sub-geometries."""
+        if not self.algo_ids:
+            raise RuntimeError('the projector has been closed')
+        if self.num_threads == 1:
+            for algo_id in self.algo_ids:
+                astra.algorithm.run(algo_id)
+        else:
+            if self._pool is None:
+                self._pool = ThreadPool(self.num_threads)
+            self._pool.map(astra.algorithm.run, self.algo_ids)
+
+    def close(self):
+        """Stop the threads and delete the ASTRA objects.
+
+        The object cannot be used anymore afterwards. Calling this method
+        more than once has no effect.
+        """
+        # `getattr` since this is also called if `__init__` fails
+        if getattr(self, '_pool', None) is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for algo_id in getattr(self, 'algo_ids', []):
+            astra.algorithm.delete(algo_id)
+        self.algo_ids = []
+        if getattr(self, 'data_ids', []):
+            astra.data2d.delete(self.data_ids)
+        self.data_ids = []
+        for proj_id in getattr(self, 'proj_ids', []):
+            astra.projector.delete(proj_id)
+        self.proj_ids = []
+
+    def __enter__(self):
+        """Return ``self`` in ``with`` statements."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the object at the end of ``with`` statements."""
+        self.close()
+
+    def __del__(self):
+        """Delete ASTRA objects and stop the threads."""
+        self.close()
+
+
+class AstraCpuProjectorImpl(AstraCpuImplBase):
+
+    """Persistent ASTRA forward projector using the CPU.
+
+    Each sub-geometry writes to its own part of the projection buffer,
+    see `AstraCpuImplBase`.
+    """
+
+    def call_forward(self, vol_data, out=None):
+        """Run an ASTRA forward projection on the given data using the CPU.
+
+        Parameters
+        ----------
+        vol_data : `reco_space` element
+            Volume data to which the projector is applied.
+        out : `proj_space` element, optional
+            Element of the projection space to which the result is written. If
+            ``None``, an element in `proj_space` is created.
+
+        Returns
+        -------
+        out : ``proj_space`` element
+            Projection data resulting from the application of the projector.
+            If ``out`` was provided, the returned object is a reference to it.
+        """
+        with self._mutex:
+            assert vol_data in self.reco_space
+            if out is not None:
+                assert out in self.proj_space
+            else:
+                out = self.proj_space.element()
+
+            self.in_array[:] = vol_data.asarray()
+            self.out_array.fill(0)
+            self.run_algorithms()
+            out[:] = self.out_array
+            return out
+
+    def create_ids(self):
+        """Create ASTRA objects."""
+        if not all(s == self.reco_space.interp_byaxis[0]
+                   for s in self.reco_space.interp_byaxis):
+            raise ValueError('volume interpolation must be the same in each '
+                             'dimension, got {}'
+                             ''.format(self.reco_space.interp))
+
+        self.in_array = np.empty(self.reco_space.shape,
+                                 dtype='float32', order='C')
+        self.out_array = np.empty(self.proj_space.shape,
+                                  dtype='float32', order='C')
+
+        vol_geom = astra_volume_geometry(self.reco_space)
+        for slc, geom in zip(self.angle_slices, self.sub_geometries()):
+            proj_geom = astra_projection_geometry(geom)
+            proj_id = astra_projector(self.reco_space.interp, vol_geom,
+                                      proj_geom, ndim=2, impl='cpu')
+            self.proj_ids.append(proj_id)
+
+            # All parts read from the same volume buffer
+            vol_id = astra_data(vol_geom, datatype='volume',
+                                data=self.in_array, ndim=2)
+            sino_id = astra_data(proj_geom, datatype='projection',
+                                 data=self.out_array[slc], ndim=2)
+            self.data_ids.extend([vol_id, sino_id])
+
+            algo_id = astra_algorithm('forward', 2, vol_id, sino_id, proj_id,
+                                      impl='cpu')
+            self.algo_ids.append(algo_id)
+
+
+class AstraCpuBackProjectorImpl(AstraCpuImplBase):
+
+    """Persistent ASTRA back-projector using the CPU.
+
+    Each sub-geometry back-projects into its own volume buffer, and the
+    buffers are summed up, see `AstraCpuImplBase`. Thus, the memory
+    overhead is ``num_threads`` volumes in single precision.
+    """
+
+    def call_backward(self, proj_data, out=None):
+        """Run an ASTRA back-projection on the given data using the CPU.
+
+        Parameters
+        ----------
+        proj_data : `proj_space` element
+            Projection data to which the back-projector is applied.
+        out : `reco_space` element, optional
+            Element of the reconstruction space to which the result is written.
+            If ``None``, an element in ``reco_space`` is created.
+
+        Returns
+        -------
+        out : ``reco_space`` element
+            Reconstruction data resulting from the application of the
+            back-projector. If ``out`` was provided, the returned object is a
+            reference to it.
+        """
+        with self._mutex:
+            assert proj_data in self.proj_space
+            if out is not None:
+                assert out in self.reco_space
+            else:
+                out = self.reco_space.element()
+
+            self.in_array[:] = proj_data.asarray()
+            for out_array in self.out_arrays:
+                out_array.fill(0)
+            self.run_algorithms()
+
+            result = self.out_arrays[0]
+            for out_array in self.out_arrays[1:]:
+                result += out_array
+            out[:] = result
+
+            # Weight the adjoint by appropriate weights
+            scaling_factor = float(self.proj_space.weighting.const)
+            scaling_factor /= float(self.reco_space.weighting.const)
+            out *= scaling_factor
+
+            return out
+
+    def create_ids(self):
+        """Create ASTRA objects."""
+        # TODO: implement with different schemes for angles and detector
+        if not all(s == self.proj_space.interp_byaxis[0]
+                   for s in self.proj_space.interp_byaxis):
+            raise ValueError('data interpolation must be the same in each '
+                             'dimension, got {}'
+                             ''.format(self.proj_space.interp_byaxis))
+
+        self.in_array = np.empty(self.proj_space.shape,
+                                 dtype='float32', order='C')
+        self.out_arrays = [np.empty(self.reco_space.shape,
+                                    dtype='float32', order='C')
+                           for _ in self.angle_slices]
+
+        vol_geom = astra_volume_geometry(self.reco_space)
+        for slc, geom, out_array in zip(self.angle_slices,
+                                        self.sub_geometries(),
+                                        self.out_arrays):
+            proj_geom = astra_projection_geometry(geom)
+            proj_id = astra_projector(self.proj_space.interp, vol_geom,
+                                      proj_geom, ndim=2, impl='cpu')
+            self.proj_ids.append(proj_id)
+
+            sino_id = astra_data(proj_geom, datatype='projection',
+                                 data=self.in_array[slc], ndim=2)
+            vol_id = astra_data(vol_geom, datatype='volume',
+                                data=out_array, ndim=2)
+            self.data_ids.extend([vol_id, sino_id])
+
+            algo_id = astra_algorithm('backward', 2, vol_id, sino_id,
+                                      proj_id, impl='cpu')
+            self.algo_ids.append(algo_id)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()
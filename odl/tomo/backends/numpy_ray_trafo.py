@@ -0,0 +1,717 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Ray transform in 2d and 3d using plain NumPy on the CPU.
+
+The forward projector is ray-driven: for a chunk of angles, all rays are
+set up at once and the volume is sampled with linear interpolation at
+equidistant points along each ray. The back-projector is voxel-driven:
+each voxel is projected onto the detector, and the projection data is
+linearly interpolated at that point, with the weights chosen such that
+the result approximates the adjoint of the forward projector.
+
+Both projectors split their work into independent chunks (angles for the
+forward projector, slabs of the volume for the back-projector) which are
+distributed across a pool of threads. Since NumPy releases the GIL in
+its array kernels, this scales with the number of cores.
+"""
+
+from __future__ import print_function, division, absolute_import
+import hashlib
+from itertools import product
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+import numpy as np
+import os
+import scipy.sparse
+
+from odl.discr import DiscreteLp, DiscreteLpElement
+from odl.tomo.geometry import (
+    Geometry, DivergentBeamGeometry, Flat1dDetector, Flat2dDetector)
+from odl.util import writable_array
+
+
+__all__ = ('numpy_forward_projector', 'numpy_back_projector',
+           'numpy_forward_projector_batch', 'numpy_back_projector_batch',
+           'numpy_ray_trafo_supports', 'numpy_ray_trafo_matrix')
+
+
+# Maximum number of interpolation points that are processed in one block.
+# This bounds the size of the temporary arrays per thread.
+_BLOCK_SIZE = 2 ** 18
+
+
+def numpy_ray_trafo_supports(geometry, reco_space):
+    """Check if the NumPy ray transform supports the given setting.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry of the ray transform.
+    reco_space : `DiscreteLp`
+        Reconstruction space of the ray transform.
+
+    Raises
+    ------
+    TypeError
+        If the geometry has an unsupported type of detector.
+    ValueError
+        If the geometry or the reconstruction space have unsupported
+        parameters.
+    """
+    if geometry.motion_params.ndim != 1:
+        raise ValueError('geometry must have a single motion parameter, '
+                         'got `motion_params.ndim == {}`'
+                         ''.format(geometry.motion_params.ndim))
+    if not isinstance(geometry.detector, (Flat1dDetector, Flat2dDetector)):
+        raise TypeError('geometry must have a flat detector, got {!r}'
+                        ''.format(geometry.detector))
+    if not geometry.det_partition.is_uniform:
+        raise ValueError('detector partition must be uniform')
+    if not reco_space.is_uniform:
+        raise ValueError('reconstruction space must be uniform')
+
+
+def _linear_interp_indices(shape, coords):
+    """Return lower corner indices and weights for linear interpolation.
+
+    The array to be interpolated is assumed to be padded with a border of
+    zeros of width 1. Coordinates are clamped to the array bounds such that
+    points outside of the original array only see the zero border. The
+    coordinate arrays must be mutually broadcastable and are modified in
+    place.
+
+    Returns
+    -------
+    indices : list of `numpy.ndarray`
+        Indices of the lower corner in each axis.
+    fracs : list of `numpy.ndarray`
+        Fractional offsets from the lower corner in each axis.
+    """
+    indices = []
+    fracs = []
+    for c, n in zip(coords, shape):
+        np.clip(c, 0, n - 1, out=c)
+        idx = c.astype(int)
+        np.minimum(idx, n - 2, out=idx)
+        c -= idx
+        indices.append(idx)
+        fracs.append(c)
+    return indices, fracs
+
+
+def _padded_linear_interp(arr, coords):
+    """Linearly interpolate the zero-padded ``arr`` at index ``coords``.
+
+    The last ``len(coords)`` axes of ``arr`` are interpolated, and the
+    remaining leading axes are treated as stack axes that are prepended
+    to the shape of the result. See `_linear_interp_indices` for details
+    on the coordinates.
+    """
+    ndim = len(coords)
+    shape = arr.shape[arr.ndim - ndim:]
+    flat_arr = arr.reshape(arr.shape[:arr.ndim - ndim] + (-1,))
+    strides = [int(np.prod(shape[i + 1:])) for i in range(ndim)]
+
+    indices, fracs = _linear_interp_indices(shape, coords)
+    base_idx = sum(idx * stride for idx, stride in zip(indices, strides))
+    fracs = [(1 - frac, frac) for frac in fracs]
+
+    result = 0
+    for corner in product((0, 1), repeat=ndim):
+        offset = sum(i * stride for i, stride in zip(corner, strides))
+        weight = 1
+        for i, frac in zip(corner, fracs):
+            weight = weight * frac[i]
+        result = result + weight * flat_arr.take(base_idx + offset, axis=-1)
+
+    return result
+
+
+def _det_vectors(geometry, angles):
+    """Return detector and source vectors for a number of angles.
+
+    Returns
+    -------
+    refpts : `numpy.ndarray`, shape ``(num_angles, ndim)``
+        Detector reference points.
+    axes : `numpy.ndarray`, shape ``(num_angles, ndim - 1, ndim)``
+        Rotated detector axes.
+    normals : `numpy.ndarray`, shape ``(num_angles, ndim)``
+        Rotated detector normals, pointing towards the source.
+    src : `numpy.ndarray` or ``None``
+        Source positions with shape ``(num_angles, ndim)``, or ``None``
+        for parallel beam geometries.
+    """
+    detector = geometry.detector
+    if isinstance(detector, Flat1dDetector):
+        det_axes = detector.axis[None, :]
+    else:
+        det_axes = detector.axes
+    det_normal = detector.surface_normal(detector.params.mid_pt)
+    det_normal = det_normal.reshape(geometry.ndim)
+
+    rot = geometry.rotation_matrix(angles)
+    refpts = geometry.det_refpoint(angles)
+    axes = np.einsum('aij,kj->aki', rot, det_axes)
+    normals = np.einsum('aij,j->ai', rot, det_normal)
+
+    if isinstance(geometry, DivergentBeamGeometry):
+        src = geometry.src_position(angles)
+    else:
+        src = None
+
+    return refpts, axes, normals, src
+
+
+def _ray_step(vol_space):
+    """Return the sampling step along rays for the given volume space."""
+    return np.min(vol_space.cell_sides) / 2
+
+
+def _ray_samples(geometry, vol_space, i0, i1, batch_size=1):
+    """Generate sampling points along the rays for the angles ``i0:i1``.
+
+    The sampling points are equidistant with step size `_ray_step` and
+    centered around the point on each ray that is closest to the volume
+    center. They are generated in blocks of rays of bounded size, where
+    the size is reduced by ``batch_size`` to account for the number of
+    volumes that are processed at once.
+
+    Yields
+    ------
+    r0, r1 : int
+        Range of the rays in the current block, where rays are counted
+        in "C" order over angles ``i0:i1`` and detector pixels.
+    coords : list of `numpy.ndarray`
+        Index coordinates of the sampling points in the volume padded
+        with a zero border of width 1, each with shape
+        ``(r1 - r0, num_steps)``.
+    inside : `numpy.ndarray` or ``None``
+        Boolean mask of points between source and detector, or ``None``
+        for parallel beam geometries.
+    """
+    ndim = vol_space.ndim
+    vol_min = vol_space.min_pt
+    vol_cell = vol_space.cell_sides
+    vol_center = vol_space.domain.mid_pt
+
+    step = _ray_step(vol_space)
+    half_len = np.linalg.norm(vol_space.domain.extent) / 2 + np.max(vol_cell)
+    num_steps = int(np.ceil(2 * half_len / step))
+    offsets = -half_len + (np.arange(num_steps) + 0.5) * step
+    rays_per_block = max(1, _BLOCK_SIZE // (num_steps * batch_size))
+
+    det_params = np.stack(
+        [p.ravel() for p in
+         np.meshgrid(*geometry.det_grid.coord_vectors, indexing='ij')],
+        axis=-1)
+    refpts, axes, normals, src = _det_vectors(geometry,
+                                              geometry.angles[i0:i1])
+
+    # Ray origins on the detector and unit directions towards the source
+    origins = refpts[:, None, :] + np.einsum('uk,akd->aud', det_params, axes)
+    if src is None:
+        dirs = np.broadcast_to(normals[:, None, :], origins.shape)
+        lengths = None
+    else:
+        dirs = src[:, None, :] - origins
+        lengths = np.linalg.norm(dirs, axis=-1)
+        dirs = dirs / lengths[..., None]
+        lengths = lengths.reshape(-1)
+
+    origins = origins.reshape(-1, ndim)
+    dirs = dirs.reshape(-1, ndim)
+    t_center = np.sum((vol_center - origins) * dirs, axis=-1)
+
+    for r0 in range(0, len(origins), rays_per_block):
+        r1 = min(r0 + rays_per_block, len(origins))
+        t = t_center[r0:r1, None] + offsets[None, :]
+        coords = [
+            ((origins[r0:r1, d, None] - vol_min[d]) / vol_cell[d] + 0.5) +
+            t * (dirs[r0:r1, d, None] / vol_cell[d])
+            for d in range(ndim)]
+        if lengths is None:
+            inside = None
+        else:
+            # Do not integrate beyond the source
+            inside = (t < lengths[r0:r1, None])
+
+        yield r0, r1, coords, inside
+
+
+def _run_chunks(func, chunks, num_threads):
+    """Evaluate ``func`` on all ``chunks``, possibly in a thread pool."""
+    if num_threads is None:
+        num_threads = cpu_count()
+    num_threads = min(int(num_threads), len(chunks))
+
+    if num_threads <= 1:
+        for chunk in chunks:
+            func(chunk)
+    else:
+        pool = ThreadPool(num_threads)
+        try:
+            pool.map(func, chunks)
+        finally:
+            pool.close()
+            pool.join()
+
+
+def _split(n, num_chunks):
+    """Split ``range(n)`` into at most ``num_chunks`` contiguous pieces."""
+    bounds = np.linspace(0, n, min(n, num_chunks) + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _matrix_key(geometry, reco_space):
+    """Return a string that identifies the system matrix of the setting.
+
+    The key is a hash of all vectors defining the rays and the volume
+    grid, hence two geometries with the same rays give the same key.
+    """
+    refpts, axes, normals, src = _det_vectors(geometry, geometry.angles)
+    det_part = geometry.det_partition
+    arrays = [refpts, axes, normals, src,
+              det_part.min_pt, det_part.cell_sides, det_part.shape,
+              reco_space.min_pt, reco_space.cell_sides, reco_space.shape]
+
+    sha = hashlib.sha1(str(reco_space.dtype).encode('ascii'))
+    for arr in arrays:
+        if arr is not None:
+            sha.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+    return sha.hexdigest()
+
+
+def numpy_ray_trafo_matrix(geometry, reco_space, cache_dir=None,
+                           num_threads=None):
+    """Return the ray transform of the NumPy back-end as sparse matrix.
+
+    The matrix is cached in ``geometry.implementation_cache``, and it is
+    only assembled if it cannot be found there or in ``cache_dir``.
+
+    Parameters
+    ----------
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    reco_space : `DiscreteLp`
+        Reconstruction space of the ray transform.
+    cache_dir : str, optional
+        Directory in which the assembled matrix is stored, or from which
+        it is loaded if it exists already. Files are identified by a hash
+        of the ray geometry and the reconstruction grid.
+    num_threads : positive int, optional
+        Number of threads used for the assembly. For ``None``, the
+        number of CPU cores is used.
+
+    Returns
+    -------
+    matrix : `scipy.sparse.csr_matrix`
+        Matrix with shape ``(geometry.partition.size, reco_space.size)``
+        that maps flattened volume arrays to flattened projection arrays,
+        with entries of the same data type as ``reco_space``. It is the
+        matrix of `numpy_forward_projector` with respect to
+        unweighted spaces.
+
+    Examples
+    --------
+    >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+    >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=5)
+    >>> matrix = numpy_ray_trafo_matrix(geometry, space)
+    >>> matrix.shape == (geometry.partition.size, space.size)
+    True
+    """
+    numpy_ray_trafo_supports(geometry, reco_space)
+    key = _matrix_key(geometry, reco_space)
+    cache = geometry.implementation_cache.setdefault('numpy_matrix', {})
+    if key in cache:
+        return cache[key]
+
+    if cache_dir is not None:
+        fname = os.path.join(cache_dir, 'ray_trafo_{}.npz'.format(key))
+        if os.path.exists(fname):
+            matrix = scipy.sparse.load_npz(fname)
+            cache[key] = matrix
+            return matrix
+
+    ndim = reco_space.ndim
+    vol_shape = reco_space.shape
+    pad_shape = tuple(n + 2 for n in vol_shape)
+    step = _ray_step(reco_space)
+    num_det = int(np.prod(geometry.det_partition.shape))
+    blocks = {}
+
+    def matrix_chunk(chunk):
+        """Assemble the rows for the angles in ``chunk``."""
+        i0, i1 = chunk
+        rows = []
+        for r0, r1, coords, inside in _ray_samples(geometry, reco_space,
+                                                   i0, i1):
+            indices, fracs = _linear_interp_indices(pad_shape, coords)
+            fracs = [(1 - frac, frac) for frac in fracs]
+            ray_idx = np.broadcast_to(np.arange(r1 - r0)[:, None],
+                                      indices[0].shape)
+            row_idx, col_idx, data = [], [], []
+            for corner in product((0, 1), repeat=ndim):
+                weight = step
+                valid = (True if inside is None else inside)
+                col = 0
+                for d in range(ndim):
+                    weight = weight * fracs[d][corner[d]]
+                    # Index in the unpadded volume
+                    idx = indices[d] + (corner[d] - 1)
+                    valid = valid & (idx >= 0) & (idx < vol_shape[d])
+                    col = col * vol_shape[d] + idx
+                valid &= (weight != 0)
+                row_idx.append(ray_idx[valid])
+                col_idx.append(col[valid])
+                data.append(weight[valid])
+
+            # Conversion to CSR sums up duplicate entries
+            rows.append(scipy.sparse.csr_matrix(
+                (np.concatenate(data).astype(reco_space.dtype),
+                 (np.concatenate(row_idx), np.concatenate(col_idx))),
+                shape=(r1 - r0, reco_space.size)))
+
+        blocks[i0] = scipy.sparse.vstack(rows, format='csr')
+
+    if num_threads is None:
+        num_threads = cpu_count()
+    chunks = _split(len(geometry.angles), 4 * num_threads)
+    _run_chunks(matrix_chunk, chunks, num_threads)
+    matrix = scipy.sparse.vstack([blocks[i0] for i0, _ in chunks],
+                                 format='csr')
+    assert matrix.shape == (len(geometry.angles) * num_det, reco_space.size)
+
+    if cache_dir is not None:
+        # Write to a temporary file first to avoid partially written files
+        # being picked up by other processes
+        tmp_fname = os.path.join(
+            cache_dir, 'ray_trafo_{}.{}.tmp.npz'.format(key, os.getpid()))
+        scipy.sparse.save_npz(tmp_fname, matrix)
+        os.rename(tmp_fname, fname)
+
+    cache[key] = matrix
+    return matrix
+
+
+def numpy_forward_projector(vol_data, geometry, proj_space, out=None,
+                            num_threads=None):
+    """Run a forward projection on the given data using NumPy.
+
+    Parameters
+    ----------
+    vol_data : `DiscreteLpElement`
+        Volume data to which the forward projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    proj_space : `DiscreteLp`
+        Space to which the calling operator maps.
+    out : ``proj_space`` element, optional
+        Element of the projection space to which the result is written. If
+        ``None``, an element in ``proj_space`` is created.
+    num_threads : positive int, optional
+        Number of threads used for the computation. For ``None``, the
+        number of CPU cores is used.
+
+    Returns
+    -------
+    out : ``proj_space`` element
+        Projection data resulting from the application of the projector.
+        If ``out`` was provided, the returned object is a reference to it.
+
+    See Also
+    --------
+    numpy_forward_projector_batch : Projection of a stack of volumes
+
+    Notes
+    -----
+    The volume is sampled along each ray with a step size of half the
+    smallest cell side, using linear interpolation, regardless of the
+    interpolation scheme of the volume space.
+    """
+    if not isinstance(vol_data, DiscreteLpElement):
+        raise TypeError('volume data {!r} is not a `DiscreteLpElement` '
+                        'instance'.format(vol_data))
+    if not isinstance(proj_space, DiscreteLp):
+        raise TypeError('`proj_space` {!r} is not a `DiscreteLp` '
+                        'instance'.format(proj_space))
+    if out is None:
+        out = proj_space.element()
+    elif out not in proj_space:
+        raise TypeError('`out` {!r} is not an element of `proj_space` {!r}'
+                        ''.format(out, proj_space))
+
+    with writable_array(out) as out_arr:
+        numpy_forward_projector_batch(vol_data.asarray()[None, ...],
+                                      geometry, vol_data.space,
+                                      out_arr[None, ...], num_threads)
+    return out
+
+
+def numpy_forward_projector_batch(vol_arr, geometry, vol_space, out_arr,
+                                  num_threads=None):
+    """Run a forward projection on a stack of volumes using NumPy.
+
+    The ray geometry and the interpolation indices and weights are
+    computed only once and applied to all volumes in the stack.
+
+    Parameters
+    ----------
+    vol_arr : `numpy.ndarray`
+        Stack of volumes with shape ``(N,) + vol_space.shape``.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    vol_space : `DiscreteLp`
+        Space of the individual volumes.
+    out_arr : `numpy.ndarray`
+        Array with shape ``(N,) + geometry.partition.shape`` to which the
+        projections are written.
+    num_threads : positive int, optional
+        Number of threads used for the computation. For ``None``, the
+        number of CPU cores is used.
+
+    Returns
+    -------
+    out_arr : `numpy.ndarray`
+        The ``out_arr`` parameter, containing the projections.
+    """
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry {!r} is not a `Geometry` instance'
+                        ''.format(geometry))
+    if not isinstance(vol_space, DiscreteLp):
+        raise TypeError('`vol_space` {!r} is not a `DiscreteLp` '
+                        'instance'.format(vol_space))
+    if vol_space.ndim != geometry.ndim:
+        raise ValueError('dimensions {} of volume space and {} of geometry '
+                         'do not match'
+                         ''.format(vol_space.ndim, geometry.ndim))
+    numpy_ray_trafo_supports(geometry, vol_space)
+    num_vols = len(vol_arr)
+    if vol_arr.shape != (num_vols,) + vol_space.shape:
+        raise ValueError('`vol_arr.shape` must be (N,) + {}, got {}'
+                         ''.format(vol_space.shape, vol_arr.shape))
+    if out_arr.shape != (num_vols,) + geometry.partition.shape:
+        raise ValueError('`out_arr.shape` must be {}, got {}'
+                         ''.format((num_vols,) + geometry.partition.shape,
+                                   out_arr.shape))
+
+    pad_width = [(0, 0)] + [(1, 1)] * vol_space.ndim
+    vol_pad = np.pad(vol_arr, pad_width, mode='constant')
+    step = _ray_step(vol_space)
+    det_shape = geometry.det_partition.shape
+
+    def forward_chunk(chunk):
+        """Compute the projections for the angles in ``chunk``."""
+        i0, i1 = chunk
+        proj = np.empty((num_vols, (i1 - i0) * int(np.prod(det_shape))))
+        for r0, r1, coords, inside in _ray_samples(
+                geometry, vol_space, i0, i1, batch_size=num_vols):
+            values = _padded_linear_interp(vol_pad, coords)
+            if inside is not None:
+                values *= inside
+            proj[:, r0:r1] = np.sum(values, axis=-1)
+
+        proj *= step
+        out_arr[:, i0:i1] = proj.reshape((num_vols, i1 - i0) + det_shape)
+
+    if num_threads is None:
+        num_threads = cpu_count()
+
+    chunks = _split(len(geometry.angles), 4 * num_threads)
+    _run_chunks(forward_chunk, chunks, num_threads)
+    return out_arr
+
+
+def numpy_back_projector(proj_data, geometry, reco_space, out=None,
+                         num_threads=None):
+    """Run a back-projection on the given data using NumPy.
+
+    Parameters
+    ----------
+    proj_data : `DiscreteLpElement`
+        Projection data to which the back-projector is applied.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    reco_space : `DiscreteLp`
+        Space to which the calling operator maps.
+    out : ``reco_space`` element, optional
+        Element of the reconstruction space to which the result is written.
+        If ``None``, an element in ``reco_space`` is created.
+    num_threads : positive int, optional
+        Number of threads used for the computation. For ``None``, the
+        number of CPU cores is used.
+
+    Returns
+    -------
+    out : ``reco_space`` element
+        Reconstruction data resulting from the application of the backward
+        projector. If ``out`` was provided, the returned object is a
+        reference to it.
+
+    See Also
+    --------
+    numpy_back_projector_batch : Back-projection of a stack of data sets
+
+    Notes
+    -----
+    The back-projection is voxel-driven, i.e., it is not the exact
+    transpose of `numpy_forward_projector`, but both are discretizations
+    of mutually adjoint continuous operators.
+    """
+    if not isinstance(proj_data, DiscreteLpElement):
+        raise TypeError('projection data {!r} is not a `DiscreteLpElement` '
+                        'instance'.format(proj_data))
+    if not isinstance(reco_space, DiscreteLp):
+        raise TypeError('`reco_space` {!r} is not a `DiscreteLp` '
+                        'instance'.format(reco_space))
+    if out is None:
+        out = reco_space.element()
+    elif out not in reco_space:
+        raise TypeError('`out` {!r} is not an element of `reco_space` {!r}'
+                        ''.format(out, reco_space))
+
+    with writable_array(out) as out_arr:
+        numpy_back_projector_batch(proj_data.asarray()[None, ...], geometry,
+                                   proj_data.space, reco_space,
+                                   out_arr[None, ...], num_threads)
+    return out
+
+
+def numpy_back_projector_batch(proj_arr, geometry, proj_space, reco_space,
+                               out_arr, num_threads=None):
+    """Run a back-projection on a stack of data sets using NumPy.
+
+    The projection of the voxels onto the detector and the interpolation
+    weights are computed only once and applied to all data sets in the
+    stack.
+
+    Parameters
+    ----------
+    proj_arr : `numpy.ndarray`
+        Stack of projection data sets with shape
+        ``(N,) + proj_space.shape``.
+    geometry : `Geometry`
+        Geometry defining the tomographic setup.
+    proj_space : `DiscreteLp`
+        Space of the individual projection data sets.
+    reco_space : `DiscreteLp`
+        Space of the individual back-projections.
+    out_arr : `numpy.ndarray`
+        Array with shape ``(N,) + reco_space.shape`` to which the
+        back-projections are written.
+    num_threads : positive int, optional
+        Number of threads used for the computation. For ``None``, the
+        number of CPU cores is used.
+
+    Returns
+    -------
+    out_arr : `numpy.ndarray`
+        The ``out_arr`` parameter, containing the back-projections.
+    """
+    if not isinstance(geometry, Geometry):
+        raise TypeError('geometry {!r} is not a `Geometry` instance'
+                        ''.format(geometry))
+    if not isinstance(reco_space, DiscreteLp):
+        raise TypeError('`reco_space` {!r} is not a `DiscreteLp` '
+                        'instance'.format(reco_space))
+    if reco_space.ndim != geometry.ndim:
+        raise ValueError('dimensions {} of reconstruction space and {} of '
+                         'geometry do not match'
+                         ''.format(reco_space.ndim, geometry.ndim))
+    numpy_ray_trafo_supports(geometry, reco_space)
+    num_data = len(proj_arr)
+    if proj_arr.shape != (num_data,) + geometry.partition.shape:
+        raise ValueError('`proj_arr.shape` must be (N,) + {}, got {}'
+                         ''.format(geometry.partition.shape, proj_arr.shape))
+    if out_arr.shape != (num_data,) + reco_space.shape:
+        raise ValueError('`out_arr.shape` must be {}, got {}'
+                         ''.format((num_data,) + reco_space.shape,
+                                   out_arr.shape))
+
+    ndim = reco_space.ndim
+    angles = geometry.angles
+    det_min = geometry.det_partition.min_pt
+    det_cell = geometry.det_partition.cell_sides
+    # Angles first, then the stack axis, so that each angle is contiguous
+    pad_width = [(0, 0), (0, 0)] + [(1, 1)] * (ndim - 1)
+    proj_pad = np.pad(proj_arr.swapaxes(0, 1), pad_width, mode='constant')
+    refpts, axes, normals, src = _det_vectors(geometry, angles)
+
+    # Weighting of the adjoint with respect to the space weightings, plus
+    # the factor relating the discrete to the continuous adjoint
+    scaling = (float(proj_space.weighting.const) /
+               float(reco_space.weighting.const))
+    scaling *= (reco_space.cell_volume /
+                float(geometry.det_partition.cell_volume))
+
+    vol_shape = reco_space.shape
+    vol_coords = reco_space.grid.coord_vectors
+
+    def back_chunk(chunk):
+        """Compute the back-projection for the slab ``chunk`` of axis 0."""
+        j0, j1 = chunk
+        xs = [vol_coords[0][j0:j1]] + list(vol_coords[1:])
+        xs = [x.reshape([-1 if d == i else 1 for d in range(ndim)])
+              for i, x in enumerate(xs)]
+
+        acc = np.zeros((num_data, j1 - j0) + vol_shape[1:])
+        for a in range(len(angles)):
+            # Coordinates relative to the basis (axes..., normal)
+            matrix = np.vstack([axes[a], normals[a]]).T
+            inv_matrix = np.linalg.inv(matrix)
+            det_scaling = 1 / abs(np.linalg.det(matrix))
+
+            if src is None:
+                det_coords = [
+                    sum(inv_matrix[k, d] * (xs[d] - refpts[a, d])
+                        for d in range(ndim))
+                    for k in range(ndim - 1)]
+                weights = det_scaling
+            else:
+                # Central projection from the source onto the detector
+                # plane, with the Jacobian of the fan/cone beam transform
+                diffs = [xs[d] - src[a, d] for d in range(ndim)]
+                src_dist = np.dot(refpts[a] - src[a], normals[a])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    lam = src_dist / sum(normals[a, d] * diffs[d]
+                                         for d in range(ndim))
+                    valid = np.isfinite(lam)
+                    valid &= (lam > 0)
+                lam[~valid] = 0
+
+                src_to_ref = np.dot(inv_matrix, src[a] - refpts[a])
+                det_coords = [
+                    src_to_ref[k] +
+                    lam * sum(inv_matrix[k, d] * diffs[d]
+                              for d in range(ndim))
+                    for k in range(ndim - 1)]
+                weights = np.sqrt(sum(diff ** 2 for diff in diffs))
+                weights *= lam ** ndim
+                weights *= det_scaling / abs(src_dist)
+
+            idx_coords = [(det_coords[k] - det_min[k]) / det_cell[k] + 0.5
+                          for k in range(ndim - 1)]
+            acc += weights * _padded_linear_interp(proj_pad[a], idx_coords)
+
+        acc *= scaling
+        out_arr[:, j0:j1] = acc
+
+    if num_threads is None:
+        num_threads = cpu_count()
+
+    num_chunks = max(num_threads,
+                     -(-num_data * reco_space.size // _BLOCK_SIZE))
+    chunks = _split(vol_shape[0], num_chunks)
+    _run_chunks(back_chunk, chunks, num_threads)
+    return out_arr
+
+
+if __name__ == '__main__':
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -14,7 +14,7 @@ import warnings
 
 from odl.discr import DiscreteLp
 from odl.operator import Operator
-from odl.space import FunctionSpace
+from odl.space import FunctionSpace, ProductSpace
 from odl.tomo.geometry import (
     Geometry, Parallel2dGeometry, Parallel3dAxisGeometry)
 from odl.space.weighting import ConstWeighting
@@ -22,13 +22,18 @@ from odl.tomo.backends import (
     ASTRA_AVAILABLE, ASTRA_CUDA_AVAILABLE, SKIMAGE_AVAILABLE,
     astra_supports, ASTRA_VERSION,
     astra_cpu_forward_projector, astra_cpu_back_projector,
+    astra_cpu_forward_projector_batch, astra_cpu_back_projector_batch,
+    AstraCpuProjectorImpl, AstraCpuBackProjectorImpl,
     AstraCudaProjectorImpl, AstraCudaBackProjectorImpl,
+    numpy_forward_projector, numpy_back_projector, numpy_ray_trafo_supports,
+    numpy_ray_trafo_matrix, numpy_forward_projector_batch,
+    numpy_back_projector_batch,
     skimage_radon_forward, skimage_radon_back_projector)
 
 
 ASTRA_CPU_AVAILABLE = ASTRA_AVAILABLE
-_SUPPORTED_IMPL = ('astra_cpu', 'astra_cuda', 'skimage')
-_AVAILABLE_IMPLS = []
+_SUPPORTED_IMPL = ('astra_cpu', 'astra_cuda', 'numpy', 'skimage')
+_AVAILABLE_IMPLS = ['numpy']
 if ASTRA_CPU_AVAILABLE:
     _AVAILABLE_IMPLS.append('astra_cpu')
 if ASTRA_CUDA_AVAILABLE:
@@ -37,7 +42,7 @@ if SKIMAGE_AVAILABLE:
     _AVAILABLE_IMPLS.append('skimage')
 
 
-__all__ = ('RayTransform', 'RayBackProjection')
+__all__ = ('RayTransform', 'RayBackProjection', 'BatchedRayTransform')
 
 
 class RayTransformBase(Operator):
@@ -61,13 +66,15 @@ class RayTransformBase(Operator):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
+        impl : {None, 'astra_cuda', 'astra_cpu', 'skimage', 'numpy'}, optional
             Implementation back-end for the transform. Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy'``: NumPy on the CPU using multiple threads, 2D or
+              3D with flat detector and a single rotation angle
 
             For the default ``None``, the fastest available back-end is
             used.
@@ -86,6 +93,30 @@ class RayTransformBase(Operator):
             and on the CPU, since a full volume and a projection dataset
             are stored. That may be prohibitive in 3D.
             Default: True
+        num_threads : positive int, optional
+            Number of threads used by the ``'numpy'`` and ``'astra_cpu'``
+            back-ends. For ``None``, the ``'numpy'`` back-end uses the
+            number of CPU cores. If given for ``'astra_cpu'``, the angles
+            are split into this many sub-geometries that are projected in
+            parallel.
+        persistent : bool, optional
+            If ``True``, the ``'astra_cpu'`` back-end creates its ASTRA
+            objects once and keeps them between calls. Otherwise, they are
+            created and deleted in each call.
+            Default: False
+        use_matrix : bool, optional
+            If ``True``, assemble the transform as a sparse matrix once
+            and evaluate it (and its adjoint) as sparse matrix-vector
+            products. This requires ``impl='numpy'`` (the default in this
+            case) and pays off for small and medium problems that are
+            evaluated many times. The matrix is shared between all ray
+            transforms with the same geometry object.
+            Default: False
+        matrix_dir : str, optional
+            Directory in which the matrix for ``use_matrix=True`` is
+            stored. If a matrix for the same geometry and reconstruction
+            space has been stored there before, it is loaded instead of
+            being assembled.
 
         Notes
         -----
@@ -114,16 +145,15 @@ class RayTransformBase(Operator):
                             '{!r}'.format(geometry))
 
         # Handle backend choice
-        if not _AVAILABLE_IMPLS:
-            raise RuntimeError('no ray transform back-end available; '
-                               'this requires 3rd party packages, please '
-                               'check the install docs')
         impl = kwargs.pop('impl', None)
+        if kwargs.get('use_matrix', False) and impl is None:
+            impl = 'numpy'
+
         if impl is None:
             # Select fastest available
             if ASTRA_CUDA_AVAILABLE:
                 impl = 'astra_cuda'
-            elif ASTRA_AVAILABLE:
+            elif ASTRA_AVAILABLE and geometry.ndim == 2:
                 impl = 'astra_cpu'
                 if reco_space.size >= 512 ** 2:
                     warnings.warn(
@@ -133,7 +163,8 @@ class RayTransformBase(Operator):
                         "This warning can be disabled by explicitly setting "
                         "`impl='astra_cpu'`.",
                         RuntimeWarning)
-            elif SKIMAGE_AVAILABLE:
+            elif (SKIMAGE_AVAILABLE and
+                  isinstance(geometry, Parallel2dGeometry)):
                 impl = 'skimage'
                 if reco_space.size >= 256 ** 2:
                     warnings.warn(
@@ -143,7 +174,13 @@ class RayTransformBase(Operator):
                         "`impl='skimage'`.",
                         RuntimeWarning)
             else:
-                raise RuntimeError('bad impl')
+                # Last fallback, only if the setting is supported
+                try:
+                    numpy_ray_trafo_supports(geometry, reco_space)
+                except (TypeError, ValueError) as err:
+                    raise RuntimeError('no available back-end supports this '
+                                       'setting: {}'.format(err))
+                impl = 'numpy'
         else:
             impl, impl_in = str(impl).lower(), impl
             if impl not in _SUPPORTED_IMPL:
@@ -154,6 +191,10 @@ class RayTransformBase(Operator):
         # Cache for input/output arrays of transforms
         self.use_cache = kwargs.pop('use_cache', True)
 
+        if kwargs.get('use_matrix', False) and impl != 'numpy':
+            raise ValueError("`use_matrix=True` requires `impl='numpy'`, "
+                             'got {!r}'.format(impl))
+
         # Sanity checks
         if impl.startswith('astra'):
             if geometry.ndim > 2 and impl.endswith('cpu'):
@@ -180,6 +221,9 @@ class RayTransformBase(Operator):
                             RuntimeWarning)
                         break
 
+        elif impl == 'numpy':
+            numpy_ray_trafo_supports(geometry, reco_space)
+
         elif impl == 'skimage':
             if not isinstance(geometry, Parallel2dGeometry):
                 raise TypeError("{!r} backend only supports 2d parallel "
@@ -308,6 +352,13 @@ class RayTransformBase(Operator):
         """Geometry of this operator."""
         return self.__geometry
 
+    def _numpy_matrix(self, reco_space):
+        """Return the sparse matrix for ``use_matrix=True``."""
+        return numpy_ray_trafo_matrix(
+            self.geometry, reco_space,
+            cache_dir=self._extra_kwargs.get('matrix_dir', None),
+            num_threads=self._extra_kwargs.get('num_threads', None))
+
     def _call(self, x, out=None):
         """Return ``self(x[, out])``."""
         if self.domain.is_real:
@@ -328,6 +379,62 @@ class RayTransformBase(Operator):
         else:
             raise RuntimeError('bad domain {!r}'.format(self.domain))
 
+    def _call_batch(self, x_arr, out_arr):
+        """Evaluate the operator for a stack of arrays.
+
+        Parameters
+        ----------
+        x_arr : `numpy.ndarray`
+            Stacked input with shape ``(N,) + self.domain.shape``.
+        out_arr : `numpy.ndarray`
+            Real array with shape ``(N,) + self.range.shape`` to which the
+            result is written. For complex spaces, it has an additional
+            trailing axis of length 2 holding real and imaginary parts.
+        """
+        if self.domain.is_real:
+            self._call_real_batch(x_arr, out_arr)
+        else:
+            self._call_real_batch(x_arr.real, out_arr[..., 0])
+            self._call_real_batch(x_arr.imag, out_arr[..., 1])
+
+    def _call_real_batch(self, x_arr, out_arr):
+        """Real-space evaluation for a stack of arrays.
+
+        Back-ends without a dedicated batch implementation evaluate the
+        members one by one, reusing the cached back-end objects.
+        """
+        dom = self.domain.real_space
+        for i in range(len(x_arr)):
+            out_arr[i] = self._call_real(dom.element(x_arr[i]), None)
+
+    def _astra_cpu_wrapper(self, impl_cls, reco_space, proj_space):
+        """Return the ASTRA CPU wrapper for this transform, or ``None``.
+
+        For ``persistent=True``, the wrapper is created on first use and
+        stored. Otherwise, a new wrapper is returned if ``num_threads`` is
+        given, which the caller must close, and ``None`` if not, in which
+        case the one-shot ASTRA functions are used.
+        """
+        persistent = self._extra_kwargs.get('persistent', False)
+        num_threads = self._extra_kwargs.get('num_threads', None)
+        if persistent and self._astra_wrapper is not None:
+            return self._astra_wrapper
+        elif not persistent and num_threads is None:
+            return None
+
+        astra_wrapper = impl_cls(
+            self.geometry, reco_space, proj_space,
+            num_threads=1 if num_threads is None else num_threads)
+        if persistent:
+            self._astra_wrapper = astra_wrapper
+        return astra_wrapper
+
+    def _batch_matrix_product(self, matrix, x_arr, out_arr):
+        """Apply ``matrix`` to all members of ``x_arr`` at once."""
+        num = len(x_arr)
+        x_mat = np.reshape(x_arr, (num, -1)).T
+        out_arr[:] = matrix.dot(x_mat).T.reshape(out_arr.shape)
+
 
 class RayTransform(RayTransformBase):
 
@@ -347,13 +454,15 @@ class RayTransform(RayTransformBase):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
+        impl : {None, 'astra_cuda', 'astra_cpu', 'skimage', 'numpy'}, optional
             Implementation back-end for the transform. Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy'``: NumPy on the CPU using multiple threads, 2D or
+              3D with flat detector and a single rotation angle
 
             For the default ``None``, the fastest available back-end is
             used, tried in the above order.
@@ -371,6 +480,30 @@ class RayTransform(RayTransformBase):
             and on the CPU, since a full volume and a projection dataset
             are stored. That may be prohibitive in 3D.
             Default: True
+        num_threads : positive int, optional
+            Number of threads used by the ``'numpy'`` and ``'astra_cpu'``
+            back-ends. For ``None``, the ``'numpy'`` back-end uses the
+            number of CPU cores. If given for ``'astra_cpu'``, the angles
+            are split into this many sub-geometries that are projected in
+            parallel.
+        persistent : bool, optional
+            If ``True``, the ``'astra_cpu'`` back-end creates its ASTRA
+            objects once and keeps them between calls. Otherwise, they are
+            created and deleted in each call.
+            Default: False
+        use_matrix : bool, optional
+            If ``True``, assemble the transform as a sparse matrix once
+            and evaluate it (and its adjoint) as sparse matrix-vector
+            products. This requires ``impl='numpy'`` (the default in this
+            case) and pays off for small and medium problems that are
+            evaluated many times. The matrix is shared between all ray
+            transforms with the same geometry object.
+            Default: False
+        matrix_dir : str, optional
+            Directory in which the matrix for ``use_matrix=True`` is
+            stored. If a matrix for the same geometry and reconstruction
+            space has been stored there before, it is loaded instead of
+            being assembled.
 
         Notes
         -----
@@ -385,15 +518,26 @@ class RayTransform(RayTransformBase):
     def _call_real(self, x_real, out_real):
         """Real-space forward projection for the current set-up.
 
-        This method also sets ``self._astra_projector`` for
+        This method also sets ``self._astra_wrapper`` for
+        ``impl='astra_cpu'`` with ``persistent=True``, or for
         ``impl='astra_cuda'`` and enabled cache.
         """
         if self.impl.startswith('astra'):
             backend, data_impl = self.impl.split('_')
 
             if data_impl == 'cpu':
-                return astra_cpu_forward_projector(
-                    x_real, self.geometry, self.range.real_space, out_real)
+                astra_wrapper = self._astra_cpu_wrapper(
+                    AstraCpuProjectorImpl, self.domain.real_space,
+                    self.range.real_space)
+                if astra_wrapper is None:
+                    return astra_cpu_forward_projector(
+                        x_real, self.geometry, self.range.real_space,
+                        out_real)
+                elif astra_wrapper is self._astra_wrapper:
+                    return astra_wrapper.call_forward(x_real, out_real)
+                else:
+                    with astra_wrapper:
+                        return astra_wrapper.call_forward(x_real, out_real)
 
             elif data_impl == 'cuda':
                 if self._astra_wrapper is None:
@@ -409,6 +553,18 @@ class RayTransform(RayTransformBase):
             else:
                 # Should never happen
                 raise RuntimeError('bad `impl` {!r}'.format(self.impl))
+        elif self.impl == 'numpy':
+            if self._extra_kwargs.get('use_matrix', False):
+                matrix = self._numpy_matrix(self.domain.real_space)
+                if out_real is None:
+                    out_real = self.range.real_space.element()
+                x_arr = x_real.asarray().ravel()
+                out_real[:] = matrix.dot(x_arr).reshape(self.range.shape)
+                return out_real
+
+            return numpy_forward_projector(
+                x_real, self.geometry, self.range.real_space, out_real,
+                num_threads=self._extra_kwargs.get('num_threads', None))
         elif self.impl == 'skimage':
             return skimage_radon_forward(x_real, self.geometry,
                                          self.range.real_space, out_real)
@@ -416,6 +572,34 @@ class RayTransform(RayTransformBase):
             # Should never happen
             raise RuntimeError('bad `impl` {!r}'.format(self.impl))
 
+    def _call_real_batch(self, x_arr, out_arr):
+        """Real-space forward projection of a stack of volumes."""
+        if self.impl == 'astra_cpu':
+            astra_wrapper = self._astra_cpu_wrapper(
+                AstraCpuProjectorImpl, self.domain.real_space,
+                self.range.real_space)
+            if astra_wrapper is None:
+                astra_cpu_forward_projector_batch(
+                    x_arr, self.geometry, self.domain.real_space, out_arr)
+            else:
+                try:
+                    for i in range(len(x_arr)):
+                        out_arr[i] = astra_wrapper.call_forward(
+                            self.domain.real_space.element(x_arr[i]))
+                finally:
+                    if astra_wrapper is not self._astra_wrapper:
+                        astra_wrapper.close()
+        elif self.impl == 'numpy':
+            if self._extra_kwargs.get('use_matrix', False):
+                matrix = self._numpy_matrix(self.domain.real_space)
+                self._batch_matrix_product(matrix, x_arr, out_arr)
+            else:
+                numpy_forward_projector_batch(
+                    x_arr, self.geometry, self.domain.real_space, out_arr,
+                    num_threads=self._extra_kwargs.get('num_threads', None))
+        else:
+            super(RayTransform, self)._call_real_batch(x_arr, out_arr)
+
     @property
     def adjoint(self):
         """Adjoint of this operator.
@@ -453,16 +637,18 @@ class RayBackProjection(RayTransformBase):
 
         Other Parameters
         ----------------
-        impl : {`None`, 'astra_cuda', 'astra_cpu', 'skimage'}, optional
+        impl : {None, 'astra_cuda', 'astra_cpu', 'skimage', 'numpy'}, optional
             Implementation back-end for the transform. Supported back-ends:
 
             - ``'astra_cuda'``: ASTRA toolbox, using CUDA, 2D or 3D
             - ``'astra_cpu'``: ASTRA toolbox using CPU, only 2D
             - ``'skimage'``: scikit-image, only 2D parallel with square
               reconstruction space.
+            - ``'numpy'``: NumPy on the CPU using multiple threads, 2D or
+              3D with flat detector and a single rotation angle
 
             For the default ``None``, the fastest available back-end is
--           used, tried in the above order.
+            used, tried in the above order.
         interp : {'nearest', 'linear'}, optional
             Interpolation type for the discretization of the operator
             domain. This has no effect if ``domain`` is given explicitly.
@@ -477,6 +663,30 @@ class RayBackProjection(RayTransformBase):
             and on the CPU, since a full volume and a projection dataset
             are stored. That may be prohibitive in 3D.
             Default: True
+        num_threads : positive int, optional
+            Number of threads used by the ``'numpy'`` and ``'astra_cpu'``
+            back-ends. For ``None``, the ``'numpy'`` back-end uses the
+            number of CPU cores. If given for ``'astra_cpu'``, the angles
+            are split into this many sub-geometries that are projected in
+            parallel.
+        persistent : bool, optional
+            If ``True``, the ``'astra_cpu'`` back-end creates its ASTRA
+            objects once and keeps them between calls. Otherwise, they are
+            created and deleted in each call.
+            Default: False
+        use_matrix : bool, optional
+            If ``True``, assemble the transform as a sparse matrix once
+            and evaluate it (and its adjoint) as sparse matrix-vector
+            products. This requires ``impl='numpy'`` (the default in this
+            case) and pays off for small and medium problems that are
+            evaluated many times. The matrix is shared between all ray
+            transforms with the same geometry object.
+            Default: False
+        matrix_dir : str, optional
+            Directory in which the matrix for ``use_matrix=True`` is
+            stored. If a matrix for the same geometry and reconstruction
+            space has been stored there before, it is loaded instead of
+            being assembled.
 
         Notes
         -----
@@ -491,15 +701,25 @@ class RayBackProjection(RayTransformBase):
     def _call_real(self, x_real, out_real):
         """Real-space back-projection for the current set-up.
 
-        This method also sets ``self._astra_backprojector`` for
+        This method also sets ``self._astra_wrapper`` for
+        ``impl='astra_cpu'`` with ``persistent=True``, or for
         ``impl='astra_cuda'`` and enabled cache.
         """
         if self.impl.startswith('astra'):
             backend, data_impl = self.impl.split('_')
             if data_impl == 'cpu':
-                return astra_cpu_back_projector(x_real, self.geometry,
-                                                self.range.real_space,
-                                                out_real)
+                astra_wrapper = self._astra_cpu_wrapper(
+                    AstraCpuBackProjectorImpl, self.range.real_space,
+                    self.domain.real_space)
+                if astra_wrapper is None:
+                    return astra_cpu_back_projector(
+                        x_real, self.geometry, self.range.real_space,
+                        out_real)
+                elif astra_wrapper is self._astra_wrapper:
+                    return astra_wrapper.call_backward(x_real, out_real)
+                else:
+                    with astra_wrapper:
+                        return astra_wrapper.call_backward(x_real, out_real)
             elif data_impl == 'cuda':
                 if self._astra_wrapper is None:
                     astra_wrapper = AstraCudaBackProjectorImpl(
@@ -515,6 +735,21 @@ class RayBackProjection(RayTransformBase):
                 # Should never happen
                 raise RuntimeError('bad `impl` {!r}'.format(self.impl))
 
+        elif self.impl == 'numpy':
+            if self._extra_kwargs.get('use_matrix', False):
+                matrix = self._numpy_matrix(self.range.real_space)
+                if out_real is None:
+                    out_real = self.range.real_space.element()
+                x_arr = x_real.asarray().ravel()
+                scaling = (float(self.domain.weighting.const) /
+                           float(self.range.weighting.const))
+                out_real[:] = matrix.T.dot(x_arr).reshape(self.range.shape)
+                out_real *= scaling
+                return out_real
+
+            return numpy_back_projector(
+                x_real, self.geometry, self.range.real_space, out_real,
+                num_threads=self._extra_kwargs.get('num_threads', None))
         elif self.impl == 'skimage':
             return skimage_radon_back_projector(x_real, self.geometry,
                                                 self.range.real_space,
@@ -523,6 +758,38 @@ class RayBackProjection(RayTransformBase):
             # Should never happen
             raise RuntimeError('bad `impl` {!r}'.format(self.impl))
 
+    def _call_real_batch(self, x_arr, out_arr):
+        """Real-space back-projection of a stack of data sets."""
+        if self.impl == 'astra_cpu':
+            astra_wrapper = self._astra_cpu_wrapper(
+                AstraCpuBackProjectorImpl, self.range.real_space,
+                self.domain.real_space)
+            if astra_wrapper is None:
+                astra_cpu_back_projector_batch(
+                    x_arr, self.geometry, self.domain.real_space,
+                    self.range.real_space, out_arr)
+            else:
+                try:
+                    for i in range(len(x_arr)):
+                        out_arr[i] = astra_wrapper.call_backward(
+                            self.domain.real_space.element(x_arr[i]))
+                finally:
+                    if astra_wrapper is not self._astra_wrapper:
+                        astra_wrapper.close()
+        elif self.impl == 'numpy':
+            if self._extra_kwargs.get('use_matrix', False):
+                matrix = self._numpy_matrix(self.range.real_space)
+                self._batch_matrix_product(matrix.T, x_arr, out_arr)
+                out_arr *= (float(self.domain.weighting.const) /
+                            float(self.range.weighting.const))
+            else:
+                numpy_back_projector_batch(
+                    x_arr, self.geometry, self.domain.real_space,
+                    self.range.real_space, out_arr,
+                    num_threads=self._extra_kwargs.get('num_threads', None))
+        else:
+            super(RayBackProjection, self)._call_real_batch(x_arr, out_arr)
+
     @property
     def adjoint(self):
         """Adjoint of this operator.
@@ -543,6 +810,102 @@ class RayBackProjection(RayTransformBase):
         return self._adjoint
 
 
+class BatchedRayTransform(Operator):
+
+    """Ray transform applied to a stack of inputs in one pass.
+
+    The operator maps from the power space ``ray_trafo.domain ** num`` to
+    ``ray_trafo.range ** num`` and applies ``ray_trafo`` to each component.
+    In contrast to evaluating ``DiagonalOperator(ray_trafo, num)``, the
+    back-end geometry and projector objects are created only once and
+    all members are processed together.
+
+    Inputs can also be given as a stacked array of shape
+    ``(num,) + ray_trafo.domain.shape``.
+    """
+
+    def __init__(self, ray_trafo, num):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        ray_trafo : `RayTransform` or `RayBackProjection`
+            Operator that is applied to each member of the stack.
+        num : positive int
+            Number of members in the stack.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([-1, -1], [1, 1], (10, 10))
+        >>> geometry = odl.tomo.parallel_beam_geometry(space, num_angles=5)
+        >>> ray_trafo = odl.tomo.RayTransform(space, geometry, impl='numpy')
+        >>> batched = odl.tomo.BatchedRayTransform(ray_trafo, 3)
+        >>> vols = np.ones((3, 10, 10))
+        >>> projs = batched(vols)
+        >>> projs.shape
+        (3, 5, 17)
+        >>> ray_trafo(vols[0]) == projs[0]
+        True
+        """
+        if not isinstance(ray_trafo, RayTransformBase):
+            raise TypeError('`ray_trafo` must be a `RayTransform` or '
+                            '`RayBackProjection`, got {!r}'
+                            ''.format(ray_trafo))
+        num, num_in = int(num), num
+        if num != num_in or num < 1:
+            raise ValueError('`num` must be a positive integer, got {}'
+                             ''.format(num_in))
+
+        self.__ray_trafo = ray_trafo
+        super(BatchedRayTransform, self).__init__(
+            domain=ProductSpace(ray_trafo.domain, num),
+            range=ProductSpace(ray_trafo.range, num),
+            linear=True)
+
+    @property
+    def ray_trafo(self):
+        """Operator applied to each member of the stack."""
+        return self.__ray_trafo
+
+    @property
+    def num(self):
+        """Number of members in the stack."""
+        return len(self.domain)
+
+    def _call(self, x, out):
+        """Evaluate all members and write the result to ``out``."""
+        op = self.ray_trafo
+        x_arr = x.asarray()
+        out_shape = (self.num,) + op.range.shape
+        if op.range.is_complex:
+            out_shape += (2,)
+        out_arr = np.empty(out_shape, dtype=op.range.real_dtype)
+        op._call_batch(x_arr, out_arr)
+
+        for i, out_i in enumerate(out):
+            if op.range.is_complex:
+                out_i.real = out_arr[i, ..., 0]
+                out_i.imag = out_arr[i, ..., 1]
+            else:
+                out_i[:] = out_arr[i]
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator.
+
+        Returns
+        -------
+        adjoint : `BatchedRayTransform`
+            Batched version of ``ray_trafo.adjoint``.
+        """
+        return BatchedRayTransform(self.ray_trafo.adjoint, self.num)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, {})'.format(self.__class__.__name__,
+                                     self.ray_trafo, self.num)
+
+
 if __name__ == '__main__':
     from odl.util.testutils import run_doctests
     run_doctests()